@@ -0,0 +1,178 @@
+"""incremental analysis, per-profile guides and guide steps
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 12:28:19.774442
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+guides = sa.table(
+    'guides',
+    sa.column('id', sqlmodel.sql.sqltypes.GUID()),
+    sa.column('scan_id', sqlmodel.sql.sqltypes.GUID()),
+    sa.column('wheelchair_profile_id', sqlmodel.sql.sqltypes.GUID()),
+    sa.column('navigation_steps_json', sa.String()),
+    sa.column('step_count', sa.Integer()),
+)
+guide_steps = sa.table(
+    'guide_steps',
+    sa.column('guide_id', sqlmodel.sql.sqltypes.GUID()),
+    sa.column('step_number', sa.Integer()),
+    sa.column('step_json', sa.String()),
+)
+wheelchair_profiles = sa.table(
+    'wheelchair_profiles',
+    sa.column('id', sqlmodel.sql.sqltypes.GUID()),
+    sa.column('is_default', sa.Boolean()),
+)
+
+
+def upgrade() -> None:
+    op.create_table('analysis_jobs',
+    sa.Column('id', sqlmodel.sql.sqltypes.GUID(), nullable=False),
+    sa.Column('scan_id', sqlmodel.sql.sqltypes.GUID(), nullable=False),
+    sa.Column('analysis_id', sqlmodel.sql.sqltypes.GUID(), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', name='jobstatus'), nullable=False),
+    sa.Column('force', sa.Boolean(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error_message', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['analysis_id'], ['analysis_results.id'], ),
+    sa.ForeignKeyConstraint(['scan_id'], ['scans.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('analysis_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_analysis_jobs_analysis_id'), ['analysis_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_analysis_jobs_scan_id'), ['scan_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_analysis_jobs_status'), ['status'], unique=False)
+
+    op.create_table('guide_steps',
+    sa.Column('guide_id', sqlmodel.sql.sqltypes.GUID(), nullable=False),
+    sa.Column('step_number', sa.Integer(), nullable=False),
+    sa.Column('step_json', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['guide_id'], ['guides.id'], ),
+    sa.PrimaryKeyConstraint('guide_id', 'step_number')
+    )
+    with op.batch_alter_table('analysis_results', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('scored_image_count', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('outdated', sa.Boolean(), server_default=sa.false(), nullable=False))
+        batch_op.add_column(sa.Column('world_model_blob', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('recommended_path_json', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('barrier_stats_json', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('route_trees', sa.LargeBinary(), nullable=True))
+
+    with op.batch_alter_table('guides', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('step_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Move each guide's serialized steps into one guide_steps row per step
+    connection = op.get_bind()
+    for guide_id, steps_json in connection.execute(
+        sa.select(guides.c.id, guides.c.navigation_steps_json)
+    ).all():
+        steps = json.loads(steps_json)
+        if steps:
+            connection.execute(
+                guide_steps.insert(),
+                [
+                    {
+                        'guide_id': guide_id,
+                        'step_number': step['step_number'],
+                        'step_json': json.dumps(step),
+                    }
+                    for step in steps
+                ],
+            )
+        connection.execute(
+            guides.update()
+            .where(guides.c.id == guide_id)
+            .values(step_count=len(steps))
+        )
+
+    with op.batch_alter_table('guides', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_guides_scan_id'))
+        batch_op.create_index(batch_op.f('ix_guides_scan_id'), ['scan_id'], unique=False)
+        batch_op.create_unique_constraint('uq_guides_scan_id_profile_id', ['scan_id', 'wheelchair_profile_id'])
+        batch_op.drop_column('navigation_steps_json')
+
+    with op.batch_alter_table('images', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.add_column(sa.Column('analysis_json', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_images_content_hash'), ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('images', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_images_content_hash'))
+        batch_op.drop_column('analysis_json')
+        batch_op.drop_column('content_hash')
+
+    with op.batch_alter_table('guides', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('navigation_steps_json', sa.VARCHAR(), server_default='[]', nullable=False))
+
+    # Keep one guide per scan, preferring the default profile's, and fold its
+    # steps back into navigation_steps_json
+    connection = op.get_bind()
+    default_ids = set(
+        connection.execute(
+            sa.select(wheelchair_profiles.c.id).where(wheelchair_profiles.c.is_default)
+        ).scalars()
+    )
+    kept = {}
+    for guide_id, scan_id, profile_id in connection.execute(
+        sa.select(guides.c.id, guides.c.scan_id, guides.c.wheelchair_profile_id)
+    ).all():
+        if scan_id not in kept or profile_id in default_ids:
+            kept[scan_id] = guide_id
+    for guide_id in kept.values():
+        steps = connection.execute(
+            sa.select(guide_steps.c.step_json)
+            .where(guide_steps.c.guide_id == guide_id)
+            .order_by(guide_steps.c.step_number)
+        ).scalars()
+        connection.execute(
+            guides.update()
+            .where(guides.c.id == guide_id)
+            .values(
+                navigation_steps_json=json.dumps([json.loads(s) for s in steps])
+            )
+        )
+    connection.execute(guide_steps.delete())
+    connection.execute(guides.delete().where(guides.c.id.not_in(list(kept.values()))))
+
+    with op.batch_alter_table('guides', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_guides_scan_id_profile_id', type_='unique')
+        batch_op.drop_index(batch_op.f('ix_guides_scan_id'))
+        batch_op.create_index(batch_op.f('ix_guides_scan_id'), ['scan_id'], unique=True)
+        batch_op.drop_column('step_count')
+
+    with op.batch_alter_table('analysis_results', schema=None) as batch_op:
+        batch_op.drop_column('route_trees')
+        batch_op.drop_column('barrier_stats_json')
+        batch_op.drop_column('recommended_path_json')
+        batch_op.drop_column('world_model_blob')
+        batch_op.drop_column('outdated')
+        batch_op.drop_column('scored_image_count')
+
+    op.drop_table('guide_steps')
+    with op.batch_alter_table('analysis_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_analysis_jobs_status'))
+        batch_op.drop_index(batch_op.f('ix_analysis_jobs_scan_id'))
+        batch_op.drop_index(batch_op.f('ix_analysis_jobs_analysis_id'))
+
+    op.drop_table('analysis_jobs')
+    sa.Enum(name='jobstatus').drop(connection, checkfirst=True)
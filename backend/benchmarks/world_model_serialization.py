@@ -0,0 +1,107 @@
+"""Benchmark world model storage formats: node-link JSON vs compact binary.
+
+Run from the backend directory:
+
+    python -m benchmarks.world_model_serialization [image_count ...]
+"""
+
+import random
+import sys
+import time
+from collections.abc import Callable
+from uuid import uuid4
+
+from src.models.analysis import Barrier
+from src.models.image import Image
+from src.schemas.enums import BarrierSeverity, BarrierType
+from src.services.compact_graph import CompactGraph
+from src.services.world_model_service import WorldModelService
+
+REPEAT = 5
+
+
+def build_service(image_count: int) -> WorldModelService:
+    """Build a world model with 0-4 random barriers per image."""
+    rng = random.Random(image_count)
+    scan_id = uuid4()
+    images = []
+    results = {}
+    for order in range(image_count):
+        image = Image(
+            id=uuid4(),
+            scan_id=scan_id,
+            filename=f"{order}.jpg",
+            original_filename=f"{order}.jpg",
+            file_path=f"/data/{order}.jpg",
+            file_size=1000,
+            mime_type="image/jpeg",
+            sequence_order=order,
+        )
+        image.barriers = [
+            Barrier(
+                id=uuid4(),
+                image_id=image.id,
+                barrier_type=rng.choice(list(BarrierType)),
+                severity=rng.choice(list(BarrierSeverity)),
+                description="Step of about ten centimetres at the doorway",
+                recommendation="Install a portable ramp",
+            )
+            for _ in range(rng.randint(0, 4))
+        ]
+        images.append(image)
+        results[image.id] = {
+            "space_type": "corridor",
+            "features": {"has_ramp": False, "lighting": "good"},
+            "accessibility_score": rng.randint(0, 100),
+        }
+
+    service = WorldModelService()
+    service.build_world_model(images, results)
+    return service
+
+
+def best_of(func: Callable[[], object]) -> float:
+    """Get the fastest of several runs, in milliseconds."""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main(image_counts: list[int]) -> None:
+    """Print encode/decode times and stored sizes for each scan size."""
+    print(
+        f"{'images':>7} {'format':>7} {'encode ms':>10} {'decode ms':>10} "
+        f"{'arrays ms':>10} {'bytes':>10}"
+    )
+    for count in image_counts:
+        service = build_service(count)
+        as_json = service.to_json()
+        as_bytes = service.to_bytes()
+
+        json_row = (
+            best_of(service.to_json),
+            best_of(lambda: WorldModelService().from_json(as_json)),
+            float("nan"),
+            len(as_json.encode("utf-8")),
+        )
+        binary_row = (
+            best_of(service.to_bytes),
+            best_of(lambda: WorldModelService().from_bytes(as_bytes)),
+            best_of(lambda: CompactGraph.from_bytes(as_bytes)),
+            len(as_bytes),
+        )
+        for name, (encode, decode, arrays, size) in (
+            ("json", json_row),
+            ("binary", binary_row),
+        ):
+            print(
+                f"{count:>7} {name:>7} {encode:>10.2f} {decode:>10.2f} "
+                f"{arrays:>10.2f} {size:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [20, 200, 2000])
@@ -1,27 +1,37 @@
 """Analysis API endpoints."""
 
-from datetime import datetime
+import asyncio
+from collections.abc import AsyncIterator
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.core.config import settings
 from src.core.database import get_session
+from src.core.dependencies import get_analysis_queue
 from src.models.analysis import AnalysisResult, Barrier
-from src.models.scan import Scan
 from src.schemas.analysis import (
     AnalysisDetailResponse,
+    AnalysisEvent,
     AnalysisRequest,
     AnalysisResponse,
+    BarrierPage,
     BarrierResponse,
-    BarriersBySeverity,
-    ImageAnalysisSummary,
 )
-from src.schemas.enums import AnalysisStatus, BarrierSeverity, BarrierType, ScanStatus
+from src.schemas.enums import (
+    AnalysisEventType,
+    AnalysisStatus,
+    BarrierSeverity,
+    BarrierSort,
+    BarrierType,
+)
+from src.services.analysis_events import analysis_events, summary_event
+from src.services.analysis_queue import AnalysisQueue
+from src.services.analysis_service import AnalysisService
 from src.services.scan_service import ScanService
-from src.services.vision_service import VisionService
-from src.services.world_model_service import WorldModelService
 
 router = APIRouter()
 
@@ -35,8 +45,9 @@ async def start_analysis(
     scan_id: UUID,
     request: AnalysisRequest | None = None,
     session: AsyncSession = Depends(get_session),
+    queue: AnalysisQueue = Depends(get_analysis_queue),
 ) -> AnalysisResponse:
-    """Start accessibility analysis for a scan."""
+    """Queue accessibility analysis for a scan."""
     # Get scan
     scan_service = ScanService(session)
     scan = await scan_service.get_scan(scan_id)
@@ -47,111 +58,49 @@ async def start_analysis(
             detail=f"Scan {scan_id} not found",
         )
 
-    if not scan.images:
+    images = await scan_service.get_images(scan_id)
+    if not images:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No images to analyze",
         )
 
     # Check existing analysis
-    if scan.analysis_result:
-        if scan.analysis_result.status == AnalysisStatus.IN_PROGRESS:
+    analysis_service = AnalysisService(session)
+    analysis = await analysis_service.get_analysis(scan_id)
+    if analysis:
+        if analysis.status in (AnalysisStatus.PENDING, AnalysisStatus.IN_PROGRESS):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Analysis already in progress",
             )
-        if scan.analysis_result.status == AnalysisStatus.COMPLETED and not (
-            request and request.force
+        # Completed and up to date; outdated results are updated incrementally
+        if (
+            analysis.status == AnalysisStatus.COMPLETED
+            and not analysis.outdated
+            and not (request and request.force)
         ):
             return AnalysisResponse(
-                id=scan.analysis_result.id,
+                id=analysis.id,
                 scan_id=scan_id,
-                status=scan.analysis_result.status,
-                started_at=scan.analysis_result.started_at,
-                completed_at=scan.analysis_result.completed_at,
-                error_message=scan.analysis_result.error_message,
-                total_images_analyzed=scan.analysis_result.total_images_analyzed,
-                total_barriers_found=scan.analysis_result.total_barriers_found,
-                accessibility_score=scan.analysis_result.accessibility_score,
+                status=analysis.status,
+                started_at=analysis.started_at,
+                completed_at=analysis.completed_at,
+                error_message=analysis.error_message,
+                total_images_analyzed=analysis.total_images_analyzed,
+                total_barriers_found=analysis.total_barriers_found,
+                accessibility_score=analysis.accessibility_score,
+                outdated=analysis.outdated,
+                partial=analysis.is_partial,
             )
 
-    # Create or update analysis result
-    if scan.analysis_result:
-        analysis = scan.analysis_result
-        analysis.status = AnalysisStatus.IN_PROGRESS
-        analysis.started_at = datetime.utcnow()
-        analysis.completed_at = None
-        analysis.error_message = None
-    else:
-        analysis = AnalysisResult(
-            scan_id=scan_id,
-            status=AnalysisStatus.IN_PROGRESS,
-            started_at=datetime.utcnow(),
-        )
-        session.add(analysis)
-
-    # Update scan status
-    scan.status = ScanStatus.ANALYZING
-    await session.flush()
+    analysis, job = await analysis_service.queue_analysis(
+        scan, analysis, force=bool(request and request.force)
+    )
 
-    # Perform analysis (synchronously for now, could be async task in production)
-    try:
-        vision_service = VisionService()
-        world_model_service = WorldModelService()
-
-        analysis_results: dict[UUID, dict] = {}
-        total_barriers = 0
-
-        for image in scan.images:
-            try:
-                result = await vision_service.analyze_image(image.file_path, image.id)
-                analysis_results[image.id] = result
-
-                # Create barrier records
-                barriers = vision_service.parse_barriers(result, image.id)
-                for barrier in barriers:
-                    session.add(barrier)
-                total_barriers += len(barriers)
-
-            except Exception as e:
-                analysis_results[image.id] = {
-                    "error": str(e),
-                    "accessibility_score": 0,
-                }
-
-        # Build world model
-        await session.flush()  # Ensure barriers are saved
-        # Reload images with barriers
-        images = await scan_service.get_images(scan_id)
-        world_model_service.build_world_model(images, analysis_results)
-
-        # Calculate overall score
-        scores = [
-            r.get("accessibility_score", 50)
-            for r in analysis_results.values()
-            if "error" not in r
-        ]
-        avg_score = sum(scores) / len(scores) if scores else 0
-
-        # Update analysis result
-        analysis.status = AnalysisStatus.COMPLETED
-        analysis.completed_at = datetime.utcnow()
-        analysis.total_images_analyzed = len(scan.images)
-        analysis.total_barriers_found = total_barriers
-        analysis.accessibility_score = avg_score
-        analysis.world_model_json = world_model_service.to_json()
-
-        # Update scan status
-        scan.status = ScanStatus.COMPLETED
-
-    except Exception as e:
-        analysis.status = AnalysisStatus.FAILED
-        analysis.error_message = str(e)
-        analysis.completed_at = datetime.utcnow()
-        scan.status = ScanStatus.FAILED
-
-    await session.flush()
-    await session.refresh(analysis)
+    # Commit before enqueuing so workers see the job
+    await session.commit()
+    await queue.enqueue(job.id)
 
     return AnalysisResponse(
         id=analysis.id,
@@ -163,6 +112,8 @@ async def start_analysis(
         total_images_analyzed=analysis.total_images_analyzed,
         total_barriers_found=analysis.total_barriers_found,
         accessibility_score=analysis.accessibility_score,
+        outdated=analysis.outdated,
+        partial=analysis.is_partial,
     )
 
 
@@ -172,7 +123,6 @@ async def get_analysis(
     session: AsyncSession = Depends(get_session),
 ) -> AnalysisDetailResponse:
     """Get analysis result for a scan."""
-    # Get analysis
     statement = select(AnalysisResult).where(AnalysisResult.scan_id == scan_id)
     result = await session.execute(statement)
     analysis = result.scalar_one_or_none()
@@ -183,53 +133,8 @@ async def get_analysis(
             detail=f"Analysis for scan {scan_id} not found",
         )
 
-    # Get scan with images
-    scan_service = ScanService(session)
-    scan = await scan_service.get_scan(scan_id)
-    if not scan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Scan {scan_id} not found",
-        )
-
-    # Calculate barrier statistics
-    barriers_by_severity = BarriersBySeverity()
-    barriers_by_type: dict[str, int] = {}
-    images_with_barriers: list[ImageAnalysisSummary] = []
-
-    for image in sorted(scan.images, key=lambda x: x.sequence_order):
-        max_severity = None
-        for barrier in image.barriers:
-            # Count by severity
-            if barrier.severity == BarrierSeverity.LOW:
-                barriers_by_severity.low += 1
-            elif barrier.severity == BarrierSeverity.MEDIUM:
-                barriers_by_severity.medium += 1
-            elif barrier.severity == BarrierSeverity.HIGH:
-                barriers_by_severity.high += 1
-            elif barrier.severity == BarrierSeverity.CRITICAL:
-                barriers_by_severity.critical += 1
-
-            # Count by type
-            type_key = barrier.barrier_type.value
-            barriers_by_type[type_key] = barriers_by_type.get(type_key, 0) + 1
-
-            # Track max severity
-            if max_severity is None or self._severity_rank(
-                barrier.severity
-            ) > self._severity_rank(max_severity):
-                max_severity = barrier.severity
-
-        if image.barriers:
-            images_with_barriers.append(
-                ImageAnalysisSummary(
-                    image_id=image.id,
-                    image_url=f"/api/scans/{scan_id}/images/{image.id}/file",
-                    sequence_order=image.sequence_order,
-                    barrier_count=len(image.barriers),
-                    max_severity=max_severity,
-                )
-            )
+    # Aggregated in SQL, or read from the copy stored at completion
+    stats = await AnalysisService(session).get_barrier_statistics(analysis)
 
     return AnalysisDetailResponse(
         id=analysis.id,
@@ -241,31 +146,97 @@ async def get_analysis(
         total_images_analyzed=analysis.total_images_analyzed,
         total_barriers_found=analysis.total_barriers_found,
         accessibility_score=analysis.accessibility_score,
-        barriers_by_severity=barriers_by_severity,
-        barriers_by_type=barriers_by_type,
-        images_with_barriers=images_with_barriers,
+        outdated=analysis.outdated,
+        partial=analysis.is_partial,
+        barriers_by_severity=stats.barriers_by_severity,
+        barriers_by_type=stats.barriers_by_type,
+        images_with_barriers=stats.images_with_barriers,
     )
 
 
-def _severity_rank(severity: BarrierSeverity) -> int:
-    """Get numeric rank for severity comparison."""
-    ranks = {
-        BarrierSeverity.LOW: 1,
-        BarrierSeverity.MEDIUM: 2,
-        BarrierSeverity.HIGH: 3,
-        BarrierSeverity.CRITICAL: 4,
-    }
-    return ranks.get(severity, 0)
+def _encode_sse(event: AnalysisEvent) -> str:
+    """Format an event as a server-sent event; pings become comments."""
+    if event.event == AnalysisEventType.PING:
+        return ": ping\n\n"
+    return f"event: {event.event.value}\ndata: {event.model_dump_json()}\n\n"
+
 
+def _encode_ndjson(event: AnalysisEvent) -> str:
+    """Format an event as one line of NDJSON."""
+    return f"{event.model_dump_json()}\n"
 
-@router.get("/scans/{scan_id}/analysis/barriers", response_model=list[BarrierResponse])
+
+@router.get("/scans/{scan_id}/analysis/events")
+async def stream_analysis_events(
+    scan_id: UUID,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+) -> StreamingResponse:
+    """Stream analysis progress until the run's summary event.
+
+    Clients accepting ``text/event-stream`` get server-sent events, others
+    NDJSON. Analyses that are not running get their summary right away. Idle
+    streams send a ping so proxies keep the connection open.
+    """
+    # Subscribe before reading the status so the summary cannot be missed
+    events = analysis_events.subscribe(scan_id)
+    statement = select(AnalysisResult).where(AnalysisResult.scan_id == scan_id)
+    result = await session.execute(statement)
+    analysis = result.scalar_one_or_none()
+
+    if not analysis:
+        analysis_events.unsubscribe(scan_id, events)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Analysis for scan {scan_id} not found",
+        )
+
+    final = None
+    if analysis.status not in (AnalysisStatus.PENDING, AnalysisStatus.IN_PROGRESS):
+        analysis_events.unsubscribe(scan_id, events)
+        final = summary_event(analysis)
+    use_sse = "text/event-stream" in request.headers.get("accept", "")
+    encode = _encode_sse if use_sse else _encode_ndjson
+
+    async def stream() -> AsyncIterator[str]:
+        try:
+            if final:
+                yield encode(final)
+                return
+            ping = AnalysisEvent(event=AnalysisEventType.PING, scan_id=scan_id)
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        events.get(), settings.analysis_event_keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield encode(ping)
+                    continue
+                yield encode(event)
+                if event.event == AnalysisEventType.SUMMARY:
+                    return
+        finally:
+            analysis_events.unsubscribe(scan_id, events)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/scans/{scan_id}/analysis/barriers", response_model=BarrierPage)
 async def list_barriers(
     scan_id: UUID,
     severity: BarrierSeverity | None = None,
     type: BarrierType | None = None,
+    min_confidence: float | None = Query(default=None, ge=0, le=1),
+    sort: BarrierSort = BarrierSort.SEQUENCE,
+    cursor: str | None = None,
+    limit: int = Query(default=100, ge=1, le=500),
     session: AsyncSession = Depends(get_session),
-) -> list[BarrierResponse]:
-    """List all barriers for a scan."""
+) -> BarrierPage:
+    """List barriers for a scan, one page at a time."""
     scan_service = ScanService(session)
     scan = await scan_service.get_scan(scan_id)
 
@@ -275,34 +246,28 @@ async def list_barriers(
             detail=f"Scan {scan_id} not found",
         )
 
-    barriers = []
-    for image in scan.images:
-        for barrier in image.barriers:
-            if severity and barrier.severity != severity:
-                continue
-            if type and barrier.barrier_type != type:
-                continue
-
-            barriers.append(
-                BarrierResponse(
-                    id=barrier.id,
-                    image_id=barrier.image_id,
-                    barrier_type=barrier.barrier_type,
-                    severity=barrier.severity,
-                    description=barrier.description,
-                    bbox_x=barrier.bbox_x,
-                    bbox_y=barrier.bbox_y,
-                    bbox_width=barrier.bbox_width,
-                    bbox_height=barrier.bbox_height,
-                    estimated_width_cm=barrier.estimated_width_cm,
-                    estimated_height_cm=barrier.estimated_height_cm,
-                    estimated_depth_cm=barrier.estimated_depth_cm,
-                    recommendation=barrier.recommendation,
-                    confidence=barrier.confidence,
-                )
-            )
+    service = AnalysisService(session)
+    try:
+        barriers, next_cursor = await service.list_barriers(
+            scan_id,
+            severity=severity,
+            barrier_type=type,
+            min_confidence=min_confidence,
+            sort=sort,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
-    return barriers
+    return BarrierPage(
+        items=[BarrierResponse.model_validate(b) for b in barriers],
+        next_cursor=next_cursor,
+        limit=limit,
+    )
 
 
 @router.get("/images/{image_id}/barriers", response_model=list[BarrierResponse])
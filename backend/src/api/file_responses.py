@@ -0,0 +1,184 @@
+"""File responses with validators, conditional requests and byte ranges."""
+
+import asyncio
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+
+import anyio
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class FileRangeResponse(FileResponse):
+    """FileResponse that sends only bytes ``start`` to ``end`` (inclusive)."""
+
+    def __init__(self, path: str, start: int, end: int, **kwargs):
+        super().__init__(path, status_code=status.HTTP_206_PARTIAL_CONTENT, **kwargs)
+        self.start = start
+        self.end = end
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if scope["method"].upper() != "HEAD":
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(self.start)
+                remaining = self.end - self.start + 1
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": chunk,
+                            "more_body": remaining > 0,
+                        }
+                    )
+                if remaining <= 0:
+                    return
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _etag_matches(header: str, etag: str, weak: bool) -> bool:
+    """Check an ETag list against ours, with weak or strong comparison.
+
+    If-None-Match uses weak comparison (and accepts ``*``); If-Range
+    requires a strong match.
+    """
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if weak and candidate == "*":
+            return True
+        if weak and candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag, weak=True)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since
+    return False
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into inclusive offsets.
+
+    Returns None for headers we do not handle (multiple ranges, other
+    units), which are answered with the full file. Raises ValueError
+    when the range cannot be satisfied.
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError("Unsatisfiable range")
+    return start, min(end, size - 1)
+
+
+async def file_response(
+    request: Request,
+    path: str,
+    media_type: str,
+    filename: str,
+    content_hash: str | None = None,
+    max_age: int = 0,
+) -> Response:
+    """Serve a file with ETag/Last-Modified, 304s and single byte ranges.
+
+    The ETag is the content hash when known, otherwise it is derived from
+    the file's mtime and size.
+    """
+    try:
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found",
+        )
+
+    size = stat_result.st_size
+    etag = (
+        f'"{content_hash}"'
+        if content_hash
+        else f'"{stat_result.st_mtime_ns:x}-{size:x}"'
+    )
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+    headers = {
+        "etag": etag,
+        "last-modified": last_modified,
+        "cache-control": f"public, max-age={max_age}",
+        "accept-ranges": "bytes",
+    }
+
+    if _not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (
+        if_range is None
+        or if_range == last_modified
+        or _etag_matches(if_range, etag, weak=False)
+    ):
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "content-range": f"bytes */{size}"},
+            )
+        if byte_range is not None:
+            start, end = byte_range
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            headers["content-length"] = str(end - start + 1)
+            return FileRangeResponse(
+                path,
+                start,
+                end,
+                headers=headers,
+                media_type=media_type,
+                filename=filename,
+                stat_result=stat_result,
+            )
+
+    return FileResponse(
+        path,
+        headers=headers,
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result,
+    )
@@ -2,65 +2,212 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import select
+import networkx as nx
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import and_, func
+from sqlmodel import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.core.database import get_session
 from src.models.analysis import AnalysisResult
-from src.models.guide import Guide, WheelchairProfile
+from src.models.guide import Guide, GuideStep, WheelchairProfile
+from src.repositories.image_repository import ImageLoad
 from src.schemas.enums import AnalysisStatus, WheelchairType
 from src.schemas.navigation import (
+    GuideHeaderResponse,
     GuideRequest,
     GuideResponse,
+    GuideStepPage,
+    NavigationStep,
+    RouteResponse,
     WheelchairProfileCreate,
     WheelchairProfileResponse,
     WorldModelResponse,
 )
+from src.services.guide_cache import guide_response_cache
 from src.services.guide_service import GuideService
+from src.services.routing_service import RoutingService
 from src.services.scan_service import ScanService
-from src.services.world_model_service import WorldModelService
+from src.services.world_model_cache import stored_recommended_path, world_model_cache
 
 router = APIRouter()
 
 
-@router.get("/scans/{scan_id}/guide", response_model=GuideResponse)
-async def get_guide(
-    scan_id: UUID,
-    wheelchair_profile_id: UUID | None = None,
-    session: AsyncSession = Depends(get_session),
-) -> GuideResponse:
-    """Get navigation guide for a scan."""
-    # Get existing guide
-    statement = select(Guide).where(Guide.scan_id == scan_id)
+async def _load_profiles(session: AsyncSession) -> list[WheelchairProfile]:
+    """Load all wheelchair profiles, creating the defaults if there are none."""
+    statement = select(WheelchairProfile).order_by(
+        WheelchairProfile.is_default.desc(), WheelchairProfile.name
+    )
     result = await session.execute(statement)
-    guide = result.scalar_one_or_none()
+    profiles = list(result.scalars().all())
+
+    # If no profiles, create defaults
+    if not profiles:
+        guide_service = GuideService()
+        for profile_data in guide_service.DEFAULT_PROFILES:
+            profile = WheelchairProfile(
+                name=profile_data["name"],
+                description=profile_data["description"],
+                width_cm=profile_data["width_cm"],
+                length_cm=profile_data["length_cm"],
+                min_door_width_cm=profile_data["min_door_width_cm"],
+                max_step_height_cm=profile_data["max_step_height_cm"],
+                max_slope_percent=profile_data["max_slope_percent"],
+                can_handle_gravel=profile_data["can_handle_gravel"],
+                can_handle_grass=profile_data["can_handle_grass"],
+                wheelchair_type=WheelchairType(profile_data["wheelchair_type"]),
+                is_default=profile_data["is_default"],
+            )
+            session.add(profile)
+        await session.flush()
+
+        result = await session.execute(statement)
+        profiles = list(result.scalars().all())
+
+    return profiles
+
 
-    if not guide:
+def _selected_guide_id(scan_id: UUID, wheelchair_profile_id: UUID | None):
+    """Subquery of the guide to serve: the profile's, or the default one's."""
+    statement = select(Guide.id).where(Guide.scan_id == scan_id)
+    if wheelchair_profile_id:
+        return statement.where(
+            Guide.wheelchair_profile_id == wheelchair_profile_id
+        ).scalar_subquery()
+    return (
+        statement.outerjoin(
+            WheelchairProfile, WheelchairProfile.id == Guide.wheelchair_profile_id
+        )
+        .order_by(WheelchairProfile.is_default.desc().nulls_last())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+async def _get_guide_row(
+    session: AsyncSession, scan_id: UUID, wheelchair_profile_id: UUID | None
+) -> tuple[Guide, WheelchairProfile | None, float | None, bool]:
+    """Read a guide, its profile and its analysis' score and state at once."""
+    statement = (
+        select(
+            Guide,
+            WheelchairProfile,
+            AnalysisResult.accessibility_score,
+            func.coalesce(AnalysisResult.outdated, False),
+        )
+        .outerjoin(
+            WheelchairProfile, WheelchairProfile.id == Guide.wheelchair_profile_id
+        )
+        .outerjoin(AnalysisResult, AnalysisResult.scan_id == Guide.scan_id)
+        .where(Guide.id == _selected_guide_id(scan_id, wheelchair_profile_id))
+    )
+    result = await session.execute(statement)
+    row = result.one_or_none()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Guide for scan {scan_id} not found. Run analysis first.",
         )
+    return row
+
 
-    # Get wheelchair profile
-    profile = None
-    if guide.wheelchair_profile_id:
-        statement = select(WheelchairProfile).where(
-            WheelchairProfile.id == guide.wheelchair_profile_id
+@router.get("/scans/{scan_id}/guide", response_model=GuideResponse)
+async def get_guide(
+    scan_id: UUID,
+    wheelchair_profile_id: UUID | None = None,
+    session: AsyncSession = Depends(get_session),
+) -> Response:
+    """Get navigation guide for a scan and wheelchair profile.
+
+    Without a profile the default profile's guide is returned. The rendered
+    JSON is cached per guide version, so steps are only read on a miss.
+    """
+    guide, profile, accessibility_score, outdated = await _get_guide_row(
+        session, scan_id, wheelchair_profile_id
+    )
+    version = (guide.updated_at, accessibility_score, outdated)
+    body = guide_response_cache.get(guide.id, version)
+    if body is None:
+        statement = (
+            select(GuideStep.step_json)
+            .where(GuideStep.guide_id == guide.id)
+            .order_by(GuideStep.step_number)
         )
         result = await session.execute(statement)
-        profile = result.scalar_one_or_none()
+        response = GuideService().guide_to_response(
+            guide,
+            profile,
+            accessibility_score,
+            list(result.scalars().all()),
+            outdated=outdated,
+        )
+        body = response.model_dump_json().encode("utf-8")
+        guide_response_cache.set(guide.id, version, body)
 
-    # Get analysis for accessibility score
-    statement = select(AnalysisResult).where(AnalysisResult.scan_id == scan_id)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/scans/{scan_id}/guide/header", response_model=GuideHeaderResponse)
+async def get_guide_header(
+    scan_id: UUID,
+    wheelchair_profile_id: UUID | None = None,
+    session: AsyncSession = Depends(get_session),
+) -> GuideHeaderResponse:
+    """Get a guide's title, summary, alerts and step count without its steps."""
+    guide, profile, accessibility_score, outdated = await _get_guide_row(
+        session, scan_id, wheelchair_profile_id
+    )
+    return GuideService().guide_to_header(
+        guide, profile, accessibility_score, outdated=outdated
+    )
+
+
+@router.get("/scans/{scan_id}/guide/steps", response_model=GuideStepPage)
+async def list_guide_steps(
+    scan_id: UUID,
+    wheelchair_profile_id: UUID | None = None,
+    from_step: int = Query(default=1, ge=1, alias="from"),
+    limit: int = Query(default=20, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+) -> GuideStepPage:
+    """Get a range of a guide's navigation steps, starting at step ``from``.
+
+    Only the requested steps are read and decoded.
+    """
+    statement = (
+        select(Guide.step_count, GuideStep.step_json)
+        .select_from(Guide)
+        .outerjoin(
+            GuideStep,
+            and_(
+                GuideStep.guide_id == Guide.id,
+                GuideStep.step_number >= from_step,
+                GuideStep.step_number < from_step + limit,
+            ),
+        )
+        .where(Guide.id == _selected_guide_id(scan_id, wheelchair_profile_id))
+        .order_by(GuideStep.step_number)
+    )
     result = await session.execute(statement)
-    analysis = result.scalar_one_or_none()
+    rows = result.all()
 
-    guide_service = GuideService()
-    return guide_service.guide_to_response(
-        guide,
-        profile,
-        analysis.accessibility_score if analysis else None,
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Guide for scan {scan_id} not found. Run analysis first.",
+        )
+
+    step_count = rows[0].step_count
+    next_from = from_step + limit
+    return GuideStepPage(
+        items=[
+            NavigationStep.model_validate_json(row.step_json)
+            for row in rows
+            if row.step_json is not None
+        ],
+        next_from=next_from if next_from <= step_count else None,
+        limit=limit,
     )
 
 
@@ -74,7 +221,7 @@ async def generate_guide(
     request: GuideRequest | None = None,
     session: AsyncSession = Depends(get_session),
 ) -> GuideResponse:
-    """Generate or regenerate navigation guide."""
+    """Generate or regenerate the navigation guides of every wheelchair profile."""
     # Get scan
     scan_service = ScanService(session)
     scan = await scan_service.get_scan(scan_id)
@@ -96,30 +243,33 @@ async def generate_guide(
             detail="Analysis not completed. Run analysis first.",
         )
 
-    # Get wheelchair profile
-    profile = None
-    if request and request.wheelchair_profile_id:
-        statement = select(WheelchairProfile).where(
-            WheelchairProfile.id == request.wheelchair_profile_id
+    # Guides are generated for every profile at once; profiles list the
+    # default first, and the response is the requested profile's guide
+    profiles = await _load_profiles(session)
+    requested_id = request.wheelchair_profile_id if request else None
+    index = 0
+    if requested_id is not None:
+        index = next(
+            (i for i, profile in enumerate(profiles) if profile.id == requested_id),
+            None,
         )
-        result = await session.execute(statement)
-        profile = result.scalar_one_or_none()
-    else:
-        # Get default profile
-        statement = select(WheelchairProfile).where(WheelchairProfile.is_default == True)
-        result = await session.execute(statement)
-        profile = result.scalar_one_or_none()
-
+        if index is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Wheelchair profile {requested_id} not found",
+            )
     # Build analysis results dict
-    images = await scan_service.get_images(scan_id)
+    images = await scan_service.get_images(scan_id, ImageLoad.WITH_BARRIERS)
 
     # Load world model to get analysis data
-    world_model_service = WorldModelService()
-    if analysis.world_model_json:
-        world_model_service.from_json(analysis.world_model_json)
+    world_model_service = world_model_cache.get_service(analysis)
+    graph = world_model_service.graph if world_model_service else nx.DiGraph()
+    recommended_path = stored_recommended_path(analysis)
+    if recommended_path is None and world_model_service:
+        recommended_path = world_model_service.compute_recommended_path()
 
     analysis_results: dict[UUID, dict] = {}
-    for node_id, data in world_model_service.graph.nodes(data=True):
+    for node_id, data in graph.nodes(data=True):
         image_id = UUID(data.get("image_id", ""))
         analysis_results[image_id] = {
             "space_type": data.get("space_type", "other"),
@@ -128,25 +278,29 @@ async def generate_guide(
             "overall_description": "",
         }
 
-    # Generate guide
+    # Generate guides
     guide_service = GuideService()
-    guide = guide_service.generate_guide(scan_id, images, analysis_results, profile)
-
-    # Delete existing guide
-    statement = select(Guide).where(Guide.scan_id == scan_id)
-    result = await session.execute(statement)
-    existing_guide = result.scalar_one_or_none()
-    if existing_guide:
-        await session.delete(existing_guide)
+    guides = guide_service.generate_guides(
+        scan_id, images, analysis_results, profiles, recommended_path
+    )
 
-    session.add(guide)
+    # Replace existing guides
+    existing = select(Guide.id).where(Guide.scan_id == scan_id)
+    await session.execute(delete(GuideStep).where(GuideStep.guide_id.in_(existing)))
+    await session.execute(delete(Guide).where(Guide.scan_id == scan_id))
+    session.add_all(guides)
     await session.flush()
+
+    guide = guides[index]
+    steps_json = [step.step_json for step in guide.steps]
     await session.refresh(guide)
 
     return guide_service.guide_to_response(
         guide,
-        profile,
+        profiles[index],
         analysis.accessibility_score,
+        steps_json,
+        outdated=analysis.outdated,
     )
 
 
@@ -155,23 +309,74 @@ async def get_world_model(
     scan_id: UUID,
     session: AsyncSession = Depends(get_session),
 ) -> WorldModelResponse:
-    """Get world model graph for a scan."""
+    """Get world model graph for a scan.
+
+    While an analysis runs, the images analyzed so far are served, flagged
+    as partial. Images added or removed since the analysis are only
+    reflected after the next run; until then the graph is flagged outdated.
+    """
     # Get analysis
     statement = select(AnalysisResult).where(AnalysisResult.scan_id == scan_id)
     result = await session.execute(statement)
     analysis = result.scalar_one_or_none()
 
-    if not analysis or not analysis.world_model_json:
+    if not analysis or not analysis.has_world_model:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"World model for scan {scan_id} not found",
         )
 
-    # Load world model
-    world_model_service = WorldModelService()
-    world_model_service.from_json(analysis.world_model_json)
+    response = world_model_cache.get_response(analysis)
+    if analysis.is_partial or analysis.outdated:
+        return response.model_copy(
+            update={"partial": analysis.is_partial, "outdated": analysis.outdated}
+        )
+    return response
+
+
+@router.get("/scans/{scan_id}/route", response_model=RouteResponse)
+async def get_route(
+    scan_id: UUID,
+    from_node: str = Query(alias="from"),
+    to_node: str = Query(alias="to"),
+    profile: UUID | None = None,
+    session: AsyncSession = Depends(get_session),
+) -> RouteResponse:
+    """Get the most accessible route between two world model nodes."""
+    statement = select(AnalysisResult).where(AnalysisResult.scan_id == scan_id)
+    result = await session.execute(statement)
+    analysis = result.scalar_one_or_none()
 
-    return world_model_service.to_response(scan_id)
+    if not analysis or not analysis.has_world_model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"World model for scan {scan_id} not found",
+        )
+
+    wheelchair_profile = None
+    if profile:
+        statement = select(WheelchairProfile).where(WheelchairProfile.id == profile)
+        result = await session.execute(statement)
+        wheelchair_profile = result.scalar_one_or_none()
+        if not wheelchair_profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Wheelchair profile {profile} not found",
+            )
+
+    try:
+        route = RoutingService().route(
+            analysis, from_node, to_node, wheelchair_profile
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    if analysis.outdated:
+        # Routes are memoized per graph version and must not be mutated
+        return route.model_copy(update={"outdated": True})
+    return route
 
 
 @router.get("/wheelchair-profiles", response_model=list[WheelchairProfileResponse])
@@ -179,34 +384,7 @@ async def list_wheelchair_profiles(
     session: AsyncSession = Depends(get_session),
 ) -> list[WheelchairProfileResponse]:
     """List all wheelchair profiles."""
-    statement = select(WheelchairProfile).order_by(
-        WheelchairProfile.is_default.desc(), WheelchairProfile.name
-    )
-    result = await session.execute(statement)
-    profiles = result.scalars().all()
-
-    # If no profiles, create defaults
-    if not profiles:
-        guide_service = GuideService()
-        for profile_data in guide_service.DEFAULT_PROFILES:
-            profile = WheelchairProfile(
-                name=profile_data["name"],
-                description=profile_data["description"],
-                width_cm=profile_data["width_cm"],
-                length_cm=profile_data["length_cm"],
-                min_door_width_cm=profile_data["min_door_width_cm"],
-                max_step_height_cm=profile_data["max_step_height_cm"],
-                max_slope_percent=profile_data["max_slope_percent"],
-                can_handle_gravel=profile_data["can_handle_gravel"],
-                can_handle_grass=profile_data["can_handle_grass"],
-                wheelchair_type=WheelchairType(profile_data["wheelchair_type"]),
-                is_default=profile_data["is_default"],
-            )
-            session.add(profile)
-        await session.flush()
-
-        result = await session.execute(statement)
-        profiles = result.scalars().all()
+    profiles = await _load_profiles(session)
 
     return [
         WheelchairProfileResponse(
@@ -327,4 +505,10 @@ async def delete_wheelchair_profile(
             detail="Cannot delete default profile",
         )
 
+    # Guides generated for the profile go with it
+    guides = select(Guide.id).where(Guide.wheelchair_profile_id == profile_id)
+    await session.execute(delete(GuideStep).where(GuideStep.guide_id.in_(guides)))
+    await session.execute(
+        delete(Guide).where(Guide.wheelchair_profile_id == profile_id)
+    )
     await session.delete(profile)
@@ -2,25 +2,51 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.api.file_responses import file_response
+from src.core.config import settings
 from src.core.database import get_session
-from src.schemas.enums import ScanStatus
+from src.repositories.image_repository import ImageLoad
+from src.repositories.scan_repository import ScanLoad
+from src.schemas.enums import AnalysisStatus, ImageSize, ScanStatus
 from src.schemas.scan import (
     ImageResponse,
     ImageUploadResponse,
+    ImageUrls,
     ScanCreate,
     ScanDetailResponse,
     ScanResponse,
     ScanUpdate,
 )
+from src.services.analysis_service import AnalysisService
 from src.services.scan_service import ScanService
 
 router = APIRouter()
 
 
+async def _ensure_analysis_idle(session: AsyncSession, scan_id: UUID) -> None:
+    """Reject image changes while the scan's analysis is queued or running."""
+    analysis = await AnalysisService(session).get_analysis(scan_id)
+    if analysis and analysis.status in (
+        AnalysisStatus.PENDING,
+        AnalysisStatus.IN_PROGRESS,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Analysis in progress",
+        )
+
+
 @router.post("", response_model=ScanResponse, status_code=status.HTTP_201_CREATED)
 async def create_scan(
     data: ScanCreate,
@@ -51,6 +77,7 @@ async def list_scans(
     """List all scans."""
     service = ScanService(session)
     scans, total = await service.list_scans(status=status, limit=limit, offset=offset)
+    image_counts = await service.get_image_counts([s.id for s in scans])
 
     return {
         "items": [
@@ -60,7 +87,7 @@ async def list_scans(
                 description=s.description,
                 location=s.location,
                 status=s.status,
-                image_count=s.image_count,
+                image_count=image_counts.get(s.id, 0),
                 created_at=s.created_at,
                 updated_at=s.updated_at,
             )
@@ -79,7 +106,7 @@ async def get_scan(
 ) -> ScanDetailResponse:
     """Get a scan by ID."""
     service = ScanService(session)
-    scan = await service.get_scan(scan_id)
+    scan = await service.get_scan(scan_id, ScanLoad.DETAIL)
 
     if not scan:
         raise HTTPException(
@@ -101,6 +128,7 @@ async def get_scan(
             created_at=img.created_at,
             barrier_count=img.barrier_count,
             url=f"/api/scans/{scan_id}/images/{img.id}/file",
+            urls=ImageUrls.for_image(scan_id, img.id),
         )
         for img in sorted(scan.images, key=lambda x: x.sequence_order)
     ]
@@ -146,13 +174,15 @@ async def update_scan(
             detail=f"Scan {scan_id} not found",
         )
 
+    image_counts = await service.get_image_counts([scan.id])
+
     return ScanResponse(
         id=scan.id,
         name=scan.name,
         description=scan.description,
         location=scan.location,
         status=scan.status,
-        image_count=scan.image_count,
+        image_count=image_counts.get(scan.id, 0),
         created_at=scan.created_at,
         updated_at=scan.updated_at,
     )
@@ -189,7 +219,7 @@ async def list_images(
             detail=f"Scan {scan_id} not found",
         )
 
-    images = await service.get_images(scan_id)
+    images = await service.get_images(scan_id, ImageLoad.WITH_BARRIERS)
     return [
         ImageResponse(
             id=img.id,
@@ -204,6 +234,7 @@ async def list_images(
             created_at=img.created_at,
             barrier_count=img.barrier_count,
             url=f"/api/scans/{scan_id}/images/{img.id}/file",
+            urls=ImageUrls.for_image(scan_id, img.id),
         )
         for img in images
     ]
@@ -220,6 +251,7 @@ async def upload_images(
     session: AsyncSession = Depends(get_session),
 ) -> ImageUploadResponse:
     """Upload images to a scan."""
+    await _ensure_analysis_idle(session, scan_id)
     service = ScanService(session)
 
     try:
@@ -236,23 +268,27 @@ async def upload_images(
 async def get_image_file(
     scan_id: UUID,
     image_id: UUID,
+    request: Request,
+    size: ImageSize = ImageSize.ORIGINAL,
     session: AsyncSession = Depends(get_session),
-) -> FileResponse:
-    """Get image file."""
+) -> Response:
+    """Get image file or a size variant, honoring conditional and Range requests."""
     service = ScanService(session)
-    images = await service.get_images(scan_id)
+    image = await service.get_image_file(scan_id, image_id, size)
 
-    image = next((img for img in images if img.id == image_id), None)
     if not image:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Image {image_id} not found",
         )
 
-    return FileResponse(
+    return await file_response(
+        request,
         image.file_path,
         media_type=image.mime_type,
         filename=image.original_filename,
+        content_hash=image.content_hash,
+        max_age=settings.image_file_max_age,
     )
 
 
@@ -266,6 +302,7 @@ async def delete_image(
     session: AsyncSession = Depends(get_session),
 ) -> None:
     """Delete an image."""
+    await _ensure_analysis_idle(session, scan_id)
     service = ScanService(session)
     deleted = await service.delete_image(scan_id, image_id)
 
@@ -283,6 +320,7 @@ async def reorder_images(
     session: AsyncSession = Depends(get_session),
 ) -> list[ImageResponse]:
     """Reorder images in a scan."""
+    await _ensure_analysis_idle(session, scan_id)
     service = ScanService(session)
     images = await service.reorder_images(scan_id, image_ids)
 
@@ -300,6 +338,7 @@ async def reorder_images(
             created_at=img.created_at,
             barrier_count=img.barrier_count,
             url=f"/api/scans/{scan_id}/images/{img.id}/file",
+            urls=ImageUrls.for_image(scan_id, img.id),
         )
         for img in images
     ]
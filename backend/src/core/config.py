@@ -41,15 +41,51 @@ class Settings(BaseSettings):
     max_upload_size_mb: int = 10
     allowed_image_types: list[str] = ["image/jpeg", "image/png", "image/webp"]
     max_images_per_scan: int = 20
+    upload_chunk_size: int = 1024 * 1024
+    upload_probe_bytes: int = 256 * 1024
+    upload_concurrency: int = 4
+    image_file_cache_size: int = 4096
+    image_file_max_age: int = 3600
+    image_thumbnail_edge: int = 320
+    image_medium_edge: int = 1280
+    image_derivative_quality: int = 80
 
     # Analysis
     vision_api_daily_limit: int = 100
+    analysis_worker_count: int = 2
+    # Starts of a job before it is failed instead of requeued (a job that
+    # keeps crashing the process would otherwise run on every restart)
+    analysis_job_max_attempts: int = 3
+    vision_max_concurrency: int = 8
+    vision_scan_concurrency: int = 4
+    vision_cache_enabled: bool = True
+    vision_cache_dir: Path = Path("./data/vision_cache")
+    vision_cache_max_mb: int = 256
+    vision_image_max_edge: int = 2048
+    vision_image_format: Literal["JPEG", "WEBP"] = "JPEG"
+    vision_image_quality: int = 85
+    world_model_cache_size: int = 128
+    route_cache_size: int = 1024
+    guide_cache_size: int = 256
+    # Progress events held per stream subscriber before the oldest are dropped
+    analysis_event_buffer: int = 1000
+    # Idle seconds before a progress stream sends a keepalive, kept well under
+    # the proxy read timeout
+    analysis_event_keepalive_seconds: float = 15.0
+    # Shortest-path trees built at completion: from every node, from
+    # entrances (and the first location) only, or none
+    route_precompute: Literal["off", "entrances", "all"] = "all"
 
     @property
     def max_upload_size_bytes(self) -> int:
         """Get max upload size in bytes."""
         return self.max_upload_size_mb * 1024 * 1024
 
+    @property
+    def vision_cache_max_bytes(self) -> int:
+        """Get max vision cache size in bytes."""
+        return self.vision_cache_max_mb * 1024 * 1024
+
     @property
     def is_development(self) -> bool:
         """Check if running in development mode."""
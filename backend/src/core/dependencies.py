@@ -34,3 +34,10 @@ async def get_guide_service() -> AsyncGenerator["GuideService", None]:
 
     service = GuideService()
     yield service
+
+
+def get_analysis_queue() -> "AnalysisQueue":
+    """Get the process-wide analysis job queue."""
+    from src.services.analysis_queue import analysis_queue
+
+    return analysis_queue
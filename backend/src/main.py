@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from src.api import api_router
 from src.core.config import settings
 from src.core.database import init_db
+from src.services.analysis_queue import analysis_queue
 
 
 @asynccontextmanager
@@ -20,10 +21,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Ensure upload directory exists
     settings.upload_dir.mkdir(parents=True, exist_ok=True)
 
+    # Start analysis workers and resume jobs interrupted by a restart
+    await analysis_queue.start()
+
     yield
 
     # Shutdown
-    pass
+    await analysis_queue.stop()
 
 
 def create_app() -> FastAPI:
@@ -3,7 +3,8 @@
 from .scan import Scan
 from .image import Image
 from .analysis import AnalysisResult, Barrier
-from .guide import Guide, WheelchairProfile
+from .guide import Guide, GuideStep, WheelchairProfile
+from .job import AnalysisJob
 
 __all__ = [
     "Scan",
@@ -11,5 +12,7 @@ __all__ = [
     "AnalysisResult",
     "Barrier",
     "Guide",
+    "GuideStep",
     "WheelchairProfile",
+    "AnalysisJob",
 ]
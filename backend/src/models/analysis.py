@@ -29,8 +29,22 @@ class AnalysisResult(SQLModel, table=True):
     total_images_analyzed: int = Field(default=0)
     total_barriers_found: int = Field(default=0)
     accessibility_score: float | None = None
-
+    # Images whose score is averaged into accessibility_score; None for
+    # results that predate incremental updates
+    scored_image_count: int | None = None
+    # Images were added, deleted or reordered since the last run
+    outdated: bool = Field(default=False)
+
+    # CompactGraph binary encoding; rows written before it was added only
+    # have the node-link JSON in world_model_json
+    world_model_blob: bytes | None = None
     world_model_json: str | None = None
+    # RecommendedPath computed from the world model at completion
+    recommended_path_json: str | None = None
+    # BarrierStatistics materialized at completion; None means compute live
+    barrier_stats_json: str | None = None
+    # RouteTable blob of precomputed shortest-path trees, per profile
+    route_trees: bytes | None = None
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -38,6 +52,16 @@ class AnalysisResult(SQLModel, table=True):
     # Relationships
     scan: "Scan" = Relationship(back_populates="analysis_result")
 
+    @property
+    def has_world_model(self) -> bool:
+        """Check whether a world model is stored, in either format."""
+        return bool(self.world_model_blob or self.world_model_json)
+
+    @property
+    def is_partial(self) -> bool:
+        """Check whether the stored results may still be missing images."""
+        return self.status != AnalysisStatus.COMPLETED
+
 
 class Barrier(SQLModel, table=True):
     """Accessibility barrier detected in an image."""
@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 from src.schemas.enums import WheelchairType
@@ -40,12 +41,17 @@ class WheelchairProfile(SQLModel, table=True):
 
 
 class Guide(SQLModel, table=True):
-    """Navigation guide generated for a scan."""
+    """Navigation guide generated for a scan and wheelchair profile."""
 
     __tablename__ = "guides"
+    __table_args__ = (
+        UniqueConstraint(
+            "scan_id", "wheelchair_profile_id", name="uq_guides_scan_id_profile_id"
+        ),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    scan_id: UUID = Field(foreign_key="scans.id", unique=True, index=True)
+    scan_id: UUID = Field(foreign_key="scans.id", index=True)
     wheelchair_profile_id: UUID | None = Field(
         default=None, foreign_key="wheelchair_profiles.id"
     )
@@ -53,7 +59,7 @@ class Guide(SQLModel, table=True):
     title: str = Field(max_length=255)
     summary: str = Field(max_length=2000)
 
-    navigation_steps_json: str
+    step_count: int = Field(default=0)
     alerts_json: str
     recommended_path_json: str | None = None
 
@@ -61,5 +67,22 @@ class Guide(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     # Relationships
-    scan: "Scan" = Relationship(back_populates="guide")
+    scan: "Scan" = Relationship(back_populates="guides")
     wheelchair_profile: WheelchairProfile | None = Relationship()
+    steps: list["GuideStep"] = Relationship(
+        back_populates="guide",
+        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
+    )
+
+
+class GuideStep(SQLModel, table=True):
+    """One navigation step of a guide, stored as its serialized JSON."""
+
+    __tablename__ = "guide_steps"
+
+    guide_id: UUID = Field(foreign_key="guides.id", primary_key=True)
+    step_number: int = Field(primary_key=True)
+    step_json: str
+
+    # Relationships
+    guide: Guide = Relationship(back_populates="steps")
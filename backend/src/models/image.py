@@ -24,6 +24,7 @@ class Image(SQLModel, table=True):
     file_path: str = Field(max_length=500)
     file_size: int
     mime_type: str = Field(max_length=50)
+    content_hash: str | None = Field(default=None, max_length=64, index=True)
 
     width: int | None = None
     height: int | None = None
@@ -31,6 +32,10 @@ class Image(SQLModel, table=True):
     sequence_order: int = Field(default=0)
     user_description: str | None = Field(default=None, max_length=500)
 
+    # Vision result of the last analysis ({"error": ...} if it failed);
+    # None until the image has been analyzed
+    analysis_json: str | None = None
+
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     # Relationships
@@ -0,0 +1,27 @@
+"""Background job database models."""
+
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from sqlmodel import Field, SQLModel
+
+from src.schemas.enums import JobStatus
+
+
+class AnalysisJob(SQLModel, table=True):
+    """Queued analysis run for a scan, persisted so it survives restarts."""
+
+    __tablename__ = "analysis_jobs"
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    scan_id: UUID = Field(foreign_key="scans.id", index=True)
+    analysis_id: UUID = Field(foreign_key="analysis_results.id", index=True)
+
+    status: JobStatus = Field(default=JobStatus.QUEUED, index=True)
+    force: bool = Field(default=False)
+    attempts: int = Field(default=0)
+    error_message: str | None = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
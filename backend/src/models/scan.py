@@ -1,7 +1,7 @@
 """Scan database model."""
 
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from uuid import UUID, uuid4
 
 from sqlmodel import Field, Relationship, SQLModel
@@ -33,13 +33,13 @@ class Scan(SQLModel, table=True):
         back_populates="scan",
         sa_relationship_kwargs={"cascade": "all, delete-orphan"},
     )
-    analysis_result: "AnalysisResult | None" = Relationship(
+    analysis_result: Optional["AnalysisResult"] = Relationship(
         back_populates="scan",
         sa_relationship_kwargs={"cascade": "all, delete-orphan", "uselist": False},
     )
-    guide: "Guide | None" = Relationship(
+    guides: list["Guide"] = Relationship(
         back_populates="scan",
-        sa_relationship_kwargs={"cascade": "all, delete-orphan", "uselist": False},
+        sa_relationship_kwargs={"cascade": "all, delete-orphan"},
     )
 
     @property
@@ -49,5 +49,5 @@ class Scan(SQLModel, table=True):
 
     @property
     def has_guide(self) -> bool:
-        """Check if this scan has a guide."""
-        return self.guide is not None
+        """Check if this scan has a guide for any profile."""
+        return bool(self.guides)
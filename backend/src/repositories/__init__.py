@@ -1,6 +1,15 @@
 """Repository layer for data access."""
 
-from .scan_repository import ScanRepository
-from .image_repository import ImageRepository
+from .scan_repository import ScanLoad, ScanRepository
+from .image_repository import ImageLoad, ImageRepository
+from .barrier_repository import BarrierRepository
+from .job_repository import AnalysisJobRepository
 
-__all__ = ["ScanRepository", "ImageRepository"]
+__all__ = [
+    "ScanLoad",
+    "ScanRepository",
+    "ImageLoad",
+    "ImageRepository",
+    "BarrierRepository",
+    "AnalysisJobRepository",
+]
@@ -0,0 +1,142 @@
+"""Repository for Barrier operations."""
+
+from uuid import UUID
+
+from sqlalchemy import and_, case, delete, func, or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.analysis import Barrier
+from src.models.image import Image
+from src.schemas.enums import BarrierSeverity, BarrierSort, BarrierType
+
+SEVERITY_RANKS = {
+    BarrierSeverity.LOW: 1,
+    BarrierSeverity.MEDIUM: 2,
+    BarrierSeverity.HIGH: 3,
+    BarrierSeverity.CRITICAL: 4,
+}
+RANKED_SEVERITIES = {rank: severity for severity, rank in SEVERITY_RANKS.items()}
+
+SEVERITY_RANK = case(
+    *(
+        (Barrier.severity == severity, rank)
+        for severity, rank in SEVERITY_RANKS.items()
+    ),
+    else_=0,
+)
+
+# Sort key expression and whether it is descending; ties are broken by id
+BARRIER_SORT_KEYS = {
+    BarrierSort.SEQUENCE: (Image.sequence_order, False),
+    BarrierSort.SEVERITY: (SEVERITY_RANK, True),
+    BarrierSort.CONFIDENCE: (Barrier.confidence, True),
+}
+
+
+class BarrierRepository:
+    """Repository for Barrier CRUD operations."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_many(self, barriers: list[Barrier]) -> list[Barrier]:
+        """Insert barriers in one batch.
+
+        All column defaults are generated client-side, so the rows are not
+        refreshed after the insert.
+        """
+        self.session.add_all(barriers)
+        await self.session.flush()
+        return barriers
+
+    async def delete_by_image_ids(self, image_ids: list[UUID]) -> None:
+        """Delete all barriers of the given images."""
+        if not image_ids:
+            return
+        statement = delete(Barrier).where(Barrier.image_id.in_(image_ids))
+        await self.session.execute(statement)
+
+    async def count_by_image_id(self, image_id: UUID) -> int:
+        """Count the barriers of an image."""
+        statement = select(func.count()).where(Barrier.image_id == image_id)
+        result = await self.session.execute(statement)
+        return result.scalar() or 0
+
+    async def count_by_severity_and_type(
+        self, scan_id: UUID
+    ) -> list[tuple[BarrierSeverity, BarrierType, int]]:
+        """Count a scan's barriers grouped by severity and type."""
+        statement = (
+            select(Barrier.severity, Barrier.barrier_type, func.count())
+            .join(Image, Image.id == Barrier.image_id)
+            .where(Image.scan_id == scan_id)
+            .group_by(Barrier.severity, Barrier.barrier_type)
+        )
+        result = await self.session.execute(statement)
+        return [tuple(row) for row in result.all()]
+
+    async def summarize_by_image(
+        self, scan_id: UUID
+    ) -> list[tuple[UUID, int, int, BarrierSeverity]]:
+        """Get barrier count and max severity per image, in sequence order.
+
+        Images without barriers are omitted.
+        """
+        statement = (
+            select(
+                Image.id,
+                Image.sequence_order,
+                func.count(Barrier.id),
+                func.max(SEVERITY_RANK),
+            )
+            .join(Barrier, Barrier.image_id == Image.id)
+            .where(Image.scan_id == scan_id)
+            .group_by(Image.id, Image.sequence_order)
+            .order_by(Image.sequence_order)
+        )
+        result = await self.session.execute(statement)
+        return [
+            (image_id, order, count, RANKED_SEVERITIES[rank])
+            for image_id, order, count, rank in result.all()
+        ]
+
+    async def list_by_scan_id(
+        self,
+        scan_id: UUID,
+        severity: BarrierSeverity | None = None,
+        barrier_type: BarrierType | None = None,
+        min_confidence: float | None = None,
+        sort: BarrierSort = BarrierSort.SEQUENCE,
+        after: tuple[float, UUID] | None = None,
+        limit: int = 100,
+    ) -> list[tuple[Barrier, float]]:
+        """Get a page of a scan's barriers with their sort key values.
+
+        ``after`` is the (sort key, id) of the last row of the previous
+        page; rows are returned strictly past it (keyset pagination).
+        """
+        key, descending = BARRIER_SORT_KEYS[sort]
+        statement = (
+            select(Barrier, key)
+            .join(Image, Image.id == Barrier.image_id)
+            .where(Image.scan_id == scan_id)
+        )
+        if severity:
+            statement = statement.where(Barrier.severity == severity)
+        if barrier_type:
+            statement = statement.where(Barrier.barrier_type == barrier_type)
+        if min_confidence is not None:
+            statement = statement.where(Barrier.confidence >= min_confidence)
+        if after is not None:
+            after_key, after_id = after
+            past_key = key < after_key if descending else key > after_key
+            statement = statement.where(
+                or_(past_key, and_(key == after_key, Barrier.id > after_id))
+            )
+
+        statement = statement.order_by(
+            key.desc() if descending else key.asc(), Barrier.id
+        ).limit(limit)
+        result = await self.session.execute(statement)
+        return [(barrier, sort_key) for barrier, sort_key in result.all()]
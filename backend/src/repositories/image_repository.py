@@ -2,12 +2,25 @@
 
 from uuid import UUID
 
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.base import ExecutableOption
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.models.image import Image
 
 
+class ImageLoad:
+    """Loader option profiles for Image queries."""
+
+    # Image rows only; touching image.barriers would lazy-load
+    PLAIN: tuple[ExecutableOption, ...] = ()
+    # Images plus all their barriers in one extra SELECT
+    WITH_BARRIERS: tuple[ExecutableOption, ...] = (selectinload(Image.barriers),)
+
+
 class ImageRepository:
     """Repository for Image CRUD operations."""
 
@@ -22,12 +35,16 @@ class ImageRepository:
         return image
 
     async def create_many(self, images: list[Image]) -> list[Image]:
-        """Create multiple images."""
-        for image in images:
-            self.session.add(image)
+        """Create multiple images in one batch.
+
+        All column defaults are generated client-side, so the rows are not
+        refreshed after the insert. New images have no barriers yet, so the
+        collection is marked as loaded to avoid a lazy load per image.
+        """
+        self.session.add_all(images)
         await self.session.flush()
         for image in images:
-            await self.session.refresh(image)
+            set_committed_value(image, "barriers", [])
         return images
 
     async def get_by_id(self, image_id: UUID) -> Image | None:
@@ -36,16 +53,43 @@ class ImageRepository:
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
 
-    async def get_by_scan_id(self, scan_id: UUID) -> list[Image]:
-        """Get all images for a scan."""
+    async def get_file_info(
+        self, scan_id: UUID, image_id: UUID
+    ) -> tuple[str, str, str, str | None] | None:
+        """Get the columns needed to serve an image file, or None if missing."""
+        statement = select(
+            Image.file_path,
+            Image.mime_type,
+            Image.original_filename,
+            Image.content_hash,
+        ).where(Image.id == image_id, Image.scan_id == scan_id)
+        result = await self.session.execute(statement)
+        row = result.one_or_none()
+        return tuple(row) if row else None
+
+    async def get_by_scan_id(
+        self,
+        scan_id: UUID,
+        options: tuple[ExecutableOption, ...] = ImageLoad.PLAIN,
+    ) -> list[Image]:
+        """Get all images for a scan, loading relationships per ``options``."""
         statement = (
             select(Image)
             .where(Image.scan_id == scan_id)
             .order_by(Image.sequence_order)
+            .options(*options)
         )
         result = await self.session.execute(statement)
         return list(result.scalars().all())
 
+    async def count_by_scan_id(self, scan_id: UUID) -> int:
+        """Count the images of a scan."""
+        statement = select(func.count()).select_from(Image).where(
+            Image.scan_id == scan_id
+        )
+        result = await self.session.execute(statement)
+        return result.scalar() or 0
+
     async def update(self, image: Image) -> Image:
         """Update an image."""
         self.session.add(image)
@@ -70,9 +114,14 @@ class ImageRepository:
         max_order = result.scalar_one_or_none()
         return max_order if max_order is not None else -1
 
-    async def reorder(self, scan_id: UUID, image_ids: list[UUID]) -> list[Image]:
+    async def reorder(
+        self,
+        scan_id: UUID,
+        image_ids: list[UUID],
+        options: tuple[ExecutableOption, ...] = ImageLoad.PLAIN,
+    ) -> list[Image]:
         """Reorder images in a scan."""
-        images = await self.get_by_scan_id(scan_id)
+        images = await self.get_by_scan_id(scan_id, options)
         image_map = {img.id: img for img in images}
 
         for order, image_id in enumerate(image_ids):
@@ -80,4 +129,4 @@ class ImageRepository:
                 image_map[image_id].sequence_order = order
 
         await self.session.flush()
-        return await self.get_by_scan_id(scan_id)
+        return sorted(images, key=lambda img: img.sequence_order)
@@ -0,0 +1,59 @@
+"""Repository for AnalysisJob operations."""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.job import AnalysisJob
+from src.schemas.enums import JobStatus
+
+
+class AnalysisJobRepository:
+    """Repository for AnalysisJob CRUD operations."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, job: AnalysisJob) -> AnalysisJob:
+        """Create a new job."""
+        self.session.add(job)
+        await self.session.flush()
+        return job
+
+    async def get_by_id(self, job_id: UUID) -> AnalysisJob | None:
+        """Get a job by ID."""
+        statement = select(AnalysisJob).where(AnalysisJob.id == job_id)
+        result = await self.session.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def claim(self, job_id: UUID) -> bool:
+        """Move a queued job to running, counting the attempt.
+
+        The status check and the change are one statement, so of several
+        workers or processes picking up the same job only one gets True.
+        """
+        statement = (
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id, AnalysisJob.status == JobStatus.QUEUED)
+            .values(
+                status=JobStatus.RUNNING,
+                started_at=datetime.utcnow(),
+                attempts=AnalysisJob.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(statement)
+        return result.rowcount == 1
+
+    async def get_unfinished(self) -> list[AnalysisJob]:
+        """Get queued or running jobs, oldest first."""
+        statement = (
+            select(AnalysisJob)
+            .where(AnalysisJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+            .order_by(AnalysisJob.created_at)
+        )
+        result = await self.session.execute(statement)
+        return list(result.scalars().all())
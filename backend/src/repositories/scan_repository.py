@@ -3,13 +3,40 @@
 from uuid import UUID
 
 from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.base import ExecutableOption
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.models.image import Image
 from src.models.scan import Scan
 from src.schemas.enums import ScanStatus
 
 
+class ScanLoad:
+    """Loader option profiles for Scan queries.
+
+    Every profile issues a fixed number of SELECTs regardless of how many
+    images or barriers the scan has. Relationships not named here are left
+    unloaded and must not be touched.
+    """
+
+    # Scan row only
+    SUMMARY: tuple[ExecutableOption, ...] = ()
+    # Scan plus its images
+    WITH_IMAGES: tuple[ExecutableOption, ...] = (selectinload(Scan.images),)
+    # Scan plus images and each image's barriers
+    WITH_IMAGES_AND_BARRIERS: tuple[ExecutableOption, ...] = (
+        selectinload(Scan.images).selectinload(Image.barriers),
+    )
+    # Everything the scan detail view shows
+    DETAIL: tuple[ExecutableOption, ...] = (
+        selectinload(Scan.images).selectinload(Image.barriers),
+        selectinload(Scan.analysis_result),
+        selectinload(Scan.guides),
+    )
+
+
 class ScanRepository:
     """Repository for Scan CRUD operations."""
 
@@ -23,9 +50,13 @@ class ScanRepository:
         await self.session.refresh(scan)
         return scan
 
-    async def get_by_id(self, scan_id: UUID) -> Scan | None:
-        """Get a scan by ID."""
-        statement = select(Scan).where(Scan.id == scan_id)
+    async def get_by_id(
+        self,
+        scan_id: UUID,
+        options: tuple[ExecutableOption, ...] = ScanLoad.SUMMARY,
+    ) -> Scan | None:
+        """Get a scan by ID, loading relationships per ``options``."""
+        statement = select(Scan).where(Scan.id == scan_id).options(*options)
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
 
@@ -55,6 +86,18 @@ class ScanRepository:
 
         return scans, total
 
+    async def get_image_counts(self, scan_ids: list[UUID]) -> dict[UUID, int]:
+        """Count images per scan with a single grouped query."""
+        if not scan_ids:
+            return {}
+        statement = (
+            select(Image.scan_id, func.count())
+            .where(Image.scan_id.in_(scan_ids))
+            .group_by(Image.scan_id)
+        )
+        result = await self.session.execute(statement)
+        return {scan_id: count for scan_id, count in result.all()}
+
     async def update(self, scan: Scan) -> Scan:
         """Update a scan."""
         self.session.add(scan)
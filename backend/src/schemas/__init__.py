@@ -1,9 +1,13 @@
 """Pydantic schemas for request/response validation."""
 
 from .enums import (
+    AnalysisEventType,
     AnalysisStatus,
     BarrierSeverity,
+    BarrierSort,
     BarrierType,
+    ImageSize,
+    JobStatus,
     ScanStatus,
     WheelchairType,
 )
@@ -15,15 +19,22 @@ from .scan import (
 )
 from .analysis import (
     AnalysisDetailResponse,
+    AnalysisEvent,
     AnalysisRequest,
     AnalysisResponse,
+    BarrierPage,
     BarrierResponse,
+    BarrierStatistics,
     ImageAnalysisSummary,
 )
 from .navigation import (
+    GuideHeaderResponse,
     GuideRequest,
     GuideResponse,
+    GuideStepPage,
     NavigationStep,
+    RecommendedPath,
+    RouteResponse,
     WheelchairProfileCreate,
     WheelchairProfileResponse,
     WorldModelEdge,
@@ -33,9 +44,13 @@ from .navigation import (
 
 __all__ = [
     # Enums
+    "AnalysisEventType",
     "AnalysisStatus",
     "BarrierSeverity",
+    "BarrierSort",
     "BarrierType",
+    "ImageSize",
+    "JobStatus",
     "ScanStatus",
     "WheelchairType",
     # Scan
@@ -45,14 +60,21 @@ __all__ = [
     "ScanUpdate",
     # Analysis
     "AnalysisDetailResponse",
+    "AnalysisEvent",
     "AnalysisRequest",
     "AnalysisResponse",
+    "BarrierPage",
     "BarrierResponse",
+    "BarrierStatistics",
     "ImageAnalysisSummary",
     # Navigation
     "GuideRequest",
     "GuideResponse",
+    "GuideHeaderResponse",
+    "GuideStepPage",
     "NavigationStep",
+    "RecommendedPath",
+    "RouteResponse",
     "WheelchairProfileCreate",
     "WheelchairProfileResponse",
     "WorldModelEdge",
@@ -5,7 +5,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
-from .enums import AnalysisStatus, BarrierSeverity, BarrierType
+from .enums import AnalysisEventType, AnalysisStatus, BarrierSeverity, BarrierType
 
 
 class AnalysisRequest(BaseModel):
@@ -27,6 +27,9 @@ class AnalysisResponse(BaseModel):
     total_images_analyzed: int
     total_barriers_found: int
     accessibility_score: float | None = Field(ge=0, le=100)
+    outdated: bool = False
+    # Results committed so far by a run that has not completed
+    partial: bool = False
 
     model_config = {"from_attributes": True}
 
@@ -52,6 +55,14 @@ class BarrierResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class BarrierPage(BaseModel):
+    """Schema for a page of barriers."""
+
+    items: list[BarrierResponse]
+    next_cursor: str | None
+    limit: int
+
+
 class ImageAnalysisSummary(BaseModel):
     """Summary of analysis for a single image."""
 
@@ -92,9 +103,36 @@ class BarriersBySeverity(BaseModel):
     critical: int = 0
 
 
+class BarrierStatistics(BaseModel):
+    """Aggregated barrier statistics for a scan."""
+
+    barriers_by_severity: BarriersBySeverity
+    barriers_by_type: dict[str, int]
+    images_with_barriers: list[ImageAnalysisSummary]
+
+
 class AnalysisDetailResponse(AnalysisResponse):
     """Schema for detailed analysis response."""
 
     barriers_by_severity: BarriersBySeverity
     barriers_by_type: dict[str, int]
     images_with_barriers: list[ImageAnalysisSummary]
+
+
+class AnalysisEvent(BaseModel):
+    """Progress event of a scan's analysis.
+
+    Image events identify the image and, once done, its barrier count; the
+    final summary carries the analysis status and totals.
+    """
+
+    event: AnalysisEventType
+    scan_id: UUID
+    image_id: UUID | None = None
+    sequence_order: int | None = None
+    barrier_count: int | None = None
+    error_message: str | None = None
+    status: AnalysisStatus | None = None
+    total_images_analyzed: int | None = None
+    total_barriers_found: int | None = None
+    accessibility_score: float | None = None
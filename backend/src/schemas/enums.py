@@ -23,6 +23,26 @@ class AnalysisStatus(str, Enum):
     FAILED = "failed"
 
 
+class JobStatus(str, Enum):
+    """Status of a background analysis job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AnalysisEventType(str, Enum):
+    """Kind of analysis progress event."""
+
+    QUEUED = "queued"
+    ANALYZING = "analyzing"
+    DONE = "done"
+    FAILED = "failed"
+    SUMMARY = "summary"
+    PING = "ping"
+
+
 class BarrierType(str, Enum):
     """Type of accessibility barrier."""
 
@@ -51,6 +71,22 @@ class BarrierSeverity(str, Enum):
     CRITICAL = "critical"
 
 
+class BarrierSort(str, Enum):
+    """Sort order for barrier listings."""
+
+    SEQUENCE = "sequence"
+    SEVERITY = "severity"
+    CONFIDENCE = "confidence"
+
+
+class ImageSize(str, Enum):
+    """Size variant of a stored image."""
+
+    THUMBNAIL = "thumbnail"
+    MEDIUM = "medium"
+    ORIGINAL = "original"
+
+
 class WheelchairType(str, Enum):
     """Type of wheelchair."""
 
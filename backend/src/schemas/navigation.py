@@ -94,10 +94,35 @@ class GuideResponse(BaseModel):
     critical_alerts: list[str]
     wheelchair_profile: WheelchairProfileResponse | None
     created_at: datetime
+    # Images were added or removed after the guide's analysis
+    outdated: bool = False
 
     model_config = {"from_attributes": True}
 
 
+class GuideHeaderResponse(BaseModel):
+    """Schema for a guide without its navigation steps."""
+
+    id: UUID
+    scan_id: UUID
+    title: str
+    summary: str
+    accessibility_score: float | None = Field(default=None, ge=0, le=100)
+    step_count: int
+    critical_alerts: list[str]
+    wheelchair_profile: WheelchairProfileResponse | None
+    created_at: datetime
+    outdated: bool = False
+
+
+class GuideStepPage(BaseModel):
+    """Schema for a range of a guide's navigation steps."""
+
+    items: list[NavigationStep]
+    next_from: int | None
+    limit: int
+
+
 class NodeFeatures(BaseModel):
     """Features of a node in the world model."""
 
@@ -133,6 +158,28 @@ class WorldModelEdge(BaseModel):
     notes: str | None = None
 
 
+class RecommendedPath(BaseModel):
+    """Recommended route through the world model."""
+
+    nodes: list[str]
+    total_cost: float | None = None
+    edge_difficulties: list[Difficulty] = []
+
+
+class RouteResponse(BaseModel):
+    """Schema for a route between two world model nodes."""
+
+    scan_id: UUID
+    wheelchair_profile_id: UUID | None
+    from_node: str
+    to_node: str
+    reachable: bool
+    path: list[str]
+    total_cost: float | None
+    edge_difficulties: list[Difficulty]
+    outdated: bool = False
+
+
 class WorldModelResponse(BaseModel):
     """Schema for world model response."""
 
@@ -140,3 +187,9 @@ class WorldModelResponse(BaseModel):
     nodes: list[WorldModelNode]
     edges: list[WorldModelEdge]
     recommended_path: list[str] | None = None
+    recommended_path_cost: float | None = None
+    recommended_path_difficulties: list[Difficulty] | None = None
+    # Only the images analyzed so far by a running analysis
+    partial: bool = False
+    # Images were added or removed after the analysis that built the graph
+    outdated: bool = False
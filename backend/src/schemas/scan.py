@@ -5,7 +5,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
-from .enums import AnalysisStatus, ScanStatus
+from .enums import AnalysisStatus, ImageSize, ScanStatus
 
 
 class ScanCreate(BaseModel):
@@ -39,6 +39,24 @@ class ScanResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ImageUrls(BaseModel):
+    """URLs of the size variants of an image."""
+
+    thumbnail: str
+    medium: str
+    original: str
+
+    @classmethod
+    def for_image(cls, scan_id: UUID, image_id: UUID) -> "ImageUrls":
+        """Build the variant URLs of an image's file endpoint."""
+        base = f"/api/scans/{scan_id}/images/{image_id}/file"
+        return cls(
+            thumbnail=f"{base}?size={ImageSize.THUMBNAIL.value}",
+            medium=f"{base}?size={ImageSize.MEDIUM.value}",
+            original=base,
+        )
+
+
 class ImageResponse(BaseModel):
     """Schema for image response."""
 
@@ -54,6 +72,7 @@ class ImageResponse(BaseModel):
     created_at: datetime
     barrier_count: int = 0
     url: str
+    urls: ImageUrls
 
     model_config = {"from_attributes": True}
 
@@ -4,10 +4,15 @@ from .scan_service import ScanService
 from .vision_service import VisionService
 from .world_model_service import WorldModelService
 from .guide_service import GuideService
+from .analysis_service import AnalysisService
+from .analysis_queue import AnalysisQueue, analysis_queue
 
 __all__ = [
     "ScanService",
     "VisionService",
     "WorldModelService",
     "GuideService",
+    "AnalysisService",
+    "AnalysisQueue",
+    "analysis_queue",
 ]
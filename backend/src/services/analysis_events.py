@@ -0,0 +1,102 @@
+"""In-process publish/subscribe of analysis progress events."""
+
+import asyncio
+from collections import defaultdict
+from uuid import UUID
+
+from src.core.config import settings
+from src.models.analysis import AnalysisResult
+from src.models.image import Image
+from src.schemas.analysis import AnalysisEvent
+from src.schemas.enums import AnalysisEventType, AnalysisStatus
+
+
+class AnalysisEventBus:
+    """Fan-out of analysis progress events to the subscribers of each scan.
+
+    Subscribers only receive events published while they are subscribed. A
+    subscriber that falls ``max_pending`` events behind loses the oldest
+    ones, so the final summary is never dropped.
+    """
+
+    def __init__(self, max_pending: int | None = None):
+        self.max_pending = (
+            max_pending if max_pending is not None else settings.analysis_event_buffer
+        )
+        self._subscribers: defaultdict[UUID, set[asyncio.Queue[AnalysisEvent]]] = (
+            defaultdict(set)
+        )
+
+    def subscribe(self, scan_id: UUID) -> asyncio.Queue[AnalysisEvent]:
+        """Start receiving a scan's events on a new queue."""
+        queue: asyncio.Queue[AnalysisEvent] = asyncio.Queue(self.max_pending)
+        self._subscribers[scan_id].add(queue)
+        return queue
+
+    def unsubscribe(self, scan_id: UUID, queue: asyncio.Queue[AnalysisEvent]) -> None:
+        """Stop delivering a scan's events to a queue."""
+        queues = self._subscribers.get(scan_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[scan_id]
+
+    def publish(self, event: AnalysisEvent) -> None:
+        """Deliver an event to the current subscribers of its scan."""
+        for queue in self._subscribers.get(event.scan_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def publish_image(
+        self,
+        event: AnalysisEventType,
+        image: Image,
+        barrier_count: int | None = None,
+        error_message: str | None = None,
+    ) -> None:
+        """Publish a per-image event."""
+        if image.scan_id not in self._subscribers:
+            return
+        self.publish(
+            AnalysisEvent(
+                event=event,
+                scan_id=image.scan_id,
+                image_id=image.id,
+                sequence_order=image.sequence_order,
+                barrier_count=barrier_count,
+                error_message=error_message,
+            )
+        )
+
+    def publish_summary(self, analysis: AnalysisResult) -> None:
+        """Publish the final event of an analysis run."""
+        self.publish(summary_event(analysis))
+
+    def publish_failure(self, scan_id: UUID, error_message: str) -> None:
+        """Publish a failed final event for a scan without an analysis."""
+        self.publish(
+            AnalysisEvent(
+                event=AnalysisEventType.SUMMARY,
+                scan_id=scan_id,
+                status=AnalysisStatus.FAILED,
+                error_message=error_message,
+            )
+        )
+
+
+def summary_event(analysis: AnalysisResult) -> AnalysisEvent:
+    """Build the summary event of an analysis' current state."""
+    return AnalysisEvent(
+        event=AnalysisEventType.SUMMARY,
+        scan_id=analysis.scan_id,
+        status=analysis.status,
+        error_message=analysis.error_message,
+        total_images_analyzed=analysis.total_images_analyzed,
+        total_barriers_found=analysis.total_barriers_found,
+        accessibility_score=analysis.accessibility_score,
+    )
+
+
+analysis_events = AnalysisEventBus()
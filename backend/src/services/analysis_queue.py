@@ -0,0 +1,119 @@
+"""In-process queue of analysis jobs drained by async workers."""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from uuid import UUID
+
+from sqlalchemy.orm import sessionmaker
+
+from src.core.config import settings
+from src.core.database import async_session_factory
+from src.repositories.job_repository import AnalysisJobRepository
+from src.schemas.enums import JobStatus
+from src.services.analysis_service import AnalysisService
+from src.services.vision_service import VisionService
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisQueue:
+    """Queue of persisted analysis jobs processed by a pool of workers.
+
+    Jobs are stored in the ``analysis_jobs`` table before being enqueued, so
+    anything still queued or running when the process stops is picked up
+    again by ``recover`` on the next start. Workers claim a job before
+    running it, so a job enqueued by several processes runs once.
+    """
+
+    def __init__(
+        self,
+        worker_count: int | None = None,
+        session_factory: sessionmaker = async_session_factory,
+        vision_service_factory: Callable[[], VisionService] = VisionService,
+    ) -> None:
+        self.worker_count = worker_count or settings.analysis_worker_count
+        self.session_factory = session_factory
+        self.vision_service_factory = vision_service_factory
+        self._queue: asyncio.Queue[UUID] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+
+    @property
+    def is_running(self) -> bool:
+        """Check if workers are consuming the queue."""
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """Start the workers and requeue unfinished jobs."""
+        if self.is_running:
+            return
+
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"analysis-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        await self.recover()
+
+    async def stop(self) -> None:
+        """Cancel the workers. Interrupted jobs are recovered on next start."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def enqueue(self, job_id: UUID) -> None:
+        """Hand a persisted job to the workers."""
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+
+    async def join(self) -> None:
+        """Wait until every enqueued job has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def recover(self) -> int:
+        """Requeue jobs left queued or running by a previous process."""
+        async with self.session_factory() as session:
+            job_repo = AnalysisJobRepository(session)
+            jobs = await job_repo.get_unfinished()
+            for job in jobs:
+                job.status = JobStatus.QUEUED
+            await session.commit()
+
+        for job in jobs:
+            await self.enqueue(job.id)
+        return len(jobs)
+
+    async def _worker(self) -> None:
+        """Process jobs until cancelled."""
+        assert self._queue is not None
+        queue = self._queue
+
+        while True:
+            job_id = await queue.get()
+            try:
+                async with self.session_factory() as session:
+                    service = AnalysisService(session, self.vision_service_factory())
+                    await service.run_job(job_id)
+            except Exception as e:
+                logger.exception("Analysis job %s crashed", job_id)
+                await self._fail_job(job_id, str(e) or type(e).__name__)
+            finally:
+                queue.task_done()
+
+    async def _fail_job(self, job_id: UUID, message: str) -> None:
+        """Record a crashed job as failed from a fresh session.
+
+        Without this a crash while committing would leave the analysis
+        pending or in progress, and new runs would be refused for good.
+        """
+        try:
+            async with self.session_factory() as session:
+                await AnalysisService(session).fail_job(job_id, message)
+        except Exception:
+            logger.exception("Could not mark analysis job %s failed", job_id)
+
+
+analysis_queue = AnalysisQueue()
@@ -0,0 +1,455 @@
+"""Service for queuing and running accessibility analyses."""
+
+import asyncio
+import base64
+import binascii
+import bisect
+import json
+from collections.abc import AsyncIterator, Sequence
+from contextlib import aclosing
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.models.analysis import AnalysisResult, Barrier
+from src.models.guide import WheelchairProfile
+from src.models.image import Image
+from src.models.job import AnalysisJob
+from src.models.scan import Scan
+from src.repositories.barrier_repository import BarrierRepository
+from src.repositories.image_repository import ImageRepository
+from src.repositories.job_repository import AnalysisJobRepository
+from src.repositories.scan_repository import ScanRepository
+from src.schemas.analysis import (
+    BarriersBySeverity,
+    BarrierStatistics,
+    ImageAnalysisSummary,
+)
+from src.schemas.enums import (
+    AnalysisEventType,
+    AnalysisStatus,
+    BarrierSeverity,
+    BarrierSort,
+    BarrierType,
+    JobStatus,
+    ScanStatus,
+)
+from src.services.analysis_events import analysis_events
+from src.services.routing_service import build_route_table
+from src.services.vision_service import VisionService
+from src.services.world_model_cache import world_model_cache
+from src.services.world_model_service import WorldModelService
+
+
+def _encode_cursor(sort: BarrierSort, sort_key: float, barrier_id: UUID) -> str:
+    """Encode the position after a barrier as an opaque cursor."""
+    raw = json.dumps([sort.value, sort_key, str(barrier_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort: BarrierSort) -> tuple[float, UUID]:
+    """Decode a cursor into the (sort key, id) it points after."""
+    try:
+        cursor_sort, sort_key, barrier_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii"))
+        )
+        if not isinstance(sort_key, int | float):
+            raise ValueError
+        position = (sort_key, UUID(barrier_id))
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+
+    if cursor_sort != sort.value:
+        raise ValueError(f"Cursor was issued for sort={cursor_sort}")
+    return position
+
+
+def _needs_analysis(image: Image) -> bool:
+    """Check whether an image has no successful vision result to reuse."""
+    return image.analysis_json is None or "error" in json.loads(image.analysis_json)
+
+
+def image_score(outcome: dict) -> float | None:
+    """Get the score an image contributes to the average (None if it failed)."""
+    if "error" in outcome:
+        return None
+    return outcome.get("accessibility_score", 50)
+
+
+def update_score(
+    analysis: AnalysisResult,
+    added: Sequence[float] = (),
+    removed: Sequence[float] = (),
+) -> None:
+    """Apply per-image score changes to an analysis' running average."""
+    count = analysis.scored_image_count or 0
+    total = (analysis.accessibility_score or 0) * count
+    count += len(added) - len(removed)
+    total += sum(added) - sum(removed)
+    analysis.scored_image_count = count
+    analysis.accessibility_score = total / count if count > 0 else 0
+
+
+class AnalysisService:
+    """Service for analysis jobs and the per-scan analysis pipeline."""
+
+    def __init__(
+        self, session: AsyncSession, vision_service: VisionService | None = None
+    ):
+        self.session = session
+        self.scan_repo = ScanRepository(session)
+        self.image_repo = ImageRepository(session)
+        self.barrier_repo = BarrierRepository(session)
+        self.job_repo = AnalysisJobRepository(session)
+        self._vision_service = vision_service
+
+    @property
+    def vision_service(self) -> VisionService:
+        """Get the vision service, creating it on first use."""
+        if self._vision_service is None:
+            self._vision_service = VisionService()
+        return self._vision_service
+
+    async def get_analysis(self, scan_id: UUID) -> AnalysisResult | None:
+        """Get the analysis result for a scan."""
+        statement = select(AnalysisResult).where(AnalysisResult.scan_id == scan_id)
+        result = await self.session.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def get_barrier_statistics(
+        self, analysis: AnalysisResult
+    ) -> BarrierStatistics:
+        """Get barrier statistics, from the materialized copy when present."""
+        if analysis.barrier_stats_json:
+            return BarrierStatistics.model_validate_json(analysis.barrier_stats_json)
+        return await self.compute_barrier_statistics(analysis.scan_id)
+
+    async def compute_barrier_statistics(self, scan_id: UUID) -> BarrierStatistics:
+        """Aggregate a scan's barriers with grouped SQL queries."""
+        barriers_by_severity = BarriersBySeverity()
+        barriers_by_type: dict[str, int] = {}
+
+        for severity, barrier_type, count in (
+            await self.barrier_repo.count_by_severity_and_type(scan_id)
+        ):
+            setattr(
+                barriers_by_severity,
+                severity.value,
+                getattr(barriers_by_severity, severity.value) + count,
+            )
+            barriers_by_type[barrier_type.value] = (
+                barriers_by_type.get(barrier_type.value, 0) + count
+            )
+
+        images_with_barriers = [
+            ImageAnalysisSummary(
+                image_id=image_id,
+                image_url=f"/api/scans/{scan_id}/images/{image_id}/file",
+                sequence_order=sequence_order,
+                barrier_count=count,
+                max_severity=max_severity,
+            )
+            for image_id, sequence_order, count, max_severity in (
+                await self.barrier_repo.summarize_by_image(scan_id)
+            )
+        ]
+
+        return BarrierStatistics(
+            barriers_by_severity=barriers_by_severity,
+            barriers_by_type=barriers_by_type,
+            images_with_barriers=images_with_barriers,
+        )
+
+    async def list_barriers(
+        self,
+        scan_id: UUID,
+        severity: BarrierSeverity | None = None,
+        barrier_type: BarrierType | None = None,
+        min_confidence: float | None = None,
+        sort: BarrierSort = BarrierSort.SEQUENCE,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> tuple[list[Barrier], str | None]:
+        """Get a page of a scan's barriers and the cursor of the next page."""
+        after = _decode_cursor(cursor, sort) if cursor else None
+        rows = await self.barrier_repo.list_by_scan_id(
+            scan_id,
+            severity=severity,
+            barrier_type=barrier_type,
+            min_confidence=min_confidence,
+            sort=sort,
+            after=after,
+            limit=limit + 1,
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last, sort_key = rows[-1]
+            next_cursor = _encode_cursor(sort, sort_key, last.id)
+        return [barrier for barrier, _ in rows], next_cursor
+
+    async def queue_analysis(
+        self, scan: Scan, analysis: AnalysisResult | None, force: bool = False
+    ) -> tuple[AnalysisResult, AnalysisJob]:
+        """Reset the scan's analysis to pending and persist a job for it."""
+        if analysis:
+            analysis.status = AnalysisStatus.PENDING
+            analysis.started_at = None
+            analysis.completed_at = None
+            analysis.error_message = None
+            analysis.barrier_stats_json = None
+            analysis.outdated = False
+            analysis.updated_at = datetime.utcnow()
+            world_model_cache.invalidate(analysis.id)
+        else:
+            analysis = AnalysisResult(scan_id=scan.id)
+            self.session.add(analysis)
+
+        scan.status = ScanStatus.ANALYZING
+        await self.session.flush()
+
+        job = await self.job_repo.create(
+            AnalysisJob(scan_id=scan.id, analysis_id=analysis.id, force=force)
+        )
+        return analysis, job
+
+    async def run_job(self, job_id: UUID) -> None:
+        """Run a queued job to completion, recording failures on the job.
+
+        The job is claimed first, so a job another worker already picked up
+        is skipped. Every exit publishes a summary so progress streams end,
+        skipped jobs included.
+        """
+        job = await self.job_repo.get_by_id(job_id)
+        if not job:
+            return
+        scan_id = job.scan_id
+
+        claimed = await self.job_repo.claim(job_id)
+        await self.session.commit()
+        if not claimed:
+            await self._publish_summary(scan_id)
+            return
+        await self.session.refresh(job)
+
+        if job.attempts > settings.analysis_job_max_attempts:
+            await self._mark_failed(
+                job_id, scan_id, f"Analysis gave up after {job.attempts - 1} attempts"
+            )
+            return
+
+        scan = await self.scan_repo.get_by_id(scan_id)
+        analysis = await self.get_analysis(scan_id)
+        if not scan or not analysis:
+            await self._mark_failed(job_id, scan_id, f"Scan {scan_id} not found")
+            return
+
+        analysis.status = AnalysisStatus.IN_PROGRESS
+        analysis.started_at = job.started_at
+        analysis.updated_at = job.started_at
+        scan.status = ScanStatus.ANALYZING
+        await self.session.commit()
+
+        try:
+            await self._analyze_scan(scan, analysis, force=job.force)
+        except Exception as e:
+            await self.session.rollback()
+            await self._mark_failed(job_id, scan_id, str(e))
+            return
+
+        job.status = JobStatus.COMPLETED
+        job.finished_at = datetime.utcnow()
+        await self.session.commit()
+        analysis_events.publish_summary(analysis)
+
+    async def fail_job(self, job_id: UUID, message: str) -> None:
+        """Fail a job that is still unfinished, e.g. after its run crashed."""
+        job = await self.job_repo.get_by_id(job_id)
+        if job and job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+            await self._mark_failed(job_id, job.scan_id, message)
+
+    async def _publish_summary(self, scan_id: UUID) -> None:
+        """Publish the analysis' current state as its summary."""
+        analysis = await self.get_analysis(scan_id)
+        if analysis:
+            analysis_events.publish_summary(analysis)
+        else:
+            analysis_events.publish_failure(scan_id, f"Scan {scan_id} not found")
+
+    async def _analyze_scan(
+        self, scan: Scan, analysis: AnalysisResult, force: bool = True
+    ) -> None:
+        """Analyze a scan's images and build its world model.
+
+        Each image's barriers, world model node and score are committed as
+        soon as its vision result arrives, so a running analysis serves
+        partial results. Unless ``force`` is set, a completed world model is
+        updated incrementally: only images without a stored result (new or
+        previously failed) are sent to the vision model, the graph is
+        patched and the totals and score are adjusted by the difference.
+        Removed images were already subtracted when they were deleted.
+        """
+        images = await self.image_repo.get_by_scan_id(scan.id)
+        incremental = (
+            not force
+            and analysis.has_world_model
+            and analysis.scored_image_count is not None
+        )
+        world_model_service = WorldModelService()
+        if incremental:
+            pending = [image for image in images if _needs_analysis(image)]
+            # Failed images are already part of total_images_analyzed
+            retried = {
+                image.id for image in pending if image.analysis_json is not None
+            }
+            world_model_service.load(analysis)
+        else:
+            pending = images
+            retried = set()
+            for image in images:
+                image.analysis_json = None
+            analysis.total_images_analyzed = 0
+            analysis.total_barriers_found = 0
+            analysis.scored_image_count = 0
+            analysis.accessibility_score = None
+            analysis.world_model_blob = None
+            analysis.world_model_json = None
+        analysis.recommended_path_json = None
+        analysis.route_trees = None
+        await self.barrier_repo.delete_by_image_ids([image.id for image in pending])
+        await self.session.commit()
+        for image in pending:
+            analysis_events.publish_image(AnalysisEventType.QUEUED, image)
+
+        # Images with a node in the world model, in sequence order
+        pending_ids = {image.id for image in pending}
+        analyzed = [image for image in images if image.id not in pending_ids]
+
+        # Failures are yielded, not raised
+        async with aclosing(self._analyze_images(pending)) as results:
+            async for image, outcome, barriers in results:
+                error = str(outcome) if isinstance(outcome, Exception) else None
+                if error is not None:
+                    outcome = {"error": error, "accessibility_score": 0}
+
+                # Insert the barriers and attach them without reloading
+                await self.barrier_repo.create_many(barriers)
+                set_committed_value(image, "barriers", barriers)
+                image.analysis_json = json.dumps(outcome)
+
+                bisect.insort(analyzed, image, key=lambda i: i.sequence_order)
+                world_model_service.update_world_model(analyzed, {image.id: outcome})
+                analysis.world_model_blob = world_model_service.to_compact().to_bytes()
+                if image.id not in retried:
+                    analysis.total_images_analyzed += 1
+                analysis.total_barriers_found += len(barriers)
+                score = image_score(outcome)
+                if score is not None:
+                    update_score(analysis, added=[score])
+                analysis.updated_at = datetime.utcnow()
+                await self.session.commit()
+
+                if error is None:
+                    analysis_events.publish_image(
+                        AnalysisEventType.DONE, image, barrier_count=len(barriers)
+                    )
+                else:
+                    analysis_events.publish_image(
+                        AnalysisEventType.FAILED, image, error_message=error
+                    )
+
+        if not pending:
+            # Apply reorders and removals to the stored graph
+            world_model_service.update_world_model(images, {})
+        if analysis.accessibility_score is None:
+            update_score(analysis)
+
+        # Update analysis result
+        analysis.status = AnalysisStatus.COMPLETED
+        analysis.completed_at = datetime.utcnow()
+        analysis.updated_at = analysis.completed_at
+        compact = world_model_service.to_compact()
+        analysis.world_model_blob = compact.to_bytes()
+        analysis.world_model_json = None
+        recommended_path = world_model_service.compute_recommended_path()
+        analysis.recommended_path_json = (
+            recommended_path.model_dump_json() if recommended_path else None
+        )
+        stats = await self.compute_barrier_statistics(scan.id)
+        analysis.barrier_stats_json = stats.model_dump_json()
+        route_table = build_route_table(compact, await self._wheelchair_profiles())
+        analysis.route_trees = route_table.to_bytes() if route_table else None
+
+        # Update scan status
+        scan.status = ScanStatus.COMPLETED
+
+    async def _wheelchair_profiles(self) -> list[WheelchairProfile]:
+        """Get all wheelchair profiles to precompute routes for."""
+        result = await self.session.execute(select(WheelchairProfile))
+        return list(result.scalars().all())
+
+    async def _analyze_images(
+        self, images: list[Image]
+    ) -> AsyncIterator[tuple[Image, dict | Exception, list[Barrier]]]:
+        """Call the vision service for all images, at most N at a time per scan.
+
+        Each result is yielded with its parsed barriers as soon as it
+        arrives. The process-wide limit is enforced inside ``VisionService``.
+        """
+        limit = asyncio.Semaphore(settings.vision_scan_concurrency)
+
+        async def analyze(
+            image: Image,
+        ) -> tuple[Image, dict | Exception, list[Barrier]]:
+            async with limit:
+                analysis_events.publish_image(AnalysisEventType.ANALYZING, image)
+                try:
+                    outcome = await self.vision_service.analyze_image(
+                        image.file_path, image.id
+                    )
+                    barriers = self.vision_service.parse_barriers(outcome, image.id)
+                except Exception as e:
+                    return image, e, []
+                return image, outcome, barriers
+
+        # Started in sequence order, yielded in completion order
+        tasks = [asyncio.create_task(analyze(image)) for image in images]
+        try:
+            for result in asyncio.as_completed(tasks):
+                yield await result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _mark_failed(self, job_id: UUID, scan_id: UUID, message: str) -> None:
+        """Record a failed run on the job, the analysis and the scan."""
+        now = datetime.utcnow()
+
+        job = await self.job_repo.get_by_id(job_id)
+        if job:
+            job.status = JobStatus.FAILED
+            job.error_message = message
+            job.finished_at = now
+
+        analysis = await self.get_analysis(scan_id)
+        if analysis:
+            analysis.status = AnalysisStatus.FAILED
+            analysis.error_message = message
+            analysis.completed_at = now
+            analysis.updated_at = now
+
+        scan = await self.scan_repo.get_by_id(scan_id)
+        if scan:
+            scan.status = ScanStatus.FAILED
+
+        await self.session.commit()
+        if analysis:
+            analysis_events.publish_summary(analysis)
+        else:
+            analysis_events.publish_failure(scan_id, message)
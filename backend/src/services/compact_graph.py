@@ -0,0 +1,478 @@
+"""Compact array-backed world model graph.
+
+Nodes are integer indices, adjacency is stored in CSR form (an offsets
+array plus a flat targets array) and edge attributes are small integer
+codes. Barriers live in a single table and nodes/edges reference them by
+index, so the two directions of an edge share the same barrier entries
+instead of carrying their own copies.
+"""
+
+import heapq
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+
+import networkx as nx
+
+from src.schemas.enums import BarrierSeverity, Difficulty, DistanceEstimate
+
+DIFFICULTY_CODES = (
+    Difficulty.EASY,
+    Difficulty.MODERATE,
+    Difficulty.DIFFICULT,
+    Difficulty.IMPASSABLE,
+)
+DISTANCE_CODES = (
+    DistanceEstimate.SHORT,
+    DistanceEstimate.MEDIUM,
+    DistanceEstimate.LONG,
+)
+SEVERITY_CODES = (
+    BarrierSeverity.LOW,
+    BarrierSeverity.MEDIUM,
+    BarrierSeverity.HIGH,
+    BarrierSeverity.CRITICAL,
+)
+_DIFFICULTY_INDEX = {d.value: i for i, d in enumerate(DIFFICULTY_CODES)}
+_DISTANCE_INDEX = {d.value: i for i, d in enumerate(DISTANCE_CODES)}
+_SEVERITY_INDEX = {s.value: i for i, s in enumerate(SEVERITY_CODES)}
+
+# Traversal cost per difficulty code (same table as find_recommended_path)
+DEFAULT_DIFFICULTY_COSTS = (1.0, 2.0, 4.0, float("inf"))
+
+_MAGIC = b"NFWG"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHIIIII")
+
+
+def _index_array(values: Iterable[int] = ()) -> array:
+    """Build a 32-bit unsigned index array."""
+    return array("I", values)
+
+
+def _code_array(values: Iterable[int] = ()) -> array:
+    """Build an 8-bit code array."""
+    return array("B", values)
+
+
+class CompactGraph:
+    """World model graph stored as CSR arrays with enum-coded attributes."""
+
+    def __init__(
+        self,
+        node_ids: list[str],
+        nodes: list[dict],
+        barriers: list[dict],
+        node_barrier_offsets: array,
+        node_barrier_refs: array,
+        edge_offsets: array,
+        edge_targets: array,
+        edge_difficulty: array,
+        edge_traversable: array,
+        edge_distance: array,
+        edge_barrier_offsets: array,
+        edge_barrier_refs: array,
+        edge_notes: dict[int, str] | None = None,
+    ):
+        self.node_ids = node_ids
+        self.node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+        # Per-node scalar attributes (image_id, label, space_type, ...)
+        self.nodes = nodes
+        self.barriers = barriers
+        self.node_barrier_offsets = node_barrier_offsets
+        self.node_barrier_refs = node_barrier_refs
+        self.edge_offsets = edge_offsets
+        self.edge_targets = edge_targets
+        self.edge_difficulty = edge_difficulty
+        self.edge_traversable = edge_traversable
+        self.edge_distance = edge_distance
+        self.edge_barrier_offsets = edge_barrier_offsets
+        self.edge_barrier_refs = edge_barrier_refs
+        self.edge_notes = edge_notes or {}
+
+    @property
+    def node_count(self) -> int:
+        """Get the number of nodes."""
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        """Get the number of directed edges."""
+        return len(self.edge_targets)
+
+    @property
+    def array_bytes(self) -> int:
+        """Get the memory used by the adjacency and attribute arrays."""
+        arrays = (
+            self.node_barrier_offsets,
+            self.node_barrier_refs,
+            self.edge_offsets,
+            self.edge_targets,
+            self.edge_difficulty,
+            self.edge_traversable,
+            self.edge_distance,
+            self.edge_barrier_offsets,
+            self.edge_barrier_refs,
+        )
+        return sum(a.itemsize * len(a) for a in arrays)
+
+    # Construction
+
+    @classmethod
+    def from_chain(cls, node_ids: list[str], nodes: list[dict]) -> "CompactGraph":
+        """Build a sequential world model straight into CSR arrays.
+
+        ``nodes`` are node attribute dicts in sequence order, barriers
+        included. Each node links to its predecessor and successor with the
+        difficulty of the worse endpoint, as ``WorldModelService`` chains
+        them, and edges reference the endpoints' barrier table entries.
+        """
+        attributes = []
+        barriers: list[dict] = []
+        node_barrier_offsets = _index_array([0])
+        node_barrier_refs = _index_array()
+        # Table indices of the barriers an edge lists (those with an id)
+        path_refs: list[list[int]] = []
+        max_severity: list[int] = []
+
+        for data in nodes:
+            attributes.append({k: v for k, v in data.items() if k != "barriers"})
+            refs = []
+            worst = -1
+            for barrier in data.get("barriers", []):
+                node_barrier_refs.append(len(barriers))
+                if "id" in barrier:
+                    refs.append(len(barriers))
+                barriers.append(barrier)
+                # Unknown severities count as low
+                worst = max(worst, _SEVERITY_INDEX.get(barrier.get("severity"), 0))
+            node_barrier_offsets.append(len(node_barrier_refs))
+            path_refs.append(refs)
+            max_severity.append(worst)
+
+        count = len(nodes)
+        edge_offsets = _index_array([0])
+        edge_targets = _index_array()
+        edge_difficulty = _code_array()
+        edge_barrier_offsets = _index_array([0])
+        edge_barrier_refs = _index_array()
+
+        for i in range(count):
+            for j in (i - 1, i + 1):
+                if not 0 <= j < count:
+                    continue
+                first, second = min(i, j), max(i, j)
+                # Severity codes line up with difficulty codes; no barriers is easy
+                worst = max(max_severity[first], max_severity[second], 0)
+                edge_targets.append(j)
+                edge_difficulty.append(worst)
+                edge_barrier_refs.extend(path_refs[first] + path_refs[second])
+                edge_barrier_offsets.append(len(edge_barrier_refs))
+            edge_offsets.append(len(edge_targets))
+
+        impassable = _DIFFICULTY_INDEX[Difficulty.IMPASSABLE.value]
+        return cls(
+            node_ids=node_ids,
+            nodes=attributes,
+            barriers=barriers,
+            node_barrier_offsets=node_barrier_offsets,
+            node_barrier_refs=node_barrier_refs,
+            edge_offsets=edge_offsets,
+            edge_targets=edge_targets,
+            edge_difficulty=edge_difficulty,
+            edge_traversable=_code_array(
+                int(code != impassable) for code in edge_difficulty
+            ),
+            edge_distance=_code_array(bytes(len(edge_targets))),
+            edge_barrier_offsets=edge_barrier_offsets,
+            edge_barrier_refs=edge_barrier_refs,
+        )
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph) -> "CompactGraph":
+        """Convert a networkx world model graph."""
+        node_ids = [str(node_id) for node_id in graph.nodes]
+        index = {node_id: i for i, node_id in enumerate(graph.nodes)}
+        nodes = []
+        barriers: list[dict] = []
+        barrier_index: dict[str, int] = {}
+        node_barrier_offsets = _index_array([0])
+        node_barrier_refs = _index_array()
+
+        def ref(barrier: dict) -> int:
+            key = barrier.get("id") or f"#{len(barriers)}"
+            if key not in barrier_index:
+                barrier_index[key] = len(barriers)
+                barriers.append(barrier)
+            return barrier_index[key]
+
+        for _, data in graph.nodes(data=True):
+            nodes.append({k: v for k, v in data.items() if k != "barriers"})
+            node_barrier_refs.extend(ref(b) for b in data.get("barriers", []))
+            node_barrier_offsets.append(len(node_barrier_refs))
+
+        edge_offsets = _index_array([0])
+        edge_targets = _index_array()
+        edge_difficulty = _code_array()
+        edge_traversable = _code_array()
+        edge_distance = _code_array()
+        edge_barrier_offsets = _index_array([0])
+        edge_barrier_refs = _index_array()
+        edge_notes: dict[int, str] = {}
+
+        for node_id in graph.nodes:
+            for target, data in graph.adj[node_id].items():
+                if data.get("notes"):
+                    edge_notes[len(edge_targets)] = data["notes"]
+                edge_targets.append(index[target])
+                edge_difficulty.append(
+                    _DIFFICULTY_INDEX.get(data.get("difficulty", "moderate"), 1)
+                )
+                edge_traversable.append(int(data.get("traversable", True)))
+                edge_distance.append(
+                    _DISTANCE_INDEX.get(data.get("distance_estimate", "short"), 0)
+                )
+                for barrier_id in data.get("barriers_in_path", []):
+                    if barrier_id in barrier_index:
+                        edge_barrier_refs.append(barrier_index[barrier_id])
+                    else:
+                        edge_barrier_refs.append(ref({"id": barrier_id}))
+                edge_barrier_offsets.append(len(edge_barrier_refs))
+            edge_offsets.append(len(edge_targets))
+
+        return cls(
+            node_ids=node_ids,
+            nodes=nodes,
+            barriers=barriers,
+            node_barrier_offsets=node_barrier_offsets,
+            node_barrier_refs=node_barrier_refs,
+            edge_offsets=edge_offsets,
+            edge_targets=edge_targets,
+            edge_difficulty=edge_difficulty,
+            edge_traversable=edge_traversable,
+            edge_distance=edge_distance,
+            edge_barrier_offsets=edge_barrier_offsets,
+            edge_barrier_refs=edge_barrier_refs,
+            edge_notes=edge_notes,
+        )
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Expand into the networkx graph used by WorldModelService."""
+        graph = nx.DiGraph()
+        graph.add_nodes_from(
+            (node_id, {**self.nodes[i], "barriers": self.node_barriers(i)})
+            for i, node_id in enumerate(self.node_ids)
+        )
+
+        difficulties = [code.value for code in DIFFICULTY_CODES]
+        distances = [code.value for code in DISTANCE_CODES]
+        barrier_ids = [barrier.get("id") for barrier in self.barriers]
+        refs, ref_offsets = self.edge_barrier_refs, self.edge_barrier_offsets
+        node_ids, targets = self.node_ids, self.edge_targets
+        graph.add_edges_from(
+            (
+                node_ids[source],
+                node_ids[targets[edge]],
+                {
+                    "traversable": bool(self.edge_traversable[edge]),
+                    "difficulty": difficulties[self.edge_difficulty[edge]],
+                    "barriers_in_path": [
+                        barrier_ids[ref]
+                        for ref in refs[ref_offsets[edge] : ref_offsets[edge + 1]]
+                    ],
+                    "distance_estimate": distances[self.edge_distance[edge]],
+                    "notes": self.edge_notes.get(edge),
+                },
+            )
+            for source, edge in zip(self.edge_sources(), range(self.edge_count))
+        )
+        return graph
+
+    # Queries
+
+    def node_barriers(self, node: int) -> list[dict]:
+        """Get the barrier dicts of a node."""
+        start = self.node_barrier_offsets[node]
+        end = self.node_barrier_offsets[node + 1]
+        return [self.barriers[ref] for ref in self.node_barrier_refs[start:end]]
+
+    def edge_barrier_refs_of(self, edge: int) -> array:
+        """Get the barrier table indices of an edge."""
+        return self.edge_barrier_refs[
+            self.edge_barrier_offsets[edge] : self.edge_barrier_offsets[edge + 1]
+        ]
+
+    def edge_sources(self) -> array:
+        """Get the source node of every edge (the inverse of the CSR offsets)."""
+        sources = _index_array()
+        for node in range(self.node_count):
+            count = self.edge_offsets[node + 1] - self.edge_offsets[node]
+            sources.extend([node] * count)
+        return sources
+
+    def edge_costs(
+        self, difficulty_costs: Sequence[float] = DEFAULT_DIFFICULTY_COSTS
+    ) -> list[float]:
+        """Get the cost of every edge from a per-difficulty cost table."""
+        inf = float("inf")
+        return [
+            difficulty_costs[code] if traversable else inf
+            for code, traversable in zip(self.edge_difficulty, self.edge_traversable)
+        ]
+
+    def shortest_path(
+        self,
+        source: str,
+        target: str,
+        edge_costs: Sequence[float] | None = None,
+    ) -> tuple[list[str], float] | None:
+        """Find the cheapest path and its cost with Dijkstra over the CSR arrays.
+
+        Returns None when either node is unknown or the target is not
+        reachable through finite-cost edges.
+        """
+        if source not in self.node_index or target not in self.node_index:
+            return None
+        costs = edge_costs if edge_costs is not None else self.edge_costs()
+        start = self.node_index[source]
+        goal = self.node_index[target]
+
+        dist, parent_edge = self._dijkstra(start, costs, goal)
+        if dist[goal] == float("inf"):
+            return None
+        sources = self.edge_sources()
+        path = [goal]
+        while path[-1] != start:
+            path.append(sources[parent_edge[path[-1]]])
+        return [self.node_ids[i] for i in reversed(path)], dist[goal]
+
+    def shortest_path_tree(
+        self, source: int, edge_costs: Sequence[float] | None = None
+    ) -> tuple[list[float], array]:
+        """Get the cost to every node and the edge each is reached by.
+
+        The parent edge is -1 for the source and for unreachable nodes;
+        following parent edges back from any node yields its cheapest path.
+        """
+        costs = edge_costs if edge_costs is not None else self.edge_costs()
+        return self._dijkstra(source, costs)
+
+    def _dijkstra(
+        self, start: int, costs: Sequence[float], goal: int | None = None
+    ) -> tuple[list[float], array]:
+        """Run Dijkstra from a node, stopping early once ``goal`` is settled."""
+        inf = float("inf")
+        dist = [inf] * self.node_count
+        parent_edge = array("i", [-1] * self.node_count)
+        dist[start] = 0.0
+        heap = [(0.0, start)]
+        offsets, targets = self.edge_offsets, self.edge_targets
+
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if node == goal:
+                break
+            if cost > dist[node]:
+                continue
+            for edge in range(offsets[node], offsets[node + 1]):
+                step = costs[edge]
+                if step == inf:
+                    continue
+                neighbor = targets[edge]
+                candidate = cost + step
+                if candidate < dist[neighbor]:
+                    dist[neighbor] = candidate
+                    parent_edge[neighbor] = edge
+                    heapq.heappush(heap, (candidate, neighbor))
+        return dist, parent_edge
+
+    # Serialization
+
+    def _arrays(self) -> tuple[array, ...]:
+        """Get the arrays in serialization order."""
+        return (
+            self.node_barrier_offsets,
+            self.node_barrier_refs,
+            self.edge_offsets,
+            self.edge_targets,
+            self.edge_difficulty,
+            self.edge_traversable,
+            self.edge_distance,
+            self.edge_barrier_offsets,
+            self.edge_barrier_refs,
+        )
+
+    def to_bytes(self) -> bytes:
+        """Encode as a versioned little-endian binary blob."""
+        meta = json.dumps(
+            {
+                "node_ids": self.node_ids,
+                "nodes": self.nodes,
+                "barriers": self.barriers,
+                "edge_notes": {str(k): v for k, v in self.edge_notes.items()},
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+        parts = [
+            _HEADER.pack(
+                _MAGIC,
+                _FORMAT_VERSION,
+                self.node_count,
+                self.edge_count,
+                len(self.node_barrier_refs),
+                len(self.edge_barrier_refs),
+                len(meta),
+            )
+        ]
+        for values in self._arrays():
+            if sys.byteorder == "big" and values.itemsize > 1:
+                values = array(values.typecode, values)
+                values.byteswap()
+            parts.append(values.tobytes())
+        parts.append(meta)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompactGraph":
+        """Decode a blob written by ``to_bytes``."""
+        magic, version, nodes, edges, node_refs, edge_refs, meta_len = (
+            _HEADER.unpack_from(data)
+        )
+        if magic != _MAGIC:
+            raise ValueError("Not a compact world model graph")
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact graph version: {version}")
+
+        layout = (
+            ("I", nodes + 1),
+            ("I", node_refs),
+            ("I", nodes + 1),
+            ("I", edges),
+            ("B", edges),
+            ("B", edges),
+            ("B", edges),
+            ("I", edges + 1),
+            ("I", edge_refs),
+        )
+        offset = _HEADER.size
+        arrays = []
+        for typecode, length in layout:
+            values = array(typecode)
+            end = offset + values.itemsize * length
+            values.frombytes(data[offset:end])
+            if sys.byteorder == "big" and values.itemsize > 1:
+                values.byteswap()
+            arrays.append(values)
+            offset = end
+
+        meta = json.loads(data[offset : offset + meta_len])
+        return cls(
+            meta["node_ids"],
+            meta["nodes"],
+            meta["barriers"],
+            *arrays,
+            edge_notes={int(k): v for k, v in meta["edge_notes"].items()},
+        )
@@ -0,0 +1,62 @@
+"""In-process cache of rendered guide responses."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from src.core.config import settings
+
+# What a rendered guide depends on besides its id: the guide's updated_at
+# and the accessibility score and outdated flag of the scan's analysis
+GuideVersion = tuple[datetime, float | None, bool]
+
+
+@dataclass(frozen=True)
+class _Entry:
+    version: GuideVersion
+    body: bytes
+
+
+class GuideResponseCache:
+    """LRU map of guide id to its serialized GuideResponse.
+
+    Entries are only served while the version they were rendered from
+    matches, so unchanged guides skip step parsing and validation.
+    """
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = (
+            max_entries if max_entries is not None else settings.guide_cache_size
+        )
+        self._entries: OrderedDict[UUID, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, guide_id: UUID, version: GuideVersion) -> bytes | None:
+        """Get the rendered body of a guide version, if cached."""
+        entry = self._entries.get(guide_id)
+        if entry is None or entry.version != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(guide_id)
+        return entry.body
+
+    def set(self, guide_id: UUID, version: GuideVersion, body: bytes) -> None:
+        """Store a rendered body, evicting the least recently used if full."""
+        self._entries[guide_id] = _Entry(version=version, body=body)
+        self._entries.move_to_end(guide_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, guide_id: UUID) -> None:
+        """Drop the entry of a guide."""
+        self._entries.pop(guide_id, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+
+guide_response_cache = GuideResponseCache()
@@ -4,15 +4,18 @@ import json
 from uuid import UUID
 
 from src.models.analysis import Barrier
-from src.models.guide import Guide, WheelchairProfile
+from src.models.guide import Guide, GuideStep, WheelchairProfile
 from src.models.image import Image
-from src.schemas.enums import AccessibilityRating, BarrierSeverity
+from src.schemas.enums import AccessibilityRating, BarrierSeverity, BarrierType
 from src.schemas.navigation import (
     BarrierSummary,
+    GuideHeaderResponse,
     GuideResponse,
     NavigationStep,
+    RecommendedPath,
     WheelchairProfileResponse,
 )
+from src.schemas.scan import ImageUrls
 
 
 class GuideService:
@@ -92,24 +95,47 @@ class GuideService:
         images: list[Image],
         analysis_results: dict[UUID, dict],
         wheelchair_profile: WheelchairProfile | None = None,
+        recommended_path: RecommendedPath | None = None,
     ) -> Guide:
         """Generate a navigation guide for a scan."""
-        # Build navigation steps
-        steps = []
+        return self.generate_guides(
+            scan_id, images, analysis_results, [wheelchair_profile], recommended_path
+        )[0]
+
+    def generate_guides(
+        self,
+        scan_id: UUID,
+        images: list[Image],
+        analysis_results: dict[UUID, dict],
+        wheelchair_profiles: list[WheelchairProfile | None],
+        recommended_path: RecommendedPath | None = None,
+    ) -> list[Guide]:
+        """Generate one navigation guide per wheelchair profile in one pass.
+
+        Steps are built and serialized once; only the steps whose door
+        widths fall short for a profile are re-serialized for it.
+        """
+        # Build profile-independent navigation steps
+        steps_json = []
+        step_dicts = []
+        door_checks = []
         critical_alerts = []
 
         for image in sorted(images, key=lambda x: x.sequence_order):
             analysis = analysis_results.get(image.id, {})
-            step = self._create_navigation_step(
-                image, analysis, wheelchair_profile, len(steps) + 1
+            step, checks = self._create_navigation_step(
+                image, analysis, len(steps_json) + 1
             )
-            steps.append(step)
+            step_data = step.model_dump()
+            steps_json.append(json.dumps(step_data, default=str))
+            step_dicts.append(step_data)
+            door_checks.append(checks)
 
             # Collect critical alerts
             for barrier in image.barriers:
                 if barrier.severity == BarrierSeverity.CRITICAL:
                     critical_alerts.append(
-                        f"Paso {len(steps)}: {barrier.description}"
+                        f"Paso {len(steps_json)}: {barrier.description}"
                     )
 
         # Calculate overall accessibility score
@@ -122,28 +148,51 @@ class GuideService:
         # Generate title and summary
         title = self._generate_title(images, avg_score)
         summary = self._generate_summary(images, critical_alerts, avg_score)
-
-        # Create guide
-        guide = Guide(
-            scan_id=scan_id,
-            wheelchair_profile_id=wheelchair_profile.id if wheelchair_profile else None,
-            title=title,
-            summary=summary,
-            navigation_steps_json=json.dumps([s.model_dump() for s in steps], default=str),
-            alerts_json=json.dumps(critical_alerts),
-            recommended_path_json=None,
+        alerts_json = json.dumps(critical_alerts)
+        recommended_path_json = (
+            recommended_path.model_dump_json() if recommended_path else None
         )
 
-        return guide
+        guides = []
+        for profile in wheelchair_profiles:
+            profile_steps = list(steps_json)
+            if profile:
+                for index, checks in enumerate(door_checks):
+                    alerts = self._profile_alerts(
+                        step_dicts[index]["alerts"], checks, profile
+                    )
+                    if alerts is not None:
+                        step_data = {**step_dicts[index], "alerts": alerts}
+                        profile_steps[index] = json.dumps(step_data, default=str)
+
+            guide = Guide(
+                scan_id=scan_id,
+                wheelchair_profile_id=profile.id if profile else None,
+                title=title,
+                summary=summary,
+                step_count=len(profile_steps),
+                alerts_json=alerts_json,
+                recommended_path_json=recommended_path_json,
+            )
+            guide.steps = [
+                GuideStep(step_number=number, step_json=step_json)
+                for number, step_json in enumerate(profile_steps, start=1)
+            ]
+            guides.append(guide)
+
+        return guides
 
     def _create_navigation_step(
         self,
         image: Image,
         analysis: dict,
-        profile: WheelchairProfile | None,
         step_number: int,
-    ) -> NavigationStep:
-        """Create a navigation step for an image."""
+    ) -> tuple[NavigationStep, list[tuple[int, float]]]:
+        """Create the profile-independent navigation step for an image.
+
+        Also returns the door width checks of the step, as the alert
+        position each check's alert goes to and the estimated door width.
+        """
         barriers = [
             BarrierSummary(
                 id=b.id,
@@ -157,8 +206,9 @@ class GuideService:
 
         alerts = []
         recommendations = []
+        door_checks = []
 
-        # Generate alerts and recommendations based on barriers and profile
+        # Generate alerts and recommendations based on barriers
         for barrier in image.barriers:
             if barrier.severity in [BarrierSeverity.HIGH, BarrierSeverity.CRITICAL]:
                 alerts.append(barrier.description)
@@ -166,22 +216,18 @@ class GuideService:
             if barrier.recommendation:
                 recommendations.append(barrier.recommendation)
 
-            # Profile-specific checks
-            if profile and barrier.barrier_type.value == "narrow_door":
+            # Profile-specific checks, resolved per profile
+            if barrier.barrier_type == BarrierType.NARROW_DOOR:
                 if barrier.estimated_width_cm:
-                    if barrier.estimated_width_cm < profile.min_door_width_cm:
-                        alerts.append(
-                            f"Puerta de {barrier.estimated_width_cm}cm - "
-                            f"su silla necesita {profile.min_door_width_cm}cm"
-                        )
+                    door_checks.append((len(alerts), barrier.estimated_width_cm))
 
         # Determine accessibility rating
         rating = self._calculate_rating(image.barriers)
 
-        return NavigationStep(
+        step = NavigationStep(
             step_number=step_number,
             image_id=image.id,
-            image_url=f"/api/scans/{image.scan_id}/images/{image.id}/file",
+            image_url=ImageUrls.for_image(image.scan_id, image.id).medium,
             title=f"Paso {step_number}: {analysis.get('space_type', 'Ubicación').title()}",
             description=analysis.get("overall_description", ""),
             barriers=barriers,
@@ -189,6 +235,27 @@ class GuideService:
             recommendations=recommendations,
             accessibility_rating=rating,
         )
+        return step, door_checks
+
+    def _profile_alerts(
+        self,
+        alerts: list[str],
+        door_checks: list[tuple[int, float]],
+        profile: WheelchairProfile,
+    ) -> list[str] | None:
+        """Get a step's alerts for a profile, or None if they are unchanged."""
+        result = None
+        # Insert from the back so earlier positions stay valid
+        for position, width in reversed(door_checks):
+            if width < profile.min_door_width_cm:
+                if result is None:
+                    result = list(alerts)
+                result.insert(
+                    position,
+                    f"Puerta de {width}cm - "
+                    f"su silla necesita {profile.min_door_width_cm}cm",
+                )
+        return result
 
     def _calculate_rating(self, barriers: list[Barrier]) -> AccessibilityRating:
         """Calculate accessibility rating based on barriers."""
@@ -247,40 +314,62 @@ class GuideService:
         guide: Guide,
         wheelchair_profile: WheelchairProfile | None,
         accessibility_score: float | None,
+        steps_json: list[str],
+        outdated: bool = False,
     ) -> GuideResponse:
-        """Convert Guide model to response schema."""
-        steps = json.loads(guide.navigation_steps_json)
-        navigation_steps = [
-            NavigationStep(**step) for step in steps
-        ]
-
-        alerts = json.loads(guide.alerts_json)
-
-        profile_response = None
-        if wheelchair_profile:
-            profile_response = WheelchairProfileResponse(
-                id=wheelchair_profile.id,
-                name=wheelchair_profile.name,
-                description=wheelchair_profile.description,
-                width_cm=wheelchair_profile.width_cm,
-                length_cm=wheelchair_profile.length_cm,
-                min_door_width_cm=wheelchair_profile.min_door_width_cm,
-                max_step_height_cm=wheelchair_profile.max_step_height_cm,
-                max_slope_percent=wheelchair_profile.max_slope_percent,
-                can_handle_gravel=wheelchair_profile.can_handle_gravel,
-                can_handle_grass=wheelchair_profile.can_handle_grass,
-                wheelchair_type=wheelchair_profile.wheelchair_type,
-                is_default=wheelchair_profile.is_default,
-            )
-
+        """Convert Guide model and its serialized steps to response schema."""
         return GuideResponse(
             id=guide.id,
             scan_id=guide.scan_id,
             title=guide.title,
             summary=guide.summary,
             accessibility_score=accessibility_score,
-            navigation_steps=navigation_steps,
-            critical_alerts=alerts,
-            wheelchair_profile=profile_response,
+            navigation_steps=[
+                NavigationStep.model_validate_json(step) for step in steps_json
+            ],
+            critical_alerts=json.loads(guide.alerts_json),
+            wheelchair_profile=self._profile_response(wheelchair_profile),
             created_at=guide.created_at,
+            outdated=outdated,
+        )
+
+    def guide_to_header(
+        self,
+        guide: Guide,
+        wheelchair_profile: WheelchairProfile | None,
+        accessibility_score: float | None,
+        outdated: bool = False,
+    ) -> GuideHeaderResponse:
+        """Convert Guide model to header schema, without its steps."""
+        return GuideHeaderResponse(
+            id=guide.id,
+            scan_id=guide.scan_id,
+            title=guide.title,
+            summary=guide.summary,
+            accessibility_score=accessibility_score,
+            step_count=guide.step_count,
+            critical_alerts=json.loads(guide.alerts_json),
+            wheelchair_profile=self._profile_response(wheelchair_profile),
+            created_at=guide.created_at,            outdated=outdated,
+        )
+
+    def _profile_response(
+        self, wheelchair_profile: WheelchairProfile | None
+    ) -> WheelchairProfileResponse | None:
+        """Convert a wheelchair profile to response schema."""
+        if not wheelchair_profile:
+            return None
+        return WheelchairProfileResponse(
+            id=wheelchair_profile.id,
+            name=wheelchair_profile.name,
+            description=wheelchair_profile.description,
+            width_cm=wheelchair_profile.width_cm,
+            length_cm=wheelchair_profile.length_cm,
+            min_door_width_cm=wheelchair_profile.min_door_width_cm,
+            max_step_height_cm=wheelchair_profile.max_step_height_cm,
+            max_slope_percent=wheelchair_profile.max_slope_percent,
+            can_handle_gravel=wheelchair_profile.can_handle_gravel,
+            can_handle_grass=wheelchair_profile.can_handle_grass,
+            wheelchair_type=wheelchair_profile.wheelchair_type,
+            is_default=wheelchair_profile.is_default,
         )
@@ -0,0 +1,62 @@
+"""In-process cache of the metadata needed to serve image files."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from src.core.config import settings
+
+
+@dataclass(frozen=True)
+class ImageFile:
+    """Location and headers of a stored image file."""
+
+    file_path: str
+    mime_type: str
+    original_filename: str
+    content_hash: str | None
+
+
+class ImageFileCache:
+    """LRU map of (scan_id, image_id) to ImageFile.
+
+    Image files never change once uploaded, so entries only have to be
+    dropped when an image or its scan is deleted.
+    """
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = (
+            max_entries if max_entries is not None else settings.image_file_cache_size
+        )
+        self._entries: OrderedDict[tuple[UUID, UUID], ImageFile] = OrderedDict()
+
+    def get(self, scan_id: UUID, image_id: UUID) -> ImageFile | None:
+        """Get cached metadata, marking it as recently used."""
+        key = (scan_id, image_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, scan_id: UUID, image_id: UUID, entry: ImageFile) -> None:
+        """Store metadata, evicting the least recently used entry if full."""
+        self._entries[(scan_id, image_id)] = entry
+        self._entries.move_to_end((scan_id, image_id))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, scan_id: UUID, image_id: UUID) -> None:
+        """Drop the entry of one image."""
+        self._entries.pop((scan_id, image_id), None)
+
+    def discard_scan(self, scan_id: UUID) -> None:
+        """Drop the entries of every image in a scan."""
+        for key in [key for key in self._entries if key[0] == scan_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+
+image_file_cache = ImageFileCache()
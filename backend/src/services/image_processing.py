@@ -0,0 +1,134 @@
+"""Image preprocessing helpers built on Pillow."""
+
+import os
+from pathlib import Path
+from uuid import uuid4
+
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+from src.core.config import settings
+from src.schemas.enums import ImageSize
+
+FORMAT_EXTENSIONS = {"JPEG": ".jpg", "WEBP": ".webp"}
+FORMAT_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+
+def vision_payload_path(image_path: Path) -> Path:
+    """Get the path of the prepared vision payload stored next to an upload."""
+    fmt = settings.vision_image_format
+    return image_path.with_name(
+        f"{image_path.stem}.vision-{settings.vision_image_max_edge}"
+        f"-q{settings.vision_image_quality}{FORMAT_EXTENSIONS[fmt]}"
+    )
+
+
+def _is_fresh(target: Path, image_path: Path) -> bool:
+    """Check whether a file generated from an upload is up to date."""
+    return target.exists() and target.stat().st_mtime >= image_path.stat().st_mtime
+
+
+def _save_atomically(image: PILImage.Image, target: Path, **params) -> None:
+    """Save an image through a temporary file unique to this write."""
+    tmp_path = target.with_name(f"{target.name}.{uuid4().hex}.tmp")
+    try:
+        image.save(tmp_path, **params)
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def prepare_for_vision(image_path: Path) -> tuple[Path, str]:
+    """Build (or reuse) the downscaled payload sent to the vision model.
+
+    The image is rotated according to its EXIF orientation, shrunk so its
+    longest edge fits ``vision_image_max_edge`` and re-encoded without
+    metadata. Returns the payload path and its MIME type. If the upload
+    cannot be decoded, the original file is returned unchanged.
+    """
+    if not image_path.exists():
+        raise FileNotFoundError(f"Image not found: {image_path}")
+
+    fmt = settings.vision_image_format
+    target = vision_payload_path(image_path)
+    if _is_fresh(target, image_path):
+        return target, FORMAT_MIME_TYPES[fmt]
+
+    try:
+        with PILImage.open(image_path) as img:
+            prepared = ImageOps.exif_transpose(img)
+            if prepared.mode != "RGB":
+                prepared = prepared.convert("RGB")
+            edge = settings.vision_image_max_edge
+            prepared.thumbnail((edge, edge), PILImage.Resampling.LANCZOS)
+            _save_atomically(
+                prepared, target, format=fmt, quality=settings.vision_image_quality
+            )
+    except (OSError, ValueError):
+        # A concurrent build may still have produced the payload
+        if _is_fresh(target, image_path):
+            return target, FORMAT_MIME_TYPES[fmt]
+        return image_path, "image/jpeg"
+
+    return target, FORMAT_MIME_TYPES[fmt]
+
+
+def derivative_path(image_path: Path, size: ImageSize) -> Path:
+    """Get the path of a size variant stored next to an upload."""
+    return image_path.with_name(f"{image_path.stem}.{size.value}.jpg")
+
+
+def image_derivative(image_path: Path, size: ImageSize) -> Path:
+    """Build (or reuse) a downscaled JPEG variant of an upload.
+
+    The variant is written next to the upload on first use. The original
+    path is returned for ``ImageSize.ORIGINAL``, when the upload already
+    fits the requested edge, or when it cannot be decoded.
+    """
+    if not image_path.exists():
+        raise FileNotFoundError(f"Image not found: {image_path}")
+    if size == ImageSize.ORIGINAL:
+        return image_path
+
+    target = derivative_path(image_path, size)
+    if _is_fresh(target, image_path):
+        return target
+
+    edge = (
+        settings.image_thumbnail_edge
+        if size == ImageSize.THUMBNAIL
+        else settings.image_medium_edge
+    )
+    try:
+        with PILImage.open(image_path) as img:
+            if max(img.size) <= edge:
+                return image_path
+            img.draft("RGB", (edge, edge))
+            variant = ImageOps.exif_transpose(img)
+            if variant.mode != "RGB":
+                variant = variant.convert("RGB")
+            variant.thumbnail((edge, edge), PILImage.Resampling.LANCZOS)
+            _save_atomically(
+                variant,
+                target,
+                format="JPEG",
+                quality=settings.image_derivative_quality,
+                optimize=True,
+                progressive=True,
+            )
+    except (OSError, ValueError):
+        # A concurrent build may still have produced the variant
+        if _is_fresh(target, image_path):
+            return target
+        return image_path
+
+    return target
+
+
+def derived_paths(image_path: Path) -> list[Path]:
+    """Get files generated from an upload (payloads, derivatives)."""
+    return [
+        path
+        for path in image_path.parent.glob(f"{image_path.stem}.*")
+        if path != image_path
+    ]
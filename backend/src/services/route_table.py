@@ -0,0 +1,167 @@
+"""Precomputed shortest-path trees of a world model, per wheelchair profile.
+
+A tree stores, for every node, the CSR index of the edge it is reached by
+and the path cost from the tree's source. Looking up a route walks parent
+edges back from the target, so it costs O(path length) instead of a
+Dijkstra run per query.
+"""
+
+import struct
+import sys
+from array import array
+from uuid import UUID
+
+from src.services.compact_graph import CompactGraph
+
+_MAGIC = b"NFRT"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHIIII")
+# Profile key written for the default (no profile) trees
+_NO_PROFILE = bytes(16)
+
+
+def _to_le(values: array) -> bytes:
+    """Encode an array as little-endian bytes."""
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    """Decode a little-endian array."""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values.byteswap()
+    return values
+
+
+class RouteTable:
+    """Shortest-path trees from a set of source nodes, for several profiles."""
+
+    def __init__(
+        self,
+        node_count: int,
+        edge_count: int,
+        sources: list[int],
+        edge_codes: dict[UUID | None, array],
+        trees: dict[tuple[UUID | None, int], tuple[array, array]],
+    ):
+        self.node_count = node_count
+        self.edge_count = edge_count
+        self.sources = sources
+        # Per-profile difficulty code of every edge
+        self.edge_codes = edge_codes
+        # (profile id, source node) -> (parent edge per node, cost per node)
+        self.trees = trees
+
+    @classmethod
+    def build(
+        cls,
+        compact: CompactGraph,
+        sources: list[int],
+        profile_edges: dict[UUID | None, tuple[list[int], list[float]]],
+    ) -> "RouteTable":
+        """Build the trees of every source for each profile's edge costs.
+
+        ``profile_edges`` maps a profile id (None for the default costs) to
+        its per-edge difficulty codes and costs.
+        """
+        edge_codes: dict[UUID | None, array] = {}
+        trees: dict[tuple[UUID | None, int], tuple[array, array]] = {}
+        for profile_id, (codes, costs) in profile_edges.items():
+            edge_codes[profile_id] = array("B", codes)
+            for source in sources:
+                dist, parent_edge = compact.shortest_path_tree(source, costs)
+                trees[(profile_id, source)] = (parent_edge, array("f", dist))
+        return cls(compact.node_count, compact.edge_count, sources, edge_codes, trees)
+
+    def has_tree(self, profile_id: UUID | None, source: int) -> bool:
+        """Check whether routes from a node were precomputed for a profile."""
+        return (profile_id, source) in self.trees
+
+    def lookup(
+        self,
+        edge_sources: array,
+        profile_id: UUID | None,
+        source: int,
+        target: int,
+    ) -> tuple[list[int], list[int], float] | None:
+        """Get the node path, per-hop difficulty codes and cost of a route.
+
+        ``edge_sources`` comes from ``CompactGraph.edge_sources``. Returns
+        None when the target is unreachable; raises KeyError when no tree
+        was precomputed for the profile and source.
+        """
+        parent_edge, cost = self.trees[(profile_id, source)]
+        if target != source and parent_edge[target] < 0:
+            return None
+
+        codes = self.edge_codes[profile_id]
+        path = [target]
+        hops: list[int] = []
+        while path[-1] != source:
+            edge = parent_edge[path[-1]]
+            hops.append(codes[edge])
+            path.append(edge_sources[edge])
+        path.reverse()
+        hops.reverse()
+        return path, hops, float(cost[target])
+
+    # Serialization
+
+    def to_bytes(self) -> bytes:
+        """Encode as a versioned little-endian binary blob."""
+        profiles = list(self.edge_codes)
+        parts = [
+            _HEADER.pack(
+                _MAGIC,
+                _FORMAT_VERSION,
+                self.node_count,
+                self.edge_count,
+                len(profiles),
+                len(self.sources),
+            ),
+            _to_le(array("I", self.sources)),
+        ]
+        for profile_id in profiles:
+            parts.append(profile_id.bytes if profile_id else _NO_PROFILE)
+            parts.append(self.edge_codes[profile_id].tobytes())
+            for source in self.sources:
+                parent_edge, cost = self.trees[(profile_id, source)]
+                parts.append(_to_le(parent_edge))
+                parts.append(_to_le(cost))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RouteTable":
+        """Decode a blob written by ``to_bytes``."""
+        magic, version, nodes, edges, profile_count, source_count = (
+            _HEADER.unpack_from(data)
+        )
+        if magic != _MAGIC:
+            raise ValueError("Not a route table")
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported route table version: {version}")
+
+        offset = _HEADER.size
+
+        def take(typecode: str, length: int) -> array:
+            nonlocal offset
+            end = offset + array(typecode).itemsize * length
+            values = _from_le(typecode, data[offset:end])
+            offset = end
+            return values
+
+        sources = list(take("I", source_count))
+        edge_codes: dict[UUID | None, array] = {}
+        trees: dict[tuple[UUID | None, int], tuple[array, array]] = {}
+        for _ in range(profile_count):
+            key = data[offset : offset + 16]
+            offset += 16
+            profile_id = None if key == _NO_PROFILE else UUID(bytes=key)
+            edge_codes[profile_id] = take("B", edges)
+            for source in sources:
+                trees[(profile_id, source)] = (take("i", nodes), take("f", nodes))
+        return cls(nodes, edges, sources, edge_codes, trees)
@@ -0,0 +1,221 @@
+"""Service for wheelchair-profile-aware routing over the world model."""
+
+from src.core.config import settings
+from src.models.analysis import AnalysisResult
+from src.models.guide import WheelchairProfile
+from src.schemas.enums import BarrierType, Difficulty, SpaceType
+from src.schemas.navigation import RouteResponse
+from src.services.compact_graph import (
+    DEFAULT_DIFFICULTY_COSTS,
+    DIFFICULTY_CODES,
+    SEVERITY_CODES,
+    CompactGraph,
+)
+from src.services.route_table import RouteTable
+from src.services.world_model_cache import WorldModelCache, world_model_cache
+
+EASY = DIFFICULTY_CODES.index(Difficulty.EASY)
+MODERATE = DIFFICULTY_CODES.index(Difficulty.MODERATE)
+IMPASSABLE = DIFFICULTY_CODES.index(Difficulty.IMPASSABLE)
+_SEVERITY_INDEX = {s.value: i for i, s in enumerate(SEVERITY_CODES)}
+
+# Barrier types checked against each profile constraint
+WIDTH_LIMITED = {BarrierType.NARROW_DOOR.value, BarrierType.NARROW_PASSAGE.value}
+HEIGHT_LIMITED = {
+    BarrierType.STEP.value,
+    BarrierType.STAIRS.value,
+    BarrierType.THRESHOLD.value,
+}
+SLOPE_LIMITED = {BarrierType.STEEP_RAMP.value, BarrierType.SLOPE.value}
+
+
+def barrier_difficulty(barrier: dict, profile: WheelchairProfile | None) -> int:
+    """Get the difficulty code of a barrier for a wheelchair profile.
+
+    Measured dimensions are checked against the profile: a barrier that
+    exceeds a limit is impassable and one within it is easy. Without a
+    profile or measurements the difficulty follows the barrier severity.
+    """
+    by_severity = _SEVERITY_INDEX.get(barrier.get("severity", "medium"), MODERATE)
+    if profile is None:
+        return by_severity
+
+    barrier_type = barrier.get("barrier_type")
+    width = barrier.get("estimated_width_cm")
+    height = barrier.get("estimated_height_cm")
+    depth = barrier.get("estimated_depth_cm")
+
+    if barrier_type in WIDTH_LIMITED and width is not None:
+        return IMPASSABLE if width < profile.min_door_width_cm else EASY
+    if barrier_type in HEIGHT_LIMITED and height is not None:
+        return IMPASSABLE if height > profile.max_step_height_cm else EASY
+    if barrier_type in SLOPE_LIMITED and height is not None and depth:
+        slope_percent = height / depth * 100
+        return IMPASSABLE if slope_percent > profile.max_slope_percent else EASY
+    if barrier_type == BarrierType.GRAVEL.value and not profile.can_handle_gravel:
+        return IMPASSABLE
+    if barrier_type == BarrierType.GRASS.value and not profile.can_handle_grass:
+        return IMPASSABLE
+    return by_severity
+
+
+def edge_difficulties(
+    compact: CompactGraph, profile: WheelchairProfile | None
+) -> list[int]:
+    """Get the difficulty code of every edge for a wheelchair profile.
+
+    With a profile, an edge is as hard as its hardest barrier; edges
+    without barriers keep their stored difficulty. Each barrier is rated
+    once and edges look the ratings up by barrier index.
+    """
+    stored = [
+        code if traversable else IMPASSABLE
+        for code, traversable in zip(compact.edge_difficulty, compact.edge_traversable)
+    ]
+    if profile is None:
+        return stored
+
+    ratings = [barrier_difficulty(b, profile) for b in compact.barriers]
+    offsets, refs = compact.edge_barrier_offsets, compact.edge_barrier_refs
+    return [
+        max(
+            (ratings[ref] for ref in refs[offsets[e] : offsets[e + 1]]),
+            default=stored[e],
+        )
+        for e in range(compact.edge_count)
+    ]
+
+
+def route_sources(compact: CompactGraph) -> list[int]:
+    """Get the nodes to precompute routes from, per ``route_precompute``."""
+    if settings.route_precompute == "off" or not compact.node_count:
+        return []
+    if settings.route_precompute == "all":
+        return list(range(compact.node_count))
+    return [
+        i
+        for i, node in enumerate(compact.nodes)
+        if i == 0 or node.get("space_type") == SpaceType.ENTRANCE.value
+    ]
+
+
+def build_route_table(
+    compact: CompactGraph, profiles: list[WheelchairProfile]
+) -> RouteTable | None:
+    """Precompute shortest-path trees for the default costs and each profile."""
+    sources = route_sources(compact)
+    if not sources:
+        return None
+    profile_edges = {}
+    for profile in [None, *profiles]:
+        codes = edge_difficulties(compact, profile)
+        profile_edges[profile.id if profile else None] = (
+            codes,
+            [DEFAULT_DIFFICULTY_COSTS[code] for code in codes],
+        )
+    return RouteTable.build(compact, sources, profile_edges)
+
+
+class RoutingService:
+    """Service for routes between world model nodes, memoized per graph version."""
+
+    def __init__(self, cache: WorldModelCache | None = None):
+        self.cache = cache or world_model_cache
+
+    def _edge_state(
+        self, analysis: AnalysisResult, profile: WheelchairProfile | None
+    ) -> tuple[list[int], list[float]]:
+        """Get per-edge difficulty codes and costs for a profile."""
+        profile_id = profile.id if profile else None
+
+        def compute() -> tuple[list[int], list[float]]:
+            compact = self.cache.get_compact(analysis)
+            codes = edge_difficulties(compact, profile)
+            return codes, [DEFAULT_DIFFICULTY_COSTS[code] for code in codes]
+
+        return self.cache.memoize(analysis, ("edges", profile_id), compute)
+
+    def _route_table(self, analysis: AnalysisResult) -> RouteTable | None:
+        """Get the decoded route table stored with an analysis, if any."""
+        if not analysis.route_trees:
+            return None
+        return self.cache.memoize(
+            analysis,
+            ("route_table",),
+            lambda: RouteTable.from_bytes(analysis.route_trees),
+        )
+
+    def route(
+        self,
+        analysis: AnalysisResult,
+        source: str,
+        target: str,
+        profile: WheelchairProfile | None = None,
+    ) -> RouteResponse:
+        """Get the cheapest accessible route between two nodes.
+
+        Routes are read from the precomputed trees when the analysis has
+        one for the profile and source, and computed (and memoized)
+        otherwise. Raises ValueError if the analysis has no world model
+        or a node is not part of it.
+        """
+        compact = self.cache.get_compact(analysis)
+        if compact is None:
+            raise ValueError(f"World model for scan {analysis.scan_id} not found")
+        for node_id in (source, target):
+            if node_id not in compact.node_index:
+                raise ValueError(f"Node {node_id} not found")
+
+        profile_id = profile.id if profile else None
+        table = self._route_table(analysis)
+        source_index = compact.node_index[source]
+        if table and table.has_tree(profile_id, source_index):
+            edge_sources = self.cache.memoize(
+                analysis, ("edge_sources",), compact.edge_sources
+            )
+            found = table.lookup(
+                edge_sources, profile_id, source_index, compact.node_index[target]
+            )
+            path, hops, total_cost = found if found else ([], [], None)
+            return RouteResponse(
+                scan_id=analysis.scan_id,
+                wheelchair_profile_id=profile_id,
+                from_node=source,
+                to_node=target,
+                reachable=found is not None,
+                path=[compact.node_ids[i] for i in path],
+                total_cost=total_cost,
+                edge_difficulties=[DIFFICULTY_CODES[code] for code in hops],
+            )
+
+        def compute() -> RouteResponse:
+            codes, costs = self._edge_state(analysis, profile)
+            found = compact.shortest_path(source, target, costs)
+            path, total_cost = found if found else ([], None)
+            return RouteResponse(
+                scan_id=analysis.scan_id,
+                wheelchair_profile_id=profile_id,
+                from_node=source,
+                to_node=target,
+                reachable=found is not None,
+                path=path,
+                total_cost=total_cost,
+                edge_difficulties=[
+                    DIFFICULTY_CODES[codes[self._edge_index(compact, u, v)]]
+                    for u, v in zip(path, path[1:])
+                ],
+            )
+
+        return self.cache.memoize(
+            analysis, ("route", profile_id, source, target), compute
+        )
+
+    @staticmethod
+    def _edge_index(compact: CompactGraph, source: str, target: str) -> int:
+        """Get the CSR index of the edge between two nodes."""
+        u = compact.node_index[source]
+        v = compact.node_index[target]
+        for edge in range(compact.edge_offsets[u], compact.edge_offsets[u + 1]):
+            if compact.edge_targets[edge] == v:
+                return edge
+        raise KeyError((source, target))
@@ -1,5 +1,9 @@
 """Service for scan operations."""
 
+import asyncio
+import hashlib
+import io
+import json
 import os
 import shutil
 from datetime import datetime
@@ -9,20 +13,28 @@ from uuid import UUID, uuid4
 import aiofiles
 from fastapi import UploadFile
 from PIL import Image as PILImage
+from sqlalchemy.sql.base import ExecutableOption
+from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.core.config import settings
+from src.models.analysis import AnalysisResult
 from src.models.image import Image
 from src.models.scan import Scan
-from src.repositories.image_repository import ImageRepository
-from src.repositories.scan_repository import ScanRepository
-from src.schemas.enums import ScanStatus
+from src.repositories.barrier_repository import BarrierRepository
+from src.repositories.image_repository import ImageLoad, ImageRepository
+from src.repositories.scan_repository import ScanLoad, ScanRepository
+from src.schemas.enums import ImageSize, ScanStatus
 from src.schemas.scan import (
     ImageResponse,
     ImageUploadResponse,
+    ImageUrls,
     ScanCreate,
     ScanUpdate,
 )
+from src.services.analysis_service import image_score, update_score
+from src.services.image_file_cache import ImageFile, image_file_cache
+from src.services.image_processing import derived_paths, image_derivative
 
 
 class ScanService:
@@ -32,6 +44,7 @@ class ScanService:
         self.session = session
         self.scan_repo = ScanRepository(session)
         self.image_repo = ImageRepository(session)
+        self.barrier_repo = BarrierRepository(session)
 
     async def create_scan(self, data: ScanCreate) -> Scan:
         """Create a new scan."""
@@ -42,9 +55,13 @@ class ScanService:
         )
         return await self.scan_repo.create(scan)
 
-    async def get_scan(self, scan_id: UUID) -> Scan | None:
-        """Get a scan by ID."""
-        return await self.scan_repo.get_by_id(scan_id)
+    async def get_scan(
+        self,
+        scan_id: UUID,
+        options: tuple[ExecutableOption, ...] = ScanLoad.SUMMARY,
+    ) -> Scan | None:
+        """Get a scan by ID, loading only the relationships in ``options``."""
+        return await self.scan_repo.get_by_id(scan_id, options)
 
     async def list_scans(
         self,
@@ -55,6 +72,10 @@ class ScanService:
         """List scans with optional filtering."""
         return await self.scan_repo.get_all(status=status, limit=limit, offset=offset)
 
+    async def get_image_counts(self, scan_ids: list[UUID]) -> dict[UUID, int]:
+        """Get the number of images of each scan."""
+        return await self.scan_repo.get_image_counts(scan_ids)
+
     async def update_scan(self, scan_id: UUID, data: ScanUpdate) -> Scan | None:
         """Update a scan."""
         scan = await self.scan_repo.get_by_id(scan_id)
@@ -81,6 +102,7 @@ class ScanService:
         scan_upload_dir = settings.upload_dir / str(scan_id)
         if scan_upload_dir.exists():
             shutil.rmtree(scan_upload_dir)
+        image_file_cache.discard_scan(scan_id)
 
         await self.scan_repo.delete(scan)
         return True
@@ -94,7 +116,7 @@ class ScanService:
             raise ValueError(f"Scan {scan_id} not found")
 
         # Check image limit
-        current_count = len(scan.images) if scan.images else 0
+        current_count = await self.image_repo.count_by_scan_id(scan_id)
         remaining_slots = settings.max_images_per_scan - current_count
         if remaining_slots <= 0:
             raise ValueError(
@@ -115,18 +137,31 @@ class ScanService:
         errors: list[str] = []
         start_order = await self.image_repo.get_max_sequence_order(scan_id) + 1
 
-        for i, file in enumerate(files[: remaining_slots]):
-            try:
-                image = await self._process_upload(
-                    scan_id, file, upload_dir, start_order + i
-                )
-                uploaded_images.append(image)
-            except Exception as e:
-                errors.append(f"{file.filename}: {str(e)}")
+        # Process files concurrently; gather keeps outcomes in request order,
+        # and accepted files are numbered in that order
+        limit = asyncio.Semaphore(settings.upload_concurrency)
+
+        async def process(file: UploadFile) -> Image | Exception:
+            async with limit:
+                try:
+                    return await self._process_upload(scan_id, file, upload_dir)
+                except Exception as e:
+                    return e
+
+        selected = files[:remaining_slots]
+        outcomes = await asyncio.gather(*(process(file) for file in selected))
+
+        for file, outcome in zip(selected, outcomes, strict=True):
+            if isinstance(outcome, Exception):
+                errors.append(f"{file.filename}: {str(outcome)}")
+            else:
+                outcome.sequence_order = start_order + len(uploaded_images)
+                uploaded_images.append(outcome)
 
         # Save images to database
         if uploaded_images:
             await self.image_repo.create_many(uploaded_images)
+            await self._mark_analysis_outdated(scan_id)
 
             # Update scan status
             scan.status = ScanStatus.READY
@@ -141,52 +176,102 @@ class ScanService:
         )
 
     async def _process_upload(
-        self, scan_id: UUID, file: UploadFile, upload_dir: Path, sequence_order: int
+        self, scan_id: UUID, file: UploadFile, upload_dir: Path
     ) -> Image:
-        """Process a single file upload."""
+        """Process a single file upload; the caller assigns its sequence order."""
         if file.content_type not in settings.allowed_image_types:
             raise ValueError(f"Invalid file type: {file.content_type}")
 
-        # Read file content
-        content = await file.read()
-        if len(content) > settings.max_upload_size_bytes:
-            raise ValueError(
-                f"File too large: {len(content)} bytes "
-                f"(max: {settings.max_upload_size_bytes})"
-            )
-
         # Generate unique filename
         ext = Path(file.filename or "image").suffix or ".jpg"
         filename = f"{uuid4()}{ext}"
         file_path = upload_dir / filename
 
-        # Save file
-        async with aiofiles.open(file_path, "wb") as f:
-            await f.write(content)
-
-        # Get image dimensions
-        width, height = None, None
+        # Stream to disk in chunks, hashing and keeping only the header bytes
+        file_size = 0
+        digest = hashlib.sha256()
+        head = bytearray()
         try:
-            with PILImage.open(file_path) as img:
-                width, height = img.size
-        except Exception:
-            pass
+            async with aiofiles.open(file_path, "wb") as f:
+                while chunk := await file.read(settings.upload_chunk_size):
+                    file_size += len(chunk)
+                    if file_size > settings.max_upload_size_bytes:
+                        raise ValueError(
+                            f"File too large: more than "
+                            f"{settings.max_upload_size_bytes} bytes"
+                        )
+                    digest.update(chunk)
+                    if len(head) < settings.upload_probe_bytes:
+                        head += chunk[: settings.upload_probe_bytes - len(head)]
+                    await f.write(chunk)
+        except BaseException:
+            file_path.unlink(missing_ok=True)
+            raise
+
+        # Get image dimensions from the header, off the event loop
+        width, height = await asyncio.to_thread(self._probe_dimensions, bytes(head))
 
         return Image(
             scan_id=scan_id,
             filename=filename,
             original_filename=file.filename or "unknown",
             file_path=str(file_path),
-            file_size=len(content),
+            file_size=file_size,
             mime_type=file.content_type or "image/jpeg",
+            content_hash=digest.hexdigest(),
             width=width,
             height=height,
-            sequence_order=sequence_order,
         )
 
-    async def get_images(self, scan_id: UUID) -> list[Image]:
-        """Get all images for a scan."""
-        return await self.image_repo.get_by_scan_id(scan_id)
+    def _probe_dimensions(self, head: bytes) -> tuple[int | None, int | None]:
+        """Read image dimensions from the leading bytes of a file."""
+        try:
+            with PILImage.open(io.BytesIO(head)) as img:
+                return img.size
+        except Exception:
+            return None, None
+
+    async def get_images(
+        self,
+        scan_id: UUID,
+        options: tuple[ExecutableOption, ...] = ImageLoad.PLAIN,
+    ) -> list[Image]:
+        """Get all images for a scan, loading only the relationships in ``options``."""
+        return await self.image_repo.get_by_scan_id(scan_id, options)
+
+    async def get_image_file(
+        self, scan_id: UUID, image_id: UUID, size: ImageSize = ImageSize.ORIGINAL
+    ) -> ImageFile | None:
+        """Get what is needed to serve an image file or one of its variants.
+
+        Metadata is cached in process; variants are built on first request.
+        """
+        entry = image_file_cache.get(scan_id, image_id)
+        if entry is None:
+            row = await self.image_repo.get_file_info(scan_id, image_id)
+            if row is None:
+                return None
+            entry = ImageFile(*row)
+            image_file_cache.set(scan_id, image_id, entry)
+
+        if size == ImageSize.ORIGINAL:
+            return entry
+
+        original = Path(entry.file_path)
+        try:
+            path = await asyncio.to_thread(image_derivative, original, size)
+        except FileNotFoundError:
+            return None
+        if path == original:
+            return entry
+
+        stem = Path(entry.original_filename).stem
+        return ImageFile(
+            file_path=str(path),
+            mime_type="image/jpeg",
+            original_filename=f"{stem}.{size.value}.jpg",
+            content_hash=entry.content_hash and f"{entry.content_hash}-{size.value}",
+        )
 
     async def delete_image(self, scan_id: UUID, image_id: UUID) -> bool:
         """Delete an image from a scan."""
@@ -194,18 +279,53 @@ class ScanService:
         if not image or image.scan_id != scan_id:
             return False
 
-        # Delete file
+        # Delete file and anything generated from it
+        for path in derived_paths(Path(image.file_path)):
+            path.unlink(missing_ok=True)
         if os.path.exists(image.file_path):
             os.remove(image.file_path)
 
+        await self._mark_analysis_outdated(scan_id, removed=image)
         await self.image_repo.delete(image)
+        image_file_cache.discard(scan_id, image_id)
         return True
 
     async def reorder_images(
         self, scan_id: UUID, image_ids: list[UUID]
     ) -> list[Image]:
         """Reorder images in a scan."""
-        return await self.image_repo.reorder(scan_id, image_ids)
+        images = await self.image_repo.reorder(
+            scan_id, image_ids, ImageLoad.WITH_BARRIERS
+        )
+        await self._mark_analysis_outdated(scan_id)
+        return images
+
+    async def _mark_analysis_outdated(
+        self, scan_id: UUID, removed: Image | None = None
+    ) -> None:
+        """Flag the scan's analysis for an incremental re-run.
+
+        Materialized barrier statistics are dropped, and a removed image's
+        share is subtracted from the totals and the score right away.
+        """
+        statement = select(AnalysisResult).where(AnalysisResult.scan_id == scan_id)
+        result = await self.session.execute(statement)
+        analysis = result.scalar_one_or_none()
+        if analysis is None:
+            return
+
+        analysis.outdated = True
+        analysis.barrier_stats_json = None
+        if removed is None or removed.analysis_json is None:
+            return
+
+        analysis.total_images_analyzed -= 1
+        analysis.total_barriers_found -= await self.barrier_repo.count_by_image_id(
+            removed.id
+        )
+        score = image_score(json.loads(removed.analysis_json))
+        if score is not None:
+            update_score(analysis, removed=[score])
 
     def _image_to_response(self, image: Image, scan_id: UUID) -> ImageResponse:
         """Convert Image model to response schema."""
@@ -222,4 +342,5 @@ class ScanService:
             created_at=image.created_at,
             barrier_count=image.barrier_count,
             url=f"/api/scans/{scan_id}/images/{image.id}/file",
+            urls=ImageUrls.for_image(scan_id, image.id),
         )
@@ -0,0 +1,146 @@
+"""Content-addressed on-disk cache for Vision AI analysis results."""
+
+import asyncio
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from uuid import uuid4
+
+import aiofiles
+
+from src.core.config import settings
+
+
+class VisionResultCache:
+    """LRU cache of vision results keyed by image content and prompt version.
+
+    Entries are JSON files named after their key. An in-memory index of
+    entry sizes in LRU order, seeded from the files' mtimes on first use,
+    keeps a running total so writes only delete files once the directory
+    grows past ``max_bytes``. Reads also touch the file's mtime, so the
+    order survives restarts.
+    """
+
+    def __init__(self, cache_dir: Path | None = None, max_bytes: int | None = None):
+        self.cache_dir = cache_dir or settings.vision_cache_dir
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else settings.vision_cache_max_bytes
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Key to file size, least recently used first
+        self._index: OrderedDict[str, int] | None = None
+        self._total = 0
+
+    @staticmethod
+    def make_key(image_bytes: bytes, prompt: str, model: str, max_tokens: int) -> str:
+        """Build the cache key for an image and the request parameters."""
+        parts = [
+            hashlib.sha256(image_bytes).hexdigest(),
+            model,
+            hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            str(max_tokens),
+        ]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Get the file path for a cache key."""
+        return self.cache_dir / f"{key}.json"
+
+    async def get(self, key: str) -> dict | None:
+        """Get a cached result, or None on a miss."""
+        path = self._path(key)
+        try:
+            async with aiofiles.open(path, "r", encoding="utf-8") as f:
+                result = json.loads(await f.read())
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            if self._index is not None and key in self._index:
+                self._total -= self._index.pop(key)
+            return None
+
+        self.hits += 1
+        if self._index is not None and key in self._index:
+            self._index.move_to_end(key)
+        return result
+
+    async def set(self, key: str, result: dict) -> None:
+        """Store a result and evict old entries if over the size limit."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index = await self._load_index()
+        path = self._path(key)
+        # Unique per write, so concurrent sets of one key never share it
+        tmp_path = path.with_suffix(f".{uuid4().hex}.tmp")
+        data = json.dumps(result).encode("utf-8")
+
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                await f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        self._total += len(data) - index.pop(key, 0)
+        index[key] = len(data)
+        if self._total <= self.max_bytes:
+            return
+
+        victims = []
+        while self._total > self.max_bytes and index:
+            victim, size = index.popitem(last=False)
+            self._total -= size
+            victims.append(self._path(victim))
+        self.evictions += await asyncio.to_thread(self._remove, victims)
+
+    async def _load_index(self) -> OrderedDict[str, int]:
+        """Get the entry index, scanning the directory on first use."""
+        if self._index is None:
+            entries = await asyncio.to_thread(self._scan)
+            # A concurrent first write may have loaded it meanwhile
+            if self._index is None:
+                self._index = OrderedDict(
+                    (key, size) for _, key, size in sorted(entries)
+                )
+                self._total = sum(self._index.values())
+        return self._index
+
+    def _scan(self) -> list[tuple[float, str, int]]:
+        """List the stored entries as (mtime, key, size)."""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-5], stat.st_size))
+        return entries
+
+    @staticmethod
+    def _remove(paths: list[Path]) -> int:
+        """Delete entry files, returning how many were removed."""
+        removed = 0
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        """Get hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+vision_cache = VisionResultCache()
@@ -1,7 +1,10 @@
 """Service for Vision AI analysis using OpenAI GPT-4o."""
 
+import asyncio
 import base64
 import json
+import logging
+import weakref
 from pathlib import Path
 from uuid import UUID
 
@@ -10,6 +13,10 @@ from openai import AsyncOpenAI
 from src.core.config import settings
 from src.models.analysis import Barrier
 from src.schemas.enums import BarrierSeverity, BarrierType
+from src.services.image_processing import prepare_for_vision
+from src.services.vision_cache import VisionResultCache, vision_cache
+
+logger = logging.getLogger(__name__)
 
 
 class VisionService:
@@ -59,55 +66,96 @@ Respond ONLY with valid JSON in this format:
 
 If no barriers are found, return an empty barriers array and a high accessibility_score (90-100)."""
 
-    def __init__(self) -> None:
+    # One limit per event loop: a semaphore must not be shared across loops
+    _call_limits: weakref.WeakKeyDictionary[
+        asyncio.AbstractEventLoop, asyncio.Semaphore
+    ] = weakref.WeakKeyDictionary()
+
+    def __init__(self, cache: VisionResultCache | None = None) -> None:
         self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.cache = cache or vision_cache
+
+    @classmethod
+    def call_limit(cls) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent Vision AI calls on this loop.
+
+        Every service instance on the running loop shares it, so the bound
+        holds across analysis workers.
+        """
+        loop = asyncio.get_running_loop()
+        limit = cls._call_limits.get(loop)
+        if limit is None:
+            limit = asyncio.Semaphore(settings.vision_max_concurrency)
+            cls._call_limits[loop] = limit
+        return limit
 
     async def analyze_image(self, image_path: str, image_id: UUID) -> dict:
         """Analyze a single image for accessibility barriers."""
-        # Read and encode image
-        image_data = self._encode_image(image_path)
+        image_bytes, mime_type = await asyncio.to_thread(
+            self._prepare_image, image_path
+        )
+
+        # Identical bytes with the same prompt and model give a cached result
+        cache_key = None
+        if settings.vision_cache_enabled:
+            cache_key = self.cache.make_key(
+                image_bytes,
+                self.ANALYSIS_PROMPT,
+                settings.openai_model,
+                settings.openai_max_tokens,
+            )
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                cached["image_id"] = str(image_id)
+                return cached
+
+        image_data = base64.b64encode(image_bytes).decode("utf-8")
 
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.openai_model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": self.ANALYSIS_PROMPT},
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{image_data}",
-                                    "detail": "high",
+            async with self.call_limit():
+                response = await self.client.chat.completions.create(
+                    model=settings.openai_model,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [
+                                {"type": "text", "text": self.ANALYSIS_PROMPT},
+                                {
+                                    "type": "image_url",
+                                    "image_url": {
+                                        "url": f"data:{mime_type};base64,{image_data}",
+                                        "detail": "high",
+                                    },
                                 },
-                            },
-                        ],
-                    }
-                ],
-                max_tokens=settings.openai_max_tokens,
-                response_format={"type": "json_object"},
-            )
+                            ],
+                        }
+                    ],
+                    max_tokens=settings.openai_max_tokens,
+                    response_format={"type": "json_object"},
+                )
 
             content = response.choices[0].message.content
             if not content:
                 raise ValueError("Empty response from Vision AI")
 
             result = json.loads(content)
+            if cache_key:
+                # The result is already paid for; a failed write only loses reuse
+                try:
+                    await self.cache.set(cache_key, result)
+                except OSError:
+                    logger.warning("Could not cache vision result", exc_info=True)
             result["image_id"] = str(image_id)
             return result
 
         except json.JSONDecodeError as e:
             raise ValueError(f"Failed to parse Vision AI response: {e}")
 
-    def _encode_image(self, image_path: str) -> str:
-        """Encode image to base64."""
-        path = Path(image_path)
-        if not path.exists():
-            raise FileNotFoundError(f"Image not found: {image_path}")
-
-        with open(path, "rb") as f:
-            return base64.b64encode(f.read()).decode("utf-8")
+    def _prepare_image(self, image_path: str) -> tuple[bytes, str]:
+        """Read the downscaled payload for an image, building it if needed."""
+        payload_path, mime_type = prepare_for_vision(Path(image_path))
+        with open(payload_path, "rb") as f:
+            return f.read(), mime_type
 
     def parse_barriers(self, analysis_result: dict, image_id: UUID) -> list[Barrier]:
         """Parse analysis result into Barrier models."""
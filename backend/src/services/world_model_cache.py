@@ -0,0 +1,134 @@
+"""In-process cache of parsed world models and their API responses."""
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from src.core.config import settings
+from src.models.analysis import AnalysisResult
+from src.schemas.navigation import RecommendedPath, WorldModelResponse
+from src.services.compact_graph import CompactGraph
+from src.services.world_model_service import WorldModelService
+
+
+@dataclass
+class _Entry:
+    """Parsed world model of one analysis version."""
+
+    updated_at: datetime
+    service: WorldModelService
+    response: WorldModelResponse | None = None
+    compact: CompactGraph | None = None
+    # Derived results (edge costs, routes) keyed by the caller
+    memo: OrderedDict[Hashable, Any] = field(default_factory=OrderedDict)
+
+
+def stored_recommended_path(analysis: AnalysisResult) -> RecommendedPath | None:
+    """Get the recommended path persisted at analysis completion, if any."""
+    if not analysis.recommended_path_json:
+        return None
+    return RecommendedPath.model_validate_json(analysis.recommended_path_json)
+
+
+class WorldModelCache:
+    """LRU cache of world models keyed by analysis id and ``updated_at``.
+
+    Every write to an AnalysisResult bumps ``updated_at``, so a cached
+    entry is only served while it matches the row it was parsed from.
+    The cached graph is shared between requests and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = (
+            max_entries if max_entries is not None else settings.world_model_cache_size
+        )
+        self._entries: OrderedDict[UUID, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, analysis: AnalysisResult) -> _Entry | None:
+        """Get (or parse and store) the entry for an analysis row."""
+        if not analysis.has_world_model:
+            return None
+
+        entry = self._entries.get(analysis.id)
+        if entry is not None and entry.updated_at == analysis.updated_at:
+            self.hits += 1
+            self._entries.move_to_end(analysis.id)
+            return entry
+
+        self.misses += 1
+        service = WorldModelService()
+        compact = None
+        if analysis.world_model_blob:
+            compact = CompactGraph.from_bytes(analysis.world_model_blob)
+            service.from_compact(compact)
+        else:
+            service.from_json(analysis.world_model_json)
+        entry = _Entry(updated_at=analysis.updated_at, service=service, compact=compact)
+        self._entries[analysis.id] = entry
+        self._entries.move_to_end(analysis.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def get_service(self, analysis: AnalysisResult) -> WorldModelService | None:
+        """Get the parsed world model of an analysis, or None if it has none."""
+        entry = self._entry(analysis)
+        return entry.service if entry else None
+
+    def get_response(self, analysis: AnalysisResult) -> WorldModelResponse | None:
+        """Get the API response for an analysis' world model."""
+        entry = self._entry(analysis)
+        if entry is None:
+            return None
+        if entry.response is None:
+            entry.response = entry.service.to_response(
+                analysis.scan_id,
+                recommended_path=stored_recommended_path(analysis),
+            )
+        return entry.response
+
+    def get_compact(self, analysis: AnalysisResult) -> CompactGraph | None:
+        """Get the array-backed form of an analysis' world model."""
+        entry = self._entry(analysis)
+        if entry is None:
+            return None
+        if entry.compact is None:
+            entry.compact = entry.service.to_compact()
+        return entry.compact
+
+    def memoize(
+        self, analysis: AnalysisResult, key: Hashable, compute: Callable[[], Any]
+    ) -> Any:
+        """Get a value derived from an analysis' world model, computing it once.
+
+        Values are dropped together with the graph version they came from,
+        and each version keeps at most ``route_cache_size`` of them.
+        """
+        entry = self._entry(analysis)
+        if entry is None:
+            return compute()
+        if key in entry.memo:
+            entry.memo.move_to_end(key)
+            return entry.memo[key]
+
+        value = compute()
+        entry.memo[key] = value
+        while len(entry.memo) > settings.route_cache_size:
+            entry.memo.popitem(last=False)
+        return value
+
+    def invalidate(self, analysis_id: UUID) -> None:
+        """Drop the entry of an analysis."""
+        self._entries.pop(analysis_id, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+
+world_model_cache = WorldModelCache()
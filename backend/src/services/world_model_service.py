@@ -1,14 +1,14 @@
 """Service for building and managing the world model graph."""
 
 import json
+from array import array
 from uuid import UUID
 
 import networkx as nx
 
-from src.models.analysis import Barrier
+from src.models.analysis import AnalysisResult, Barrier
 from src.models.image import Image
 from src.schemas.enums import (
-    BarrierSeverity,
     Difficulty,
     DistanceEstimate,
     SpaceType,
@@ -16,10 +16,42 @@ from src.schemas.enums import (
 from src.schemas.navigation import (
     BarrierSummary,
     NodeFeatures,
+    RecommendedPath,
     WorldModelEdge,
     WorldModelNode,
     WorldModelResponse,
 )
+from src.services.compact_graph import DIFFICULTY_CODES, SEVERITY_CODES, CompactGraph
+
+# Traversal cost of an edge by difficulty
+DIFFICULTY_WEIGHTS = {
+    Difficulty.EASY.value: 1,
+    Difficulty.MODERATE.value: 2,
+    Difficulty.DIFFICULT.value: 4,
+    Difficulty.IMPASSABLE.value: float("inf"),
+}
+
+
+# Severity level of a barrier; it doubles as the matching difficulty's index
+SEVERITY_LEVELS = {severity.value: i for i, severity in enumerate(SEVERITY_CODES)}
+
+
+def _severity_level(barriers: list[dict]) -> int:
+    """Get the worst severity level of a node's barriers (-1 if none).
+
+    Unknown severities count as low.
+    """
+    return max(
+        (SEVERITY_LEVELS.get(b.get("severity", "low"), 0) for b in barriers),
+        default=-1,
+    )
+
+
+def _edge_weight(u: str, v: str, d: dict) -> float:
+    """Get the traversal cost of an edge from its attributes."""
+    if not d.get("traversable", True):
+        return float("inf")
+    return DIFFICULTY_WEIGHTS.get(d.get("difficulty", "moderate"), 2)
 
 
 class WorldModelService:
@@ -27,6 +59,9 @@ class WorldModelService:
 
     def __init__(self) -> None:
         self.graph: nx.DiGraph = nx.DiGraph()
+        # The graph last built by build_world_model or update_world_model,
+        # whose edges are the plain sequential chain
+        self._chain: nx.DiGraph | None = None
 
     def build_world_model(
         self,
@@ -37,101 +72,110 @@ class WorldModelService:
         self.graph = nx.DiGraph()
 
         # Create nodes for each image
-        for image in images:
-            analysis = analysis_results.get(image.id, {})
-            node_id = f"node_{image.sequence_order}"
-
-            self.graph.add_node(
-                node_id,
-                image_id=str(image.id),
-                label=f"Location {image.sequence_order + 1}",
-                space_type=analysis.get("space_type", "other"),
-                features=analysis.get("features", {}),
-                barriers=[self._barrier_to_dict(b) for b in image.barriers],
-                accessibility_score=analysis.get("accessibility_score", 50),
-            )
-
-        # Create edges between consecutive nodes
         node_ids = [f"node_{img.sequence_order}" for img in images]
-        for i in range(len(node_ids) - 1):
-            source = node_ids[i]
-            target = node_ids[i + 1]
-
-            # Calculate traversability based on barriers
-            source_data = self.graph.nodes[source]
-            target_data = self.graph.nodes[target]
-
-            difficulty = self._calculate_difficulty(
-                source_data.get("barriers", []),
-                target_data.get("barriers", []),
-            )
-
-            barrier_ids = [
-                b["id"]
-                for b in source_data.get("barriers", []) + target_data.get("barriers", [])
-                if "id" in b
-            ]
-
-            self.graph.add_edge(
-                source,
-                target,
-                traversable=difficulty != Difficulty.IMPASSABLE,
-                difficulty=difficulty.value,
-                barriers_in_path=barrier_ids,
-                distance_estimate=DistanceEstimate.SHORT.value,
-                notes=None,
-            )
+        self.graph.add_nodes_from(
+            (node_id, self._node_attributes(image, analysis_results.get(image.id, {})))
+            for node_id, image in zip(node_ids, images)
+        )
 
-            # Add reverse edge for bidirectional navigation
-            self.graph.add_edge(
-                target,
-                source,
-                traversable=difficulty != Difficulty.IMPASSABLE,
-                difficulty=difficulty.value,
-                barriers_in_path=barrier_ids,
-                distance_estimate=DistanceEstimate.SHORT.value,
-                notes=None,
-            )
+        # Create edges between consecutive nodes
+        self.graph.add_edges_from(self._chain_edges(self.graph, node_ids))
 
+        self._chain = self.graph
         return self.graph
 
-    def _calculate_difficulty(
-        self, source_barriers: list[dict], target_barriers: list[dict]
-    ) -> Difficulty:
-        """Calculate traversal difficulty based on barriers."""
-        all_barriers = source_barriers + target_barriers
-
-        if not all_barriers:
-            return Difficulty.EASY
+    def update_world_model(
+        self,
+        images: list[Image],
+        analysis_results: dict[UUID, dict],
+    ) -> nx.DiGraph:
+        """Patch the loaded graph after images were added, removed or reordered.
+
+        ``analysis_results`` holds only the images analyzed in this run;
+        their nodes are rebuilt. Other images keep their node attributes
+        and move to their new position, and edges are only recomputed
+        between newly adjacent nodes or next to a rebuilt one. The result
+        is the graph ``build_world_model`` would produce.
+        """
+        previous = {
+            data["image_id"]: data for _, data in self.graph.nodes(data=True)
+        }
+        position = {image_id: i for i, image_id in enumerate(previous)}
+        # Edges keyed by the image ids of their endpoints
+        previous_edges = {
+            (self.graph.nodes[u]["image_id"], self.graph.nodes[v]["image_id"]): data
+            for u, v, data in self.graph.edges(data=True)
+        }
 
-        max_severity = BarrierSeverity.LOW
-        for barrier in all_barriers:
-            severity_str = barrier.get("severity", "low")
-            try:
-                severity = BarrierSeverity(severity_str)
-                if self._severity_rank(severity) > self._severity_rank(max_severity):
-                    max_severity = severity
-            except ValueError:
-                pass
+        graph = nx.DiGraph()
+        rebuilt: set[str] = set()
+        for image in images:
+            key = str(image.id)
+            if image.id in analysis_results or key not in previous:
+                attributes = self._node_attributes(
+                    image, analysis_results.get(image.id, {})
+                )
+                rebuilt.add(key)
+            else:
+                attributes = previous[key]
+                attributes["label"] = f"Location {image.sequence_order + 1}"
+            graph.add_node(f"node_{image.sequence_order}", **attributes)
+
+        for first, second in zip(images, images[1:]):
+            source = f"node_{first.sequence_order}"
+            target = f"node_{second.sequence_order}"
+            pair = (str(first.id), str(second.id))
+            if (
+                rebuilt.isdisjoint(pair)
+                and pair in previous_edges
+                and position[pair[0]] < position[pair[1]]
+            ):
+                graph.add_edge(source, target, **previous_edges[pair])
+                graph.add_edge(target, source, **previous_edges[pair[::-1]])
+            else:
+                graph.add_edges_from(self._chain_edges(graph, [source, target]))
+
+        self.graph = self._chain = graph
+        return self.graph
 
-        severity_to_difficulty = {
-            BarrierSeverity.LOW: Difficulty.EASY,
-            BarrierSeverity.MEDIUM: Difficulty.MODERATE,
-            BarrierSeverity.HIGH: Difficulty.DIFFICULT,
-            BarrierSeverity.CRITICAL: Difficulty.IMPASSABLE,
+    def _node_attributes(self, image: Image, analysis: dict) -> dict:
+        """Get the node attributes of an analyzed image."""
+        return {
+            "image_id": str(image.id),
+            "label": f"Location {image.sequence_order + 1}",
+            "space_type": analysis.get("space_type", "other"),
+            "features": analysis.get("features", {}),
+            "barriers": [self._barrier_to_dict(b) for b in image.barriers],
+            "accessibility_score": analysis.get("accessibility_score", 50),
         }
 
-        return severity_to_difficulty.get(max_severity, Difficulty.MODERATE)
+    def _chain_edges(
+        self, graph: nx.DiGraph, node_ids: list[str]
+    ) -> list[tuple[str, str, dict]]:
+        """Get the edges linking consecutive nodes of a chain, both directions.
 
-    def _severity_rank(self, severity: BarrierSeverity) -> int:
-        """Get numeric rank for severity comparison."""
-        ranks = {
-            BarrierSeverity.LOW: 1,
-            BarrierSeverity.MEDIUM: 2,
-            BarrierSeverity.HIGH: 3,
-            BarrierSeverity.CRITICAL: 4,
-        }
-        return ranks.get(severity, 0)
+        Each node's severity level and barrier ids are computed once; an
+        edge's difficulty is the pairwise max of its endpoints' levels.
+        """
+        barriers = [graph.nodes[node_id].get("barriers", []) for node_id in node_ids]
+        levels = array("b", map(_severity_level, barriers))
+        barrier_ids = [[b["id"] for b in node if "id" in b] for node in barriers]
+
+        edges = []
+        for i, level in enumerate(map(max, levels[:-1], levels[1:])):
+            # No barriers (-1) is as easy as low severity
+            difficulty = DIFFICULTY_CODES[max(level, 0)]
+            attributes = {
+                "traversable": difficulty != Difficulty.IMPASSABLE,
+                "difficulty": difficulty.value,
+                "barriers_in_path": barrier_ids[i] + barrier_ids[i + 1],
+                "distance_estimate": DistanceEstimate.SHORT.value,
+                "notes": None,
+            }
+            # Add reverse edge for bidirectional navigation
+            edges.append((node_ids[i], node_ids[i + 1], attributes))
+            edges.append((node_ids[i + 1], node_ids[i], attributes))
+        return edges
 
     def _barrier_to_dict(self, barrier: Barrier) -> dict:
         """Convert Barrier model to dictionary."""
@@ -141,6 +185,9 @@ class WorldModelService:
             "severity": barrier.severity.value,
             "description": barrier.description,
             "recommendation": barrier.recommendation,
+            "estimated_width_cm": barrier.estimated_width_cm,
+            "estimated_height_cm": barrier.estimated_height_cm,
+            "estimated_depth_cm": barrier.estimated_depth_cm,
         }
 
     def find_recommended_path(
@@ -155,25 +202,70 @@ class WorldModelService:
         end = end_node or nodes[-1]
 
         try:
-            # Use accessibility score as weight (inverted - lower score = higher weight)
-            def weight_func(u: str, v: str, d: dict) -> float:
-                if not d.get("traversable", True):
-                    return float("inf")
-
-                difficulty_weights = {
-                    "easy": 1,
-                    "moderate": 2,
-                    "difficult": 4,
-                    "impassable": float("inf"),
-                }
-                return difficulty_weights.get(d.get("difficulty", "moderate"), 2)
-
-            path = nx.dijkstra_path(self.graph, start, end, weight=weight_func)
+            path = nx.dijkstra_path(self.graph, start, end, weight=_edge_weight)
             return path
         except (nx.NetworkXNoPath, nx.NodeNotFound):
             # Return sequential path if no weighted path found
             return nodes
 
+    def compute_recommended_path(self) -> RecommendedPath | None:
+        """Find the recommended path with its total cost and edge difficulties.
+
+        ``total_cost`` is None when the path crosses an edge that cannot be
+        traversed (the sequential fallback).
+        """
+        path = self.find_recommended_path()
+        if path is None:
+            return None
+
+        total_cost = 0.0
+        difficulties = []
+        for source, target in zip(path, path[1:]):
+            data = self.graph.get_edge_data(source, target)
+            if data is None:
+                total_cost = float("inf")
+                difficulties.append(Difficulty.IMPASSABLE)
+                continue
+            total_cost += _edge_weight(source, target, data)
+            difficulties.append(Difficulty(data.get("difficulty", "moderate")))
+
+        return RecommendedPath(
+            nodes=path,
+            total_cost=total_cost if total_cost != float("inf") else None,
+            edge_difficulties=difficulties,
+        )
+
+    def to_compact(self) -> CompactGraph:
+        """Convert the graph to its compact array-backed form.
+
+        Chains this service built are encoded from their nodes alone,
+        without walking the networkx edges.
+        """
+        if self.graph is self._chain:
+            node_ids = list(self.graph.nodes)
+            nodes = [self.graph.nodes[node_id] for node_id in node_ids]
+            return CompactGraph.from_chain(node_ids, nodes)
+        return CompactGraph.from_networkx(self.graph)
+
+    def from_compact(self, compact: CompactGraph) -> nx.DiGraph:
+        """Load the graph from its compact array-backed form."""
+        self.graph = compact.to_networkx()
+        return self.graph
+
+    def to_bytes(self) -> bytes:
+        """Serialize the graph to the versioned compact binary format."""
+        return self.to_compact().to_bytes()
+
+    def from_bytes(self, data: bytes) -> nx.DiGraph:
+        """Deserialize a graph written by ``to_bytes``."""
+        return self.from_compact(CompactGraph.from_bytes(data))
+
+    def load(self, analysis: AnalysisResult) -> nx.DiGraph:
+        """Load the graph stored on an analysis, binary or legacy JSON."""
+        if analysis.world_model_blob:
+            return self.from_bytes(analysis.world_model_blob)
+        return self.from_json(analysis.world_model_json)
+
     def to_json(self) -> str:
         """Serialize graph to JSON."""
         data = nx.node_link_data(self.graph)
@@ -185,8 +277,16 @@ class WorldModelService:
         self.graph = nx.node_link_graph(data)
         return self.graph
 
-    def to_response(self, scan_id: UUID, base_url: str = "") -> WorldModelResponse:
-        """Convert graph to API response schema."""
+    def to_response(
+        self,
+        scan_id: UUID,
+        base_url: str = "",
+        recommended_path: RecommendedPath | None = None,
+    ) -> WorldModelResponse:
+        """Convert graph to API response schema.
+
+        The recommended path is computed unless a stored one is passed in.
+        """
         nodes = []
         for node_id, data in self.graph.nodes(data=True):
             barriers = [
@@ -244,11 +344,18 @@ class WorldModelService:
             )
             edges.append(edge)
 
-        recommended_path = self.find_recommended_path()
+        if recommended_path is None:
+            recommended_path = self.compute_recommended_path()
 
         return WorldModelResponse(
             scan_id=scan_id,
             nodes=nodes,
             edges=edges,
-            recommended_path=recommended_path,
+            recommended_path=recommended_path.nodes if recommended_path else None,
+            recommended_path_cost=(
+                recommended_path.total_cost if recommended_path else None
+            ),
+            recommended_path_difficulties=(
+                recommended_path.edge_difficulties if recommended_path else None
+            ),
         )
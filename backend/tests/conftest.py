@@ -8,6 +8,7 @@ import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
@@ -61,6 +62,19 @@ async def async_session(async_engine) -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@pytest.fixture(scope="function")
+def statement_counter(async_engine) -> Generator[list[str], None, None]:
+    """Record the SQL statements executed on the test engine."""
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
 @pytest_asyncio.fixture(scope="function")
 async def client(async_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """Create test client with overridden dependencies."""
@@ -0,0 +1,251 @@
+"""Integration tests for Analysis API."""
+
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.config import settings
+from src.models.analysis import AnalysisResult, Barrier
+from src.models.image import Image
+from src.models.scan import Scan
+from src.schemas.analysis import AnalysisEvent
+from src.schemas.enums import (
+    AnalysisEventType,
+    AnalysisStatus,
+    BarrierSeverity,
+    BarrierType,
+)
+from src.services.analysis_events import analysis_events
+
+
+async def _scan_with_barriers(session) -> Scan:
+    """Create a scan with two images and five barriers."""
+    scan = Scan(name="Barriers")
+    session.add(scan)
+    await session.flush()
+    images = []
+    for order in range(2):
+        image = Image(
+            scan_id=scan.id,
+            filename=f"{order}.jpg",
+            original_filename=f"{order}.jpg",
+            file_path=f"/tmp/{order}.jpg",
+            file_size=100,
+            mime_type="image/jpeg",
+            sequence_order=order,
+        )
+        session.add(image)
+        images.append(image)
+    await session.flush()
+
+    specs = [
+        (1, BarrierType.STEP, BarrierSeverity.LOW, 0.9),
+        (0, BarrierType.STAIRS, BarrierSeverity.CRITICAL, 0.4),
+        (0, BarrierType.STEP, BarrierSeverity.HIGH, 0.8),
+        (1, BarrierType.OBSTACLE, BarrierSeverity.MEDIUM, 0.6),
+        (1, BarrierType.STEP, BarrierSeverity.HIGH, 0.7),
+    ]
+    for order, barrier_type, severity, confidence in specs:
+        session.add(
+            Barrier(
+                image_id=images[order].id,
+                barrier_type=barrier_type,
+                severity=severity,
+                description="Barrier",
+                confidence=confidence,
+            )
+        )
+    await session.commit()
+    return scan
+
+
+async def _all_pages(client: AsyncClient, url: str, **params) -> list[dict]:
+    """Follow next_cursor until the listing is exhausted."""
+    items: list[dict] = []
+    cursor = None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(url, params=query)
+        assert response.status_code == 200
+        page = response.json()
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+@pytest.mark.asyncio
+class TestBarriersAPI:
+    """Integration tests for the barrier listing endpoint."""
+
+    async def test_pages_cover_all_barriers_in_order(
+        self, client: AsyncClient, async_session
+    ):
+        """Test keyset pages return every barrier once, sorted."""
+        scan = await _scan_with_barriers(async_session)
+        url = f"/api/scans/{scan.id}/analysis/barriers"
+
+        by_severity = await _all_pages(client, url, sort="severity", limit=2)
+        by_confidence = await _all_pages(client, url, sort="confidence", limit=2)
+
+        assert [b["severity"] for b in by_severity] == [
+            "critical",
+            "high",
+            "high",
+            "medium",
+            "low",
+        ]
+        assert [b["confidence"] for b in by_confidence] == [0.9, 0.8, 0.7, 0.6, 0.4]
+        assert len({b["id"] for b in by_severity}) == 5
+
+    async def test_filters(self, client: AsyncClient, async_session):
+        """Test severity, type and min_confidence filters are applied."""
+        scan = await _scan_with_barriers(async_session)
+        url = f"/api/scans/{scan.id}/analysis/barriers"
+
+        steps = await _all_pages(client, url, type="step", min_confidence=0.75)
+        high = await _all_pages(client, url, severity="high")
+
+        assert [b["confidence"] for b in steps] == [0.8, 0.9]
+        assert len(high) == 2
+
+    async def test_cursor_must_match_sort(self, client: AsyncClient, async_session):
+        """Test a cursor issued for one sort order is rejected for another."""
+        scan = await _scan_with_barriers(async_session)
+        url = f"/api/scans/{scan.id}/analysis/barriers"
+
+        page = (await client.get(url, params={"sort": "severity", "limit": 1})).json()
+        response = await client.get(
+            url, params={"sort": "confidence", "cursor": page["next_cursor"]}
+        )
+        garbage = await client.get(url, params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+        assert garbage.status_code == 400
+
+
+@pytest.mark.asyncio
+class TestAnalysisEventsAPI:
+    """Tests for streaming analysis progress."""
+
+    async def test_stream_until_summary(self, client: AsyncClient, async_session):
+        """Test a running analysis streams published events as SSE."""
+        scan = Scan(name="Streaming")
+        async_session.add(scan)
+        await async_session.flush()
+        async_session.add(
+            AnalysisResult(scan_id=scan.id, status=AnalysisStatus.IN_PROGRESS)
+        )
+        await async_session.commit()
+
+        request = asyncio.create_task(
+            client.get(
+                f"/api/scans/{scan.id}/analysis/events",
+                headers={"accept": "text/event-stream"},
+            )
+        )
+        while scan.id not in analysis_events._subscribers:
+            await asyncio.sleep(0.001)
+        image_id = uuid4()
+        analysis_events.publish(
+            AnalysisEvent(
+                event=AnalysisEventType.DONE,
+                scan_id=scan.id,
+                image_id=image_id,
+                sequence_order=0,
+                barrier_count=2,
+            )
+        )
+        analysis_events.publish(
+            AnalysisEvent(
+                event=AnalysisEventType.SUMMARY,
+                scan_id=scan.id,
+                status=AnalysisStatus.COMPLETED,
+            )
+        )
+        response = await request
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        messages = response.text.strip().split("\n\n")
+        assert [m.splitlines()[0] for m in messages] == [
+            "event: done",
+            "event: summary",
+        ]
+        done = json.loads(messages[0].splitlines()[1].removeprefix("data: "))
+        assert done["image_id"] == str(image_id)
+        assert done["barrier_count"] == 2
+        assert scan.id not in analysis_events._subscribers
+
+    async def test_idle_stream_sends_pings(
+        self, client: AsyncClient, async_session, monkeypatch
+    ):
+        """Test an idle stream pings and disables proxy buffering."""
+        monkeypatch.setattr(settings, "analysis_event_keepalive_seconds", 0.01)
+        scan = Scan(name="Idle")
+        async_session.add(scan)
+        await async_session.flush()
+        async_session.add(
+            AnalysisResult(scan_id=scan.id, status=AnalysisStatus.PENDING)
+        )
+        await async_session.commit()
+
+        sse = asyncio.create_task(
+            client.get(
+                f"/api/scans/{scan.id}/analysis/events",
+                headers={"accept": "text/event-stream"},
+            )
+        )
+        ndjson = asyncio.create_task(
+            client.get(f"/api/scans/{scan.id}/analysis/events")
+        )
+        while len(analysis_events._subscribers.get(scan.id, ())) < 2:
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.05)
+        analysis_events.publish(
+            AnalysisEvent(
+                event=AnalysisEventType.SUMMARY,
+                scan_id=scan.id,
+                status=AnalysisStatus.FAILED,
+            )
+        )
+        sse_response, ndjson_response = await sse, await ndjson
+
+        assert sse_response.headers["x-accel-buffering"] == "no"
+        messages = sse_response.text.strip().split("\n\n")
+        assert messages[0] == ": ping"
+        assert messages[-1].startswith("event: summary")
+        lines = [json.loads(line) for line in ndjson_response.text.splitlines()]
+        assert lines[0]["event"] == "ping"
+        assert lines[-1]["event"] == "summary"
+
+    async def test_finished_analysis_streams_summary(
+        self, client: AsyncClient, async_session
+    ):
+        """Test a finished analysis returns its summary as NDJSON at once."""
+        scan = Scan(name="Finished")
+        async_session.add(scan)
+        await async_session.flush()
+        async_session.add(
+            AnalysisResult(
+                scan_id=scan.id,
+                status=AnalysisStatus.COMPLETED,
+                total_images_analyzed=3,
+                total_barriers_found=4,
+                accessibility_score=70,
+            )
+        )
+        await async_session.commit()
+
+        response = await client.get(f"/api/scans/{scan.id}/analysis/events")
+        missing = await client.get(f"/api/scans/{uuid4()}/analysis/events")
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 1
+        assert lines[0]["event"] == "summary"
+        assert lines[0]["status"] == "completed"
+        assert lines[0]["total_barriers_found"] == 4
+        assert missing.status_code == 404
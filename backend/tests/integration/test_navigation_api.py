@@ -0,0 +1,294 @@
+"""Integration tests for Navigation API."""
+
+import json
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+
+from src.models.analysis import AnalysisResult, Barrier
+from src.models.guide import Guide, GuideStep, WheelchairProfile
+from src.models.image import Image
+from src.models.scan import Scan
+from src.schemas.enums import AnalysisStatus, BarrierSeverity, BarrierType
+from src.services.guide_cache import guide_response_cache
+from src.services.world_model_service import WorldModelService
+
+
+async def _scan_with_guide(session) -> tuple[Scan, AnalysisResult]:
+    """Create a scan with a completed analysis and a one-step guide."""
+    scan = Scan(name="Guided")
+    profile = WheelchairProfile(
+        name="Manual", width_cm=60, length_cm=100, min_door_width_cm=80
+    )
+    session.add_all([scan, profile])
+    await session.flush()
+
+    analysis = AnalysisResult(
+        scan_id=scan.id, status=AnalysisStatus.COMPLETED, accessibility_score=70
+    )
+    step = {
+        "step_number": 1,
+        "image_id": str(uuid4()),
+        "image_url": "/api/scans/x/images/y/file",
+        "title": "Entrance",
+        "description": "Main door",
+        "barriers": [],
+        "alerts": [],
+        "recommendations": [],
+        "accessibility_rating": "accessible",
+    }
+    guide = Guide(
+        scan_id=scan.id,
+        wheelchair_profile_id=profile.id,
+        title="Guide",
+        summary="Summary",
+        step_count=1,
+        alerts_json="[]",
+    )
+    session.add_all([analysis, guide])
+    await session.flush()
+    session.add(GuideStep(guide_id=guide.id, step_number=1, step_json=json.dumps(step)))
+    await session.commit()
+    return scan, analysis
+
+
+async def _analyzed_scan_with_door(
+    session, width_cm: float, image_count: int = 1
+) -> Scan:
+    """Create an analyzed scan whose first image has a narrow door."""
+    scan = Scan(name="Door")
+    session.add(scan)
+    await session.flush()
+
+    images = [
+        Image(
+            scan_id=scan.id,
+            filename=f"{order}.jpg",
+            original_filename=f"{order}.jpg",
+            file_path=f"/data/{order}.jpg",
+            file_size=1000,
+            mime_type="image/jpeg",
+            sequence_order=order,
+        )
+        for order in range(image_count)
+    ]
+    session.add_all(images)
+    await session.flush()
+    session.add_all(
+        [
+            Barrier(
+                image_id=images[0].id,
+                barrier_type=BarrierType.NARROW_DOOR,
+                severity=BarrierSeverity.MEDIUM,
+                description="Narrow door",
+                estimated_width_cm=width_cm,
+            ),
+            AnalysisResult(
+                scan_id=scan.id,
+                status=AnalysisStatus.COMPLETED,
+                accessibility_score=60,
+            ),
+        ]
+    )
+    await session.commit()
+    return scan
+
+
+@pytest.mark.asyncio
+class TestGuideAPI:
+    """Tests for reading guides."""
+
+    async def test_get_guide_single_query_and_cached_body(
+        self, client: AsyncClient, async_session, statement_counter
+    ):
+        """Test steps are only read on a miss and re-rendered on score changes."""
+        guide_response_cache.clear()
+        scan, analysis = await _scan_with_guide(async_session)
+        statement_counter.clear()
+
+        first = await client.get(f"/api/scans/{scan.id}/guide")
+        second = await client.get(f"/api/scans/{scan.id}/guide")
+
+        assert first.status_code == 200
+        assert first.content == second.content
+        assert [s.split()[0] for s in statement_counter] == ["SELECT"] * 3
+        body = first.json()
+        assert body["accessibility_score"] == 70
+        assert body["wheelchair_profile"]["name"] == "Manual"
+        assert body["navigation_steps"][0]["title"] == "Entrance"
+        assert (guide_response_cache.hits, guide_response_cache.misses) == (1, 1)
+
+        analysis.accessibility_score = 55
+        await async_session.commit()
+        third = await client.get(f"/api/scans/{scan.id}/guide")
+
+        assert third.json()["accessibility_score"] == 55
+
+    async def test_get_missing_guide(self, client: AsyncClient):
+        """Test scans without a guide return 404."""
+        response = await client.get(f"/api/scans/{uuid4()}/guide")
+
+        assert response.status_code == 404
+
+    async def test_generate_guides_for_every_profile(
+        self, client: AsyncClient, async_session, statement_counter
+    ):
+        """Test one POST stores a guide per profile that GETs select."""
+        guide_response_cache.clear()
+        scan = await _analyzed_scan_with_door(async_session, 72)
+        profiles = (await client.get("/api/wheelchair-profiles")).json()
+        by_name = {p["name"]: p["id"] for p in profiles}
+
+        response = await client.post(f"/api/scans/{scan.id}/guide")
+
+        assert response.status_code == 201
+        assert response.json()["wheelchair_profile"]["is_default"] is True
+        guides = (
+            await async_session.execute(select(Guide).where(Guide.scan_id == scan.id))
+        ).scalars().all()
+        assert len(guides) == len(profiles) == 5
+
+        statement_counter.clear()
+        electric = await client.get(
+            f"/api/scans/{scan.id}/guide",
+            params={"wheelchair_profile_id": by_name["Eléctrica Estándar"]},
+        )
+        sport = await client.get(
+            f"/api/scans/{scan.id}/guide",
+            params={"wheelchair_profile_id": by_name["Deportiva"]},
+        )
+
+        # Each guide and its steps, without regenerating anything
+        assert [s.split()[0] for s in statement_counter] == ["SELECT"] * 4
+        assert electric.json()["navigation_steps"][0]["alerts"] == [
+            "Puerta de 72.0cm - su silla necesita 80.0cm"
+        ]
+        assert sport.json()["navigation_steps"][0]["alerts"] == []
+        assert sport.json()["wheelchair_profile"]["name"] == "Deportiva"
+
+        # Regenerating replaces the guides instead of adding more
+        await client.post(f"/api/scans/{scan.id}/guide")
+        guides = (
+            await async_session.execute(select(Guide).where(Guide.scan_id == scan.id))
+        ).scalars().all()
+        assert len(guides) == 5
+
+    async def test_generate_guide_unknown_profile(
+        self, client: AsyncClient, async_session
+    ):
+        """Test requesting an unknown profile returns 404 and stores nothing."""
+        scan = await _analyzed_scan_with_door(async_session, 72)
+
+        response = await client.post(
+            f"/api/scans/{scan.id}/guide",
+            json={"wheelchair_profile_id": str(uuid4())},
+        )
+
+        assert response.status_code == 404
+        guides = await async_session.execute(
+            select(Guide.id).where(Guide.scan_id == scan.id)
+        )
+        assert guides.all() == []
+
+    async def test_delete_profile_removes_its_guides(
+        self, client: AsyncClient, async_session
+    ):
+        """Test deleting a custom profile deletes the guides generated for it."""
+        scan, _ = await _scan_with_guide(async_session)
+        guide = (
+            await async_session.execute(select(Guide).where(Guide.scan_id == scan.id))
+        ).scalar_one()
+
+        response = await client.delete(
+            f"/api/wheelchair-profiles/{guide.wheelchair_profile_id}"
+        )
+
+        assert response.status_code == 204
+        guides = await async_session.execute(
+            select(Guide.id).where(Guide.scan_id == scan.id)
+        )
+        steps = await async_session.execute(
+            select(GuideStep.step_number).where(GuideStep.guide_id == guide.id)
+        )
+        assert guides.all() == []
+        assert steps.all() == []
+
+    async def test_guide_header_and_step_ranges(
+        self, client: AsyncClient, async_session
+    ):
+        """Test reading a guide's header and its steps one range at a time."""
+        scan = await _analyzed_scan_with_door(async_session, 72, image_count=5)
+        await client.post(f"/api/scans/{scan.id}/guide")
+
+        header = await client.get(f"/api/scans/{scan.id}/guide/header")
+        first = await client.get(
+            f"/api/scans/{scan.id}/guide/steps", params={"from": 1, "limit": 2}
+        )
+        last = await client.get(
+            f"/api/scans/{scan.id}/guide/steps", params={"from": 5, "limit": 2}
+        )
+        past_end = await client.get(
+            f"/api/scans/{scan.id}/guide/steps", params={"from": 9}
+        )
+        missing = await client.get(f"/api/scans/{uuid4()}/guide/steps")
+
+        assert header.status_code == 200
+        assert header.json()["step_count"] == 5
+        assert "navigation_steps" not in header.json()
+        assert [s["step_number"] for s in first.json()["items"]] == [1, 2]
+        assert first.json()["items"][0]["alerts"] == [
+            "Puerta de 72.0cm - su silla necesita 75.0cm"
+        ]
+        assert first.json()["next_from"] == 3
+        assert [s["step_number"] for s in last.json()["items"]] == [5]
+        assert last.json()["next_from"] is None
+        assert past_end.json()["items"] == []
+        assert missing.status_code == 404
+
+    async def test_deleted_image_flags_guide_and_world_model_outdated(
+        self, client: AsyncClient, async_session
+    ):
+        """Test results built before an image was deleted are flagged outdated."""
+        guide_response_cache.clear()
+        scan = await _analyzed_scan_with_door(async_session, 72, image_count=2)
+        result = await async_session.execute(
+            select(Image)
+            .where(Image.scan_id == scan.id)
+            .options(selectinload(Image.barriers))
+            .order_by(Image.sequence_order)
+        )
+        images = list(result.scalars().all())
+        service = WorldModelService()
+        service.build_world_model(images, {})
+        analysis = (
+            await async_session.execute(
+                select(AnalysisResult).where(AnalysisResult.scan_id == scan.id)
+            )
+        ).scalar_one()
+        analysis.world_model_blob = service.to_compact().to_bytes()
+        await async_session.commit()
+        await client.post(f"/api/scans/{scan.id}/guide")
+        route_params = {"from": "node_0", "to": "node_1"}
+
+        before = await client.get(f"/api/scans/{scan.id}/guide")
+        assert before.json()["outdated"] is False
+        world_model = await client.get(f"/api/scans/{scan.id}/world-model")
+        assert world_model.json()["outdated"] is False
+
+        deleted = await client.delete(f"/api/scans/{scan.id}/images/{images[1].id}")
+        assert deleted.status_code == 204
+
+        guide = await client.get(f"/api/scans/{scan.id}/guide")
+        header = await client.get(f"/api/scans/{scan.id}/guide/header")
+        world_model = await client.get(f"/api/scans/{scan.id}/world-model")
+        route = await client.get(f"/api/scans/{scan.id}/route", params=route_params)
+
+        assert guide.json()["outdated"] is True
+        assert header.json()["outdated"] is True
+        assert world_model.json()["outdated"] is True
+        assert world_model.json()["partial"] is False
+        assert route.json()["outdated"] is True
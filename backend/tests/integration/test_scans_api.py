@@ -1,9 +1,22 @@
 """Integration tests for Scans API."""
 
+import io
+from uuid import UUID
+
 import pytest
 from httpx import AsyncClient
+from PIL import Image as PILImage
+
+from src.core.config import settings
+from src.models.analysis import AnalysisResult
+from src.schemas.enums import AnalysisStatus, ScanStatus
 
-from src.schemas.enums import ScanStatus
+
+def _jpeg_bytes(size: tuple[int, int]) -> bytes:
+    """Encode a blank JPEG of the given size."""
+    buffer = io.BytesIO()
+    PILImage.new("RGB", size).save(buffer, format="JPEG")
+    return buffer.getvalue()
 
 
 @pytest.mark.asyncio
@@ -169,3 +182,109 @@ class TestScansAPI:
         )
 
         assert response.status_code == 404
+
+    async def test_get_image_file_conditional_and_range(
+        self, client: AsyncClient, tmp_path, monkeypatch
+    ):
+        """Test the file endpoint serves validators, 304s and byte ranges."""
+        monkeypatch.setattr(settings, "upload_dir", tmp_path)
+        create_response = await client.post("/api/scans", json={"name": "Files"})
+        scan_id = create_response.json()["id"]
+        content = _jpeg_bytes((40, 30))
+        upload = await client.post(
+            f"/api/scans/{scan_id}/images",
+            files=[("files", ("photo.jpg", content, "image/jpeg"))],
+        )
+        url = upload.json()["images"][0]["url"]
+
+        full = await client.get(url)
+        etag = full.headers["etag"]
+        not_modified = await client.get(url, headers={"If-None-Match": etag})
+        partial = await client.get(url, headers={"Range": "bytes=0-9"})
+        suffix = await client.get(url, headers={"Range": "bytes=-4"})
+        stale_range = await client.get(
+            url, headers={"Range": "bytes=0-9", "If-Range": '"other"'}
+        )
+        unsatisfiable = await client.get(url, headers={"Range": "bytes=99999-"})
+
+        assert full.status_code == 200
+        assert full.content == content
+        assert full.headers["accept-ranges"] == "bytes"
+        assert "last-modified" in full.headers
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert partial.status_code == 206
+        assert partial.content == content[:10]
+        assert partial.headers["content-range"] == f"bytes 0-9/{len(content)}"
+        assert suffix.content == content[-4:]
+        assert stale_range.status_code == 200
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers["content-range"] == f"bytes */{len(content)}"
+
+    async def test_get_image_file_wrong_scan(self, client: AsyncClient):
+        """Test an image is not served under another scan's URL."""
+        scan_id = (await client.post("/api/scans", json={"name": "A"})).json()["id"]
+
+        response = await client.get(
+            f"/api/scans/{scan_id}/images/00000000-0000-0000-0000-000000000000/file"
+        )
+
+        assert response.status_code == 404
+
+    async def test_get_image_file_size_variants(
+        self, client: AsyncClient, tmp_path, monkeypatch
+    ):
+        """Test the size parameter serves a smaller JPEG with its own ETag."""
+        monkeypatch.setattr(settings, "upload_dir", tmp_path)
+        scan_id = (await client.post("/api/scans", json={"name": "V"})).json()["id"]
+        upload = await client.post(
+            f"/api/scans/{scan_id}/images",
+            files=[("files", ("big.jpg", _jpeg_bytes((1600, 1200)), "image/jpeg"))],
+        )
+        image = upload.json()["images"][0]
+
+        original = await client.get(image["urls"]["original"])
+        thumbnail = await client.get(image["urls"]["thumbnail"])
+
+        assert thumbnail.status_code == 200
+        assert thumbnail.headers["content-type"] == "image/jpeg"
+        assert len(thumbnail.content) < len(original.content)
+        assert thumbnail.headers["etag"] != original.headers["etag"]
+        with PILImage.open(io.BytesIO(thumbnail.content)) as img:
+            assert max(img.size) == settings.image_thumbnail_edge
+
+    async def test_image_changes_rejected_while_analyzing(
+        self, client: AsyncClient, async_session, tmp_path, monkeypatch
+    ):
+        """Test upload, delete and reorder conflict with a running analysis."""
+        monkeypatch.setattr(settings, "upload_dir", tmp_path)
+        scan_id = (await client.post("/api/scans", json={"name": "R"})).json()["id"]
+        upload = await client.post(
+            f"/api/scans/{scan_id}/images",
+            files=[("files", ("a.jpg", _jpeg_bytes((40, 30)), "image/jpeg"))],
+        )
+        image_id = upload.json()["images"][0]["id"]
+        analysis = AnalysisResult(
+            scan_id=UUID(scan_id), status=AnalysisStatus.IN_PROGRESS
+        )
+        async_session.add(analysis)
+        await async_session.commit()
+
+        uploaded = await client.post(
+            f"/api/scans/{scan_id}/images",
+            files=[("files", ("b.jpg", _jpeg_bytes((40, 30)), "image/jpeg"))],
+        )
+        deleted = await client.delete(f"/api/scans/{scan_id}/images/{image_id}")
+        reordered = await client.post(
+            f"/api/scans/{scan_id}/images/reorder", json=[image_id]
+        )
+
+        assert uploaded.status_code == 409
+        assert deleted.status_code == 409
+        assert reordered.status_code == 409
+
+        analysis.status = AnalysisStatus.COMPLETED
+        await async_session.commit()
+        deleted = await client.delete(f"/api/scans/{scan_id}/images/{image_id}")
+
+        assert deleted.status_code == 204
@@ -0,0 +1,516 @@
+"""Tests for AnalysisQueue and AnalysisService."""
+
+import asyncio
+import io
+import json
+from uuid import UUID
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.datastructures import Headers, UploadFile
+
+from src.core.config import settings
+from src.models.analysis import AnalysisResult, Barrier
+from src.models.image import Image
+from src.models.job import AnalysisJob
+from src.models.scan import Scan
+from src.schemas.enums import AnalysisEventType, AnalysisStatus, JobStatus, ScanStatus
+from src.services.analysis_events import analysis_events
+from src.services.analysis_queue import AnalysisQueue
+from src.services.analysis_service import AnalysisService
+from src.services.scan_service import ScanService
+from src.services.vision_service import VisionService
+from src.services.world_model_service import WorldModelService
+
+
+class FakeVisionService(VisionService):
+    """Vision service returning canned results without calling OpenAI."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.calls: list[UUID] = []
+
+    async def analyze_image(self, image_path: str, image_id: UUID) -> dict:
+        self.calls.append(image_id)
+        if self.fail:
+            raise RuntimeError("vision unavailable")
+        return {
+            "space_type": "corridor",
+            "barriers": [
+                {"barrier_type": "step", "severity": "high", "description": "Step"}
+            ],
+            "accessibility_score": 60,
+            "image_id": str(image_id),
+        }
+
+
+@pytest.fixture
+def session_factory(async_engine) -> sessionmaker:
+    """Session factory bound to the test engine."""
+    return sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _create_scan(session_factory: sessionmaker, image_count: int = 2) -> UUID:
+    """Create a scan with images and queue an analysis job for it."""
+    async with session_factory() as session:
+        scan = Scan(name="Queued scan", status=ScanStatus.READY)
+        session.add(scan)
+        await session.flush()
+        for i in range(image_count):
+            session.add(
+                Image(
+                    scan_id=scan.id,
+                    filename=f"img_{i}.jpg",
+                    original_filename=f"img_{i}.jpg",
+                    file_path=f"/tmp/img_{i}.jpg",
+                    file_size=1000,
+                    mime_type="image/jpeg",
+                    sequence_order=i,
+                )
+            )
+        await session.flush()
+
+        await AnalysisService(session).queue_analysis(scan, None)
+        await session.commit()
+        return scan.id
+
+
+@pytest.mark.asyncio
+class TestAnalysisQueue:
+    """Tests for the background analysis queue."""
+
+    async def test_queue_analysis_sets_pending(self, session_factory):
+        """Test queuing leaves the analysis pending with a persisted job."""
+        scan_id = await _create_scan(session_factory)
+
+        async with session_factory() as session:
+            analysis = await AnalysisService(session).get_analysis(scan_id)
+            jobs = (await session.execute(select(AnalysisJob))).scalars().all()
+
+        assert analysis.status == AnalysisStatus.PENDING
+        assert len(jobs) == 1
+        assert jobs[0].status == JobStatus.QUEUED
+        assert jobs[0].analysis_id == analysis.id
+
+    async def test_worker_completes_job(self, session_factory):
+        """Test workers pick up recovered jobs and complete the analysis."""
+        scan_id = await _create_scan(session_factory, image_count=3)
+        vision = FakeVisionService()
+        queue = AnalysisQueue(
+            worker_count=2,
+            session_factory=session_factory,
+            vision_service_factory=lambda: vision,
+        )
+
+        await queue.start()
+        await queue.join()
+        await queue.stop()
+
+        async with session_factory() as session:
+            analysis = await AnalysisService(session).get_analysis(scan_id)
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            scan = (await session.execute(select(Scan))).scalar_one()
+            barriers = (await session.execute(select(Barrier))).scalars().all()
+
+        assert len(vision.calls) == 3
+        assert job.status == JobStatus.COMPLETED
+        assert job.attempts == 1
+        assert analysis.status == AnalysisStatus.COMPLETED
+        assert analysis.total_images_analyzed == 3
+        assert analysis.total_barriers_found == 3
+        assert analysis.accessibility_score == 60
+        assert analysis.world_model_blob is not None
+        assert analysis.world_model_json is None
+        assert analysis.recommended_path_json is not None
+        assert analysis.route_trees is not None
+        assert scan.status == ScanStatus.COMPLETED
+        assert len(barriers) == 3
+
+    async def test_rerun_replaces_barriers(self, session_factory):
+        """Test a forced re-run does not duplicate barriers."""
+        scan_id = await _create_scan(session_factory, image_count=2)
+
+        for _ in range(2):
+            async with session_factory() as session:
+                service = AnalysisService(session, FakeVisionService())
+                job = (
+                    await session.execute(
+                        select(AnalysisJob).where(AnalysisJob.status == JobStatus.QUEUED)
+                    )
+                ).scalar_one()
+                await service.run_job(job.id)
+
+            async with session_factory() as session:
+                scan = (await session.execute(select(Scan))).scalar_one()
+                analysis = await AnalysisService(session).get_analysis(scan_id)
+                await AnalysisService(session).queue_analysis(scan, analysis, force=True)
+                await session.commit()
+
+        async with session_factory() as session:
+            barriers = (await session.execute(select(Barrier))).scalars().all()
+
+        assert len(barriers) == 2
+
+    async def test_recover_requeues_running_jobs(self, session_factory):
+        """Test jobs interrupted mid-run are queued again on recovery."""
+        await _create_scan(session_factory)
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            job.status = JobStatus.RUNNING
+            await session.commit()
+
+        queue = AnalysisQueue(worker_count=1, session_factory=session_factory)
+        recovered = await queue.recover()
+
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+
+        assert recovered == 1
+        assert job.status == JobStatus.QUEUED
+
+    async def test_job_claimed_once(self, session_factory):
+        """Test a job handed to two workers is only run by one."""
+        await _create_scan(session_factory, image_count=2)
+        vision = FakeVisionService()
+        async with session_factory() as session:
+            job_id = (await session.execute(select(AnalysisJob.id))).scalar_one()
+
+        async def run() -> None:
+            async with session_factory() as session:
+                await AnalysisService(session, vision).run_job(job_id)
+
+        await asyncio.gather(run(), run())
+
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+
+        assert len(vision.calls) == 2
+        assert job.attempts == 1
+        assert job.status == JobStatus.COMPLETED
+
+    async def test_job_failed_after_max_attempts(self, session_factory, monkeypatch):
+        """Test a job that keeps crashing is failed instead of requeued."""
+        monkeypatch.setattr(settings, "analysis_job_max_attempts", 2)
+        await _create_scan(session_factory)
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            job.status = JobStatus.RUNNING
+            job.attempts = 2
+            await session.commit()
+        vision = FakeVisionService()
+        queue = AnalysisQueue(
+            worker_count=1,
+            session_factory=session_factory,
+            vision_service_factory=lambda: vision,
+        )
+
+        await queue.start()
+        await queue.join()
+        await queue.stop()
+
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            analysis = (await session.execute(select(AnalysisResult))).scalar_one()
+
+        assert vision.calls == []
+        assert job.status == JobStatus.FAILED
+        assert job.error_message == "Analysis gave up after 2 attempts"
+        assert analysis.status == AnalysisStatus.FAILED
+
+    async def test_worker_fails_job_when_failure_handling_crashes(
+        self, session_factory, monkeypatch
+    ):
+        """Test the worker still ends the run if recording the failure raises."""
+        await _create_scan(session_factory)
+        mark_failed = AnalysisService._mark_failed
+        calls = 0
+
+        async def broken(*args, **kwargs):
+            raise RuntimeError("graph build failed")
+
+        async def flaky_mark_failed(self, *args):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("database is locked")
+            await mark_failed(self, *args)
+
+        monkeypatch.setattr(AnalysisService, "_analyze_scan", broken)
+        monkeypatch.setattr(AnalysisService, "_mark_failed", flaky_mark_failed)
+        queue = AnalysisQueue(
+            worker_count=1,
+            session_factory=session_factory,
+            vision_service_factory=FakeVisionService,
+        )
+
+        await queue.start()
+        await queue.join()
+        await queue.stop()
+
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            analysis = (await session.execute(select(AnalysisResult))).scalar_one()
+
+        assert calls == 2
+        assert job.status == JobStatus.FAILED
+        assert analysis.status == AnalysisStatus.FAILED
+        assert analysis.error_message == "database is locked"
+
+    async def test_unhandled_failure_marks_job_failed(self, session_factory):
+        """Test a crash outside per-image handling fails job and analysis."""
+        scan_id = await _create_scan(session_factory)
+
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            service = AnalysisService(session, FakeVisionService())
+
+            async def broken(*args, **kwargs):
+                raise RuntimeError("graph build failed")
+
+            service._analyze_scan = broken  # type: ignore[method-assign]
+            await service.run_job(job.id)
+
+        async with session_factory() as session:
+            analysis = (await session.execute(select(AnalysisResult))).scalar_one()
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+
+        assert job.status == JobStatus.FAILED
+        assert analysis.status == AnalysisStatus.FAILED
+        assert analysis.error_message == "graph build failed"
+        assert analysis.scan_id == scan_id
+
+    async def test_vision_calls_run_concurrently(self, session_factory, monkeypatch):
+        """Test per-image calls overlap up to the per-scan limit, in order."""
+        monkeypatch.setattr(settings, "vision_scan_concurrency", 2)
+        scan_id = await _create_scan(session_factory, image_count=5)
+
+        class SlowVisionService(FakeVisionService):
+            in_flight = 0
+            max_in_flight = 0
+
+            async def analyze_image(self, image_path: str, image_id: UUID) -> dict:
+                SlowVisionService.in_flight += 1
+                SlowVisionService.max_in_flight = max(
+                    SlowVisionService.max_in_flight, SlowVisionService.in_flight
+                )
+                await asyncio.sleep(0.01)
+                SlowVisionService.in_flight -= 1
+                if image_path.endswith("img_2.jpg"):
+                    raise RuntimeError("timeout")
+                return await super().analyze_image(image_path, image_id)
+
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            await AnalysisService(session, SlowVisionService()).run_job(job.id)
+
+        async with session_factory() as session:
+            analysis = await AnalysisService(session).get_analysis(scan_id)
+            barriers = (await session.execute(select(Barrier))).scalars().all()
+
+        assert SlowVisionService.max_in_flight == 2
+        assert analysis.status == AnalysisStatus.COMPLETED
+        assert analysis.total_barriers_found == 4
+        assert len(barriers) == 4
+
+    async def test_completion_materializes_barrier_statistics(self, session_factory):
+        """Test completed analyses serve stored stats until images change."""
+        scan_id = await _create_scan(session_factory, image_count=2)
+
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            await AnalysisService(session, FakeVisionService()).run_job(job.id)
+
+        async with session_factory() as session:
+            service = AnalysisService(session)
+            analysis = await service.get_analysis(scan_id)
+            stored = await service.get_barrier_statistics(analysis)
+            live = await service.compute_barrier_statistics(scan_id)
+
+            images = (await session.execute(select(Image))).scalars().all()
+            await ScanService(session).delete_image(scan_id, images[0].id)
+            await session.commit()
+            await session.refresh(analysis)
+
+        assert stored == live
+        assert stored.barriers_by_severity.high == 2
+        assert stored.barriers_by_type == {"step": 2}
+        assert [s.sequence_order for s in stored.images_with_barriers] == [0, 1]
+        assert analysis.barrier_stats_json is None
+
+    async def test_incremental_update_after_image_changes(
+        self, session_factory, monkeypatch, tmp_path
+    ):
+        """Test only new images are analyzed and totals follow the changes."""
+        monkeypatch.setattr(settings, "upload_dir", tmp_path)
+        scan_id = await _create_scan(session_factory, image_count=3)
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            await AnalysisService(session, FakeVisionService()).run_job(job.id)
+
+        async with session_factory() as session:
+            service = ScanService(session)
+            images = await service.get_images(scan_id)
+            await service.delete_image(scan_id, images[0].id)
+            upload = UploadFile(
+                file=io.BytesIO(b"new image"),
+                filename="new.jpg",
+                headers=Headers({"content-type": "image/jpeg"}),
+            )
+            added = (await service.upload_images(scan_id, [upload])).images[0]
+            order = [added.id, images[2].id, images[1].id]
+            await service.reorder_images(scan_id, order)
+            analysis = await AnalysisService(session).get_analysis(scan_id)
+            assert analysis.outdated
+            assert analysis.total_images_analyzed == 2
+            assert analysis.total_barriers_found == 2
+
+            scan = await service.get_scan(scan_id)
+            await AnalysisService(session).queue_analysis(scan, analysis)
+            await session.commit()
+
+        vision = FakeVisionService()
+        async with session_factory() as session:
+            job = (
+                await session.execute(
+                    select(AnalysisJob).where(AnalysisJob.status == JobStatus.QUEUED)
+                )
+            ).scalar_one()
+            await AnalysisService(session, vision).run_job(job.id)
+
+        async with session_factory() as session:
+            analysis = await AnalysisService(session).get_analysis(scan_id)
+            images = await ScanService(session).get_images(scan_id)
+            barriers = (await session.execute(select(Barrier))).scalars().all()
+            for image in images:
+                await session.refresh(image, ["barriers"])
+
+        expected = WorldModelService()
+        expected.build_world_model(
+            images, {image.id: json.loads(image.analysis_json) for image in images}
+        )
+        assert vision.calls == [added.id]
+        assert not analysis.outdated
+        assert analysis.total_images_analyzed == 3
+        assert analysis.total_barriers_found == len(barriers) == 3
+        assert analysis.accessibility_score == 60
+        assert analysis.scored_image_count == 3
+        stored = WorldModelService()
+        stored.load(analysis)
+        assert dict(stored.graph.nodes(data=True)) == dict(
+            expected.graph.nodes(data=True)
+        )
+        assert list(stored.graph.edges(data=True)) == list(
+            expected.graph.edges(data=True)
+        )
+
+    async def test_run_publishes_progress_events(self, session_factory):
+        """Test subscribers get per-image events and a final summary."""
+        scan_id = await _create_scan(session_factory, image_count=2)
+
+        class FlakyVisionService(FakeVisionService):
+            async def analyze_image(self, image_path: str, image_id: UUID) -> dict:
+                if image_path.endswith("img_1.jpg"):
+                    raise RuntimeError("timeout")
+                return await super().analyze_image(image_path, image_id)
+
+        events = analysis_events.subscribe(scan_id)
+        try:
+            async with session_factory() as session:
+                job = (await session.execute(select(AnalysisJob))).scalar_one()
+                await AnalysisService(session, FlakyVisionService()).run_job(job.id)
+        finally:
+            analysis_events.unsubscribe(scan_id, events)
+
+        received = [events.get_nowait() for _ in range(events.qsize())]
+        by_order = {
+            order: [e.event for e in received if e.sequence_order == order]
+            for order in (0, 1)
+        }
+        done = next(e for e in received if e.event == AnalysisEventType.DONE)
+        failed = next(e for e in received if e.event == AnalysisEventType.FAILED)
+        summary = received[-1]
+
+        assert by_order[0] == [
+            AnalysisEventType.QUEUED,
+            AnalysisEventType.ANALYZING,
+            AnalysisEventType.DONE,
+        ]
+        assert by_order[1] == [
+            AnalysisEventType.QUEUED,
+            AnalysisEventType.ANALYZING,
+            AnalysisEventType.FAILED,
+        ]
+        assert done.barrier_count == 1
+        assert failed.error_message == "timeout"
+        assert summary.event == AnalysisEventType.SUMMARY
+        assert summary.status == AnalysisStatus.COMPLETED
+        assert summary.total_images_analyzed == 2
+        assert summary.total_barriers_found == 1
+
+    async def test_skipped_job_publishes_summary(self, session_factory):
+        """Test a job that is no longer queued still ends progress streams."""
+        scan_id = await _create_scan(session_factory)
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            job.status = JobStatus.COMPLETED
+            await session.commit()
+
+        events = analysis_events.subscribe(scan_id)
+        try:
+            async with session_factory() as session:
+                await AnalysisService(session, FakeVisionService()).run_job(job.id)
+        finally:
+            analysis_events.unsubscribe(scan_id, events)
+
+        summary = events.get_nowait()
+        assert summary.event == AnalysisEventType.SUMMARY
+        assert summary.status == AnalysisStatus.PENDING
+        assert events.empty()
+
+    async def test_results_are_committed_per_image(self, session_factory):
+        """Test finished images are readable while others are still running."""
+        scan_id = await _create_scan(session_factory, image_count=2)
+        release = asyncio.Event()
+
+        class BlockedVisionService(FakeVisionService):
+            async def analyze_image(self, image_path: str, image_id: UUID) -> dict:
+                if image_path.endswith("img_0.jpg"):
+                    await release.wait()
+                return await super().analyze_image(image_path, image_id)
+
+        events = analysis_events.subscribe(scan_id)
+        async with session_factory() as session:
+            job = (await session.execute(select(AnalysisJob))).scalar_one()
+            service = AnalysisService(session, BlockedVisionService())
+            run = asyncio.create_task(service.run_job(job.id))
+            try:
+                while (await events.get()).event != AnalysisEventType.DONE:
+                    pass
+            finally:
+                analysis_events.unsubscribe(scan_id, events)
+
+            async with session_factory() as reader:
+                partial = await AnalysisService(reader).get_analysis(scan_id)
+                barriers = (await reader.execute(select(Barrier))).scalars().all()
+            release.set()
+            await run
+
+        model = WorldModelService()
+        model.load(partial)
+        assert partial.status == AnalysisStatus.IN_PROGRESS
+        assert partial.is_partial
+        assert partial.total_images_analyzed == 1
+        assert partial.total_barriers_found == len(barriers) == 1
+        assert partial.accessibility_score == 60
+        assert [data["label"] for _, data in model.graph.nodes(data=True)] == [
+            "Location 2"
+        ]
+
+        async with session_factory() as session:
+            analysis = await AnalysisService(session).get_analysis(scan_id)
+
+        assert not analysis.is_partial
+        assert analysis.total_images_analyzed == 2
+        assert analysis.total_barriers_found == 2
@@ -0,0 +1,135 @@
+"""Tests for CompactGraph."""
+
+from uuid import uuid4
+
+import networkx as nx
+
+from src.models.analysis import Barrier
+from src.models.image import Image
+from src.schemas.enums import BarrierSeverity, BarrierType
+from src.services.compact_graph import CompactGraph
+from src.services.world_model_service import WorldModelService, _edge_weight
+
+
+def _images(severities: list[list[BarrierSeverity]]) -> list[Image]:
+    """Build images in sequence order with barriers of the given severities."""
+    scan_id = uuid4()
+    images = []
+    for order, image_severities in enumerate(severities):
+        image = Image(
+            id=uuid4(),
+            scan_id=scan_id,
+            filename=f"{order}.jpg",
+            original_filename=f"{order}.jpg",
+            file_path=f"/path/{order}.jpg",
+            file_size=1000,
+            mime_type="image/jpeg",
+            sequence_order=order,
+        )
+        image.barriers = [
+            Barrier(
+                id=uuid4(),
+                image_id=image.id,
+                barrier_type=BarrierType.STEP,
+                severity=severity,
+                description="Barrier",
+            )
+            for severity in image_severities
+        ]
+        images.append(image)
+    return images
+
+
+def _edges(graph: nx.DiGraph) -> dict:
+    return {(u, v): data for u, v, data in graph.edges(data=True)}
+
+
+def _compact(images: list[Image], results: dict | None = None) -> CompactGraph:
+    """Build a world model through WorldModelService and compact it."""
+    service = WorldModelService()
+    service.build_world_model(images, results or {})
+    return service.to_compact()
+
+
+class TestCompactGraph:
+    """Tests for the array-backed world model graph."""
+
+    def test_networkx_round_trip(self):
+        """Test compacting a built world model and expanding it is lossless."""
+        images = _images(
+            [[], [BarrierSeverity.MEDIUM], [BarrierSeverity.CRITICAL], [], []]
+        )
+        results = {img.id: {"space_type": "corridor"} for img in images}
+        expected = WorldModelService().build_world_model(images, results)
+
+        graph = _compact(images, results).to_networkx()
+
+        assert dict(graph.nodes(data=True)) == dict(expected.nodes(data=True))
+        assert _edges(graph) == _edges(expected)
+
+    def test_chain_build_matches_networkx_conversion(self):
+        """Test building a chain from its nodes equals converting the graph."""
+        images = _images(
+            [
+                [BarrierSeverity.LOW],
+                [],
+                [BarrierSeverity.CRITICAL],
+                [BarrierSeverity.HIGH],
+            ]
+        )
+        service = WorldModelService()
+        graph = service.build_world_model(images, {})
+
+        compact = service.to_compact()
+        converted = CompactGraph.from_networkx(graph)
+
+        assert compact.to_bytes() == converted.to_bytes()
+        assert _edges(compact.to_networkx()) == _edges(graph)
+
+    def test_barriers_are_shared_not_copied(self):
+        """Test both edge directions reference the same barrier entries."""
+        images = _images([[BarrierSeverity.HIGH], [BarrierSeverity.LOW]])
+        compact = _compact(images)
+
+        assert len(compact.barriers) == 2
+        assert list(compact.edge_barrier_refs_of(0)) == list(
+            compact.edge_barrier_refs_of(1)
+        )
+
+    def test_shortest_path_matches_dijkstra(self):
+        """Test CSR Dijkstra finds the same path and cost as networkx."""
+        graph = nx.DiGraph()
+        for u, v, difficulty in [
+            ("a", "b", "easy"),
+            ("b", "d", "difficult"),
+            ("a", "c", "moderate"),
+            ("c", "d", "easy"),
+            ("a", "d", "impassable"),
+        ]:
+            traversable = difficulty != "impassable"
+            graph.add_edge(u, v, traversable=traversable, difficulty=difficulty)
+
+        path, cost = CompactGraph.from_networkx(graph).shortest_path("a", "d")
+
+        assert path == nx.dijkstra_path(graph, "a", "d", weight=_edge_weight)
+        assert path == ["a", "c", "d"]
+        assert cost == 3
+
+    def test_unreachable_target(self):
+        """Test no path is returned across impassable edges only."""
+        images = _images([[], [BarrierSeverity.CRITICAL], []])
+        compact = _compact(images)
+
+        assert compact.shortest_path("node_0", "node_2") is None
+        assert compact.shortest_path("node_0", "missing") is None
+
+    def test_bytes_round_trip(self):
+        """Test binary serialization preserves the graph."""
+        images = _images([[BarrierSeverity.HIGH], [], [BarrierSeverity.LOW]])
+        compact = _compact(images)
+
+        decoded = CompactGraph.from_bytes(compact.to_bytes())
+
+        assert _edges(decoded.to_networkx()) == _edges(compact.to_networkx())
+        assert decoded.node_ids == compact.node_ids
+        assert decoded.array_bytes == compact.array_bytes
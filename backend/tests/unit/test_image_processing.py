@@ -0,0 +1,111 @@
+"""Tests for image preprocessing."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image as PILImage
+
+from src.core.config import settings
+from src.schemas.enums import ImageSize
+from src.services.image_processing import (
+    derived_paths,
+    image_derivative,
+    prepare_for_vision,
+)
+
+
+class TestPrepareForVision:
+    """Tests for the vision payload preprocessing."""
+
+    def test_downscales_and_strips_metadata(self, tmp_path, monkeypatch):
+        """Test the payload fits the max edge, is rotated and has no EXIF."""
+        monkeypatch.setattr(settings, "vision_image_max_edge", 100)
+        original = tmp_path / "photo.png"
+        exif = PILImage.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 CW
+        PILImage.new("RGBA", (400, 200), (255, 0, 0, 255)).save(original, exif=exif)
+
+        payload, mime_type = prepare_for_vision(original)
+
+        assert mime_type == "image/jpeg"
+        assert payload.parent == original.parent
+        with PILImage.open(payload) as img:
+            assert img.format == "JPEG"
+            assert img.size == (50, 100)
+            assert not img.getexif()
+
+    def test_payload_is_reused(self, tmp_path):
+        """Test the payload is built once and reused afterwards."""
+        original = tmp_path / "photo.jpg"
+        PILImage.new("RGB", (64, 64)).save(original)
+
+        payload, _ = prepare_for_vision(original)
+        built_at = payload.stat().st_mtime_ns
+        again, _ = prepare_for_vision(original)
+
+        assert again == payload
+        assert again.stat().st_mtime_ns == built_at
+        assert derived_paths(original) == [payload]
+
+    def test_concurrent_builds(self, tmp_path, monkeypatch):
+        """Test simultaneous first requests all get the payload."""
+        monkeypatch.setattr(settings, "vision_image_max_edge", 100)
+        original = tmp_path / "photo.jpg"
+        PILImage.new("RGB", (400, 400)).save(original)
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(prepare_for_vision, [original] * 8))
+
+        payload = results[0][0]
+        assert payload != original
+        assert all(result == (payload, "image/jpeg") for result in results)
+        assert derived_paths(original) == [payload]
+
+
+class TestImageDerivative:
+    """Tests for thumbnail/medium variants of uploads."""
+
+    def test_builds_and_reuses_variants(self, tmp_path, monkeypatch):
+        """Test variants fit their edge, are reused and are found for cleanup."""
+        monkeypatch.setattr(settings, "image_thumbnail_edge", 50)
+        monkeypatch.setattr(settings, "image_medium_edge", 120)
+        original = tmp_path / "photo.png"
+        PILImage.new("RGBA", (400, 200)).save(original)
+
+        thumbnail = image_derivative(original, ImageSize.THUMBNAIL)
+        medium = image_derivative(original, ImageSize.MEDIUM)
+        built_at = thumbnail.stat().st_mtime_ns
+
+        with PILImage.open(thumbnail) as img:
+            assert (img.format, img.size) == ("JPEG", (50, 25))
+        with PILImage.open(medium) as img:
+            assert img.size == (120, 60)
+        assert image_derivative(original, ImageSize.THUMBNAIL) == thumbnail
+        assert thumbnail.stat().st_mtime_ns == built_at
+        assert image_derivative(original, ImageSize.ORIGINAL) == original
+        assert sorted(derived_paths(original)) == sorted([thumbnail, medium])
+
+    def test_small_or_undecodable_uploads_serve_original(self, tmp_path):
+        """Test no variant is written when it would not be smaller."""
+        small = tmp_path / "small.jpg"
+        PILImage.new("RGB", (64, 64)).save(small)
+        broken = tmp_path / "broken.jpg"
+        broken.write_bytes(b"not an image")
+
+        assert image_derivative(small, ImageSize.THUMBNAIL) == small
+        assert image_derivative(broken, ImageSize.MEDIUM) == broken
+        assert derived_paths(small) == []
+
+    def test_concurrent_builds(self, tmp_path, monkeypatch):
+        """Test simultaneous first requests for a variant all get it."""
+        monkeypatch.setattr(settings, "image_thumbnail_edge", 50)
+        original = tmp_path / "photo.jpg"
+        PILImage.new("RGB", (400, 400)).save(original)
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(
+                pool.map(image_derivative, [original] * 8, [ImageSize.THUMBNAIL] * 8)
+            )
+
+        thumbnail = derived_paths(original)
+        assert len(thumbnail) == 1
+        assert results == thumbnail * 8
@@ -0,0 +1,169 @@
+"""Tests for repository query behaviour."""
+
+import pytest
+from src.models.analysis import Barrier
+from src.models.image import Image
+from src.models.scan import Scan
+from src.repositories.barrier_repository import BarrierRepository
+from src.repositories.image_repository import ImageRepository
+from src.repositories.scan_repository import ScanLoad, ScanRepository
+from src.schemas.enums import BarrierSeverity, BarrierType
+
+
+def _image(scan_id, order: int) -> Image:
+    return Image(
+        scan_id=scan_id,
+        filename=f"{order}.jpg",
+        original_filename=f"{order}.jpg",
+        file_path=f"/tmp/{order}.jpg",
+        file_size=100,
+        mime_type="image/jpeg",
+        sequence_order=order,
+    )
+
+
+@pytest.mark.asyncio
+class TestBatchInserts:
+    """Tests for batch insert paths."""
+
+    async def test_create_many_images_single_insert(
+        self, async_session, statement_counter
+    ):
+        """Test images are inserted in one statement with no refresh SELECTs."""
+        scan = Scan(name="Batch")
+        async_session.add(scan)
+        await async_session.flush()
+        images = [_image(scan.id, i) for i in range(10)]
+
+        statement_counter.clear()
+        created = await ImageRepository(async_session).create_many(images)
+        counts = [img.barrier_count for img in created]
+
+        assert [s.split()[0] for s in statement_counter] == ["INSERT"]
+        assert counts == [0] * 10
+        assert all(img.created_at is not None for img in created)
+
+    async def test_create_many_barriers_single_insert(
+        self, async_session, statement_counter
+    ):
+        """Test barriers are inserted in one statement."""
+        scan = Scan(name="Batch")
+        async_session.add(scan)
+        await async_session.flush()
+        image = _image(scan.id, 0)
+        async_session.add(image)
+        await async_session.flush()
+
+        barriers = [
+            Barrier(
+                image_id=image.id,
+                barrier_type=BarrierType.STEP,
+                severity=BarrierSeverity.LOW,
+                description=f"Barrier {i}",
+            )
+            for i in range(5)
+        ]
+        statement_counter.clear()
+        await BarrierRepository(async_session).create_many(barriers)
+
+        assert [s.split()[0] for s in statement_counter] == ["INSERT"]
+        assert len({b.id for b in barriers}) == 5
+
+
+@pytest.mark.asyncio
+class TestLoaderProfiles:
+    """Tests for ScanLoad profiles."""
+
+    async def _scan_with_images(self, session, image_count: int) -> Scan:
+        scan = Scan(name=f"{image_count} images")
+        session.add(scan)
+        await session.flush()
+        images = [_image(scan.id, i) for i in range(image_count)]
+        await ImageRepository(session).create_many(images)
+        await BarrierRepository(session).create_many(
+            [
+                Barrier(
+                    image_id=image.id,
+                    barrier_type=BarrierType.STEP,
+                    severity=BarrierSeverity.HIGH,
+                    description="Step",
+                )
+                for image in images
+            ]
+        )
+        session.expunge_all()
+        return scan
+
+    async def test_detail_query_count_is_constant(
+        self, async_session, statement_counter
+    ):
+        """Test the detail profile issues the same SELECTs for 1 or 8 images."""
+        repo = ScanRepository(async_session)
+        small = await self._scan_with_images(async_session, 1)
+        large = await self._scan_with_images(async_session, 8)
+
+        query_counts = []
+        for scan_id in (small.id, large.id):
+            statement_counter.clear()
+            scan = await repo.get_by_id(scan_id, ScanLoad.DETAIL)
+            barrier_total = sum(img.barrier_count for img in scan.images)
+            assert barrier_total == scan.image_count
+            assert scan.has_guide is False
+            query_counts.append(len(statement_counter))
+
+        assert query_counts[0] == query_counts[1] == 5
+
+    async def test_image_counts_single_query(self, async_session, statement_counter):
+        """Test image counts for a page of scans come from one query."""
+        scans = [await self._scan_with_images(async_session, n) for n in (0, 2, 3)]
+
+        statement_counter.clear()
+        counts = await ScanRepository(async_session).get_image_counts(
+            [s.id for s in scans]
+        )
+
+        assert len(statement_counter) == 1
+        assert [counts.get(s.id, 0) for s in scans] == [0, 2, 3]
+
+
+@pytest.mark.asyncio
+class TestBarrierAggregation:
+    """Tests for grouped barrier statistics queries."""
+
+    async def test_aggregates_by_severity_type_and_image(self, async_session):
+        """Test counts and max severity match the stored barriers."""
+        scan = Scan(name="Aggregation")
+        async_session.add(scan)
+        await async_session.flush()
+        images = [_image(scan.id, i) for i in range(3)]
+        await ImageRepository(async_session).create_many(images)
+        specs = [
+            (images[0], BarrierType.STEP, BarrierSeverity.LOW),
+            (images[0], BarrierType.STEP, BarrierSeverity.CRITICAL),
+            (images[2], BarrierType.NARROW_PASSAGE, BarrierSeverity.MEDIUM),
+        ]
+        await BarrierRepository(async_session).create_many(
+            [
+                Barrier(
+                    image_id=image.id,
+                    barrier_type=barrier_type,
+                    severity=severity,
+                    description="Barrier",
+                )
+                for image, barrier_type, severity in specs
+            ]
+        )
+
+        repo = BarrierRepository(async_session)
+        counts = await repo.count_by_severity_and_type(scan.id)
+        summary = await repo.summarize_by_image(scan.id)
+
+        assert sorted(counts, key=lambda row: row[1].value + row[0].value) == [
+            (BarrierSeverity.MEDIUM, BarrierType.NARROW_PASSAGE, 1),
+            (BarrierSeverity.CRITICAL, BarrierType.STEP, 1),
+            (BarrierSeverity.LOW, BarrierType.STEP, 1),
+        ]
+        assert summary == [
+            (images[0].id, 0, 2, BarrierSeverity.CRITICAL),
+            (images[2].id, 2, 1, BarrierSeverity.MEDIUM),
+        ]
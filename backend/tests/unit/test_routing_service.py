@@ -0,0 +1,203 @@
+"""Tests for RoutingService."""
+
+from datetime import datetime
+from uuid import uuid4
+
+import networkx as nx
+import pytest
+
+from src.core.config import settings
+from src.models.analysis import AnalysisResult
+from src.models.guide import WheelchairProfile
+from src.schemas.enums import Difficulty
+from src.services.route_table import RouteTable
+from src.services.routing_service import (
+    RoutingService,
+    barrier_difficulty,
+    build_route_table,
+)
+from src.services.world_model_cache import WorldModelCache
+from src.services.world_model_service import WorldModelService
+
+NARROW_DOOR = {
+    "id": str(uuid4()),
+    "barrier_type": "narrow_door",
+    "severity": "medium",
+    "description": "Door",
+    "estimated_width_cm": 70.0,
+}
+
+
+def _profile(min_door_width_cm: float) -> WheelchairProfile:
+    return WheelchairProfile(
+        id=uuid4(),
+        name="Test",
+        width_cm=60,
+        length_cm=100,
+        min_door_width_cm=min_door_width_cm,
+    )
+
+
+def _analysis() -> AnalysisResult:
+    """Build a diamond-shaped world model: a-b-d is short but has a door."""
+    graph = nx.DiGraph()
+    for node_id in "abcd":
+        graph.add_node(node_id, image_id=str(uuid4()), barriers=[])
+    graph.nodes["b"]["barriers"] = [NARROW_DOOR]
+    edges = [
+        ("a", "b", "moderate", [NARROW_DOOR["id"]]),
+        ("b", "d", "moderate", [NARROW_DOOR["id"]]),
+        ("a", "c", "difficult", []),
+        ("c", "d", "difficult", []),
+    ]
+    for u, v, difficulty, barriers in edges:
+        for source, target in ((u, v), (v, u)):
+            graph.add_edge(
+                source,
+                target,
+                traversable=True,
+                difficulty=difficulty,
+                barriers_in_path=barriers,
+            )
+
+    service = WorldModelService()
+    service.graph = graph
+    return AnalysisResult(
+        id=uuid4(),
+        scan_id=uuid4(),
+        world_model_json=service.to_json(),
+        updated_at=datetime(2024, 1, 1),
+    )
+
+
+class TestBarrierDifficulty:
+    """Tests for profile-aware barrier ratings."""
+
+    def test_uses_measurements_against_profile(self):
+        """Test measured barriers are rated against the profile limits."""
+        step = {"barrier_type": "step", "severity": "high", "estimated_height_cm": 3}
+        ramp = {
+            "barrier_type": "steep_ramp",
+            "severity": "low",
+            "estimated_height_cm": 12,
+            "estimated_depth_cm": 100,
+        }
+        profile = _profile(min_door_width_cm=80)
+
+        assert barrier_difficulty(NARROW_DOOR, profile) == 3
+        assert barrier_difficulty(NARROW_DOOR, _profile(65)) == 0
+        assert barrier_difficulty(step, profile) == 3
+        assert barrier_difficulty(ramp, profile) == 3
+        assert barrier_difficulty({"barrier_type": "gravel"}, profile) == 3
+
+    def test_falls_back_to_severity(self):
+        """Test unmeasured barriers and no profile use the severity."""
+        door = {"barrier_type": "narrow_door", "severity": "high"}
+
+        assert barrier_difficulty(door, _profile(80)) == 2
+        assert barrier_difficulty(NARROW_DOOR, None) == 1
+
+
+class TestRoutingService:
+    """Tests for profile routing and memoization."""
+
+    def test_profile_changes_route(self):
+        """Test a door too narrow for the profile forces the detour."""
+        service = RoutingService(WorldModelCache())
+        analysis = _analysis()
+
+        default = service.route(analysis, "a", "d")
+        narrow = service.route(analysis, "a", "d", _profile(80))
+        slim = service.route(analysis, "a", "d", _profile(65))
+
+        assert default.path == ["a", "b", "d"]
+        assert default.total_cost == 4
+        assert narrow.path == ["a", "c", "d"]
+        assert narrow.edge_difficulties == [Difficulty.DIFFICULT, Difficulty.DIFFICULT]
+        assert slim.path == ["a", "b", "d"]
+        assert slim.total_cost == 2
+
+    def test_routes_are_memoized_per_version(self):
+        """Test repeated queries reuse the result until the graph changes."""
+        service = RoutingService(WorldModelCache())
+        analysis = _analysis()
+        profile = _profile(80)
+
+        first = service.route(analysis, "a", "d", profile)
+        assert service.route(analysis, "a", "d", profile) is first
+
+        analysis.updated_at = datetime(2024, 1, 2)
+        assert service.route(analysis, "a", "d", profile) is not first
+
+    def test_unknown_node(self):
+        """Test unknown nodes are rejected."""
+        with pytest.raises(ValueError, match="Node z not found"):
+            RoutingService(WorldModelCache()).route(_analysis(), "a", "z")
+
+
+class TestRouteTable:
+    """Tests for precomputed shortest-path trees."""
+
+    def test_lookups_match_dijkstra(self):
+        """Test every precomputed route equals a route computed on demand."""
+        analysis = _analysis()
+        profiles = [_profile(80), _profile(65)]
+        compact = WorldModelCache().get_compact(analysis)
+        analysis.route_trees = build_route_table(compact, profiles).to_bytes()
+
+        precomputed = RoutingService(WorldModelCache())
+        on_demand = RoutingService(WorldModelCache())
+        on_demand_analysis = analysis.model_copy(update={"route_trees": None})
+        for profile in [None, *profiles]:
+            for source in "abcd":
+                for target in "abcd":
+                    expected = on_demand.route(
+                        on_demand_analysis, source, target, profile
+                    )
+                    route = precomputed.route(analysis, source, target, profile)
+                    assert route.total_cost == expected.total_cost
+                    assert route.edge_difficulties == expected.edge_difficulties
+                    assert len(route.path) == len(expected.path)
+
+    def test_round_trip_and_fallback(self, monkeypatch):
+        """Test the blob decodes and unknown profiles fall back to Dijkstra."""
+        analysis = _analysis()
+        compact = WorldModelCache().get_compact(analysis)
+        table = build_route_table(compact, [])
+        analysis.route_trees = table.to_bytes()
+
+        decoded = RouteTable.from_bytes(analysis.route_trees)
+        assert decoded.sources == [0, 1, 2, 3]
+        assert decoded.trees == table.trees
+
+        cache = WorldModelCache()
+        service = RoutingService(cache)
+        calls = []
+        compact = cache.get_compact(analysis)
+        original = compact.shortest_path
+        monkeypatch.setattr(
+            compact,
+            "shortest_path",
+            lambda *args: calls.append(args) or original(*args),
+        )
+
+        assert service.route(analysis, "a", "d").path == ["a", "b", "d"]
+        assert calls == []
+        assert service.route(analysis, "a", "d", _profile(80)).path == [
+            "a",
+            "c",
+            "d",
+        ]
+        assert len(calls) == 1
+
+    def test_entrance_sources(self, monkeypatch):
+        """Test only the first node and entrances get trees when configured."""
+        monkeypatch.setattr(settings, "route_precompute", "entrances")
+        analysis = _analysis()
+        compact = WorldModelCache().get_compact(analysis)
+        compact.nodes[2]["space_type"] = "entrance"
+
+        assert build_route_table(compact, []).sources == [0, 2]
+
+        monkeypatch.setattr(settings, "route_precompute", "off")
+        assert build_route_table(compact, []) is None
@@ -0,0 +1,181 @@
+"""Tests for ScanService upload processing."""
+
+import asyncio
+import hashlib
+import io
+from uuid import uuid4
+
+import pytest
+from PIL import Image as PILImage
+from starlette.datastructures import Headers, UploadFile
+
+from src.core.config import settings
+from src.models.scan import Scan
+from src.services.scan_service import ScanService
+
+
+def _upload(
+    content: bytes, filename: str = "photo.jpg", content_type: str = "image/jpeg"
+) -> UploadFile:
+    """Build an UploadFile as FastAPI would pass it to the service."""
+    return UploadFile(
+        file=io.BytesIO(content),
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+def _jpeg_bytes(size: tuple[int, int]) -> bytes:
+    """Encode a blank JPEG of the given size."""
+    buffer = io.BytesIO()
+    PILImage.new("RGB", size).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+class TestProcessUpload:
+    """Tests for ScanService._process_upload."""
+
+    async def test_streams_file_to_disk(self, async_session, tmp_path, monkeypatch):
+        """Test chunked copy keeps bytes, size, hash and dimensions."""
+        monkeypatch.setattr(settings, "upload_chunk_size", 64)
+        content = _jpeg_bytes((320, 240))
+        service = ScanService(async_session)
+
+        image = await service._process_upload(uuid4(), _upload(content), tmp_path)
+
+        with open(image.file_path, "rb") as f:
+            assert f.read() == content
+        assert image.file_size == len(content)
+        assert image.content_hash == hashlib.sha256(content).hexdigest()
+        assert (image.width, image.height) == (320, 240)
+
+    async def test_rejects_oversized_file(self, async_session, tmp_path, monkeypatch):
+        """Test the copy stops once the limit is passed and leaves no file."""
+        monkeypatch.setattr(settings, "upload_chunk_size", 1024)
+        monkeypatch.setattr(settings, "max_upload_size_mb", 0)
+        service = ScanService(async_session)
+
+        with pytest.raises(ValueError, match="File too large"):
+            await service._process_upload(uuid4(), _upload(b"\xff" * 4096), tmp_path)
+
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_unreadable_image_has_no_dimensions(self, async_session, tmp_path):
+        """Test non-image bytes are stored without dimensions."""
+        service = ScanService(async_session)
+
+        image = await service._process_upload(
+            uuid4(), _upload(b"not an image"), tmp_path
+        )
+
+        assert image.width is None
+        assert image.height is None
+
+
+@pytest.mark.asyncio
+class TestUploadImages:
+    """Tests for ScanService.upload_images."""
+
+    async def test_keeps_request_order_and_reports_errors(
+        self, async_session, tmp_path, monkeypatch
+    ):
+        """Test uploading several files keeps request order and reports errors."""
+        monkeypatch.setattr(settings, "upload_dir", tmp_path)
+        scan = Scan(name="Uploads")
+        async_session.add(scan)
+        await async_session.commit()
+        service = ScanService(async_session)
+
+        result = await service.upload_images(
+            scan.id,
+            [
+                _upload(_jpeg_bytes((40, 30)), "first.jpg"),
+                _upload(b"not an image", "notes.txt", "text/plain"),
+                _upload(_jpeg_bytes((30, 40)), "second.jpg"),
+            ],
+        )
+
+        assert result.uploaded == 2
+        assert result.failed == 1
+        assert result.errors == ["notes.txt: Invalid file type: text/plain"]
+        assert [img.original_filename for img in result.images] == [
+            "first.jpg",
+            "second.jpg",
+        ]
+        assert [img.sequence_order for img in result.images] == [0, 1]
+        assert (result.images[0].width, result.images[0].height) == (40, 30)
+
+    async def test_concurrent_uploads_finish_out_of_order(
+        self, async_session, tmp_path, monkeypatch
+    ):
+        """Test files run under the concurrency limit and keep request order."""
+        monkeypatch.setattr(settings, "upload_dir", tmp_path)
+        monkeypatch.setattr(settings, "upload_concurrency", 2)
+        scan = Scan(name="Concurrent")
+        async_session.add(scan)
+        await async_session.commit()
+        service = ScanService(async_session)
+        process_upload = service._process_upload
+        running = 0
+        peak = 0
+
+        async def slow_process_upload(scan_id, file, upload_dir):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            try:
+                # Earlier files finish later
+                await asyncio.sleep(0.01 * (5 - int(file.filename[0])))
+                return await process_upload(scan_id, file, upload_dir)
+            finally:
+                running -= 1
+
+        monkeypatch.setattr(service, "_process_upload", slow_process_upload)
+        names = [f"{i}.jpg" for i in range(5)]
+
+        first = await service.upload_images(
+            scan.id, [_upload(_jpeg_bytes((8, 8)), name) for name in names[:2]]
+        )
+        second = await service.upload_images(
+            scan.id, [_upload(_jpeg_bytes((8, 8)), name) for name in names[2:]]
+        )
+
+        assert peak == 2
+        images = first.images + second.images
+        assert [img.original_filename for img in images] == names
+        assert [img.sequence_order for img in images] == [0, 1, 2, 3, 4]
+
+    async def test_failures_keep_order_of_the_rest(
+        self, async_session, tmp_path, monkeypatch
+    ):
+        """Test failed files leave no gaps and errors follow request order."""
+        monkeypatch.setattr(settings, "upload_dir", tmp_path)
+        monkeypatch.setattr(settings, "max_upload_size_mb", 0)
+        monkeypatch.setattr(settings, "upload_chunk_size", 1024)
+        scan = Scan(name="Errors")
+        async_session.add(scan)
+        await async_session.commit()
+        service = ScanService(async_session)
+
+        result = await service.upload_images(
+            scan.id,
+            [
+                _upload(b"\xff" * 4096, "big.jpg"),
+                _upload(b"", "a.jpg"),
+                _upload(b"text", "notes.txt", "text/plain"),
+                _upload(b"", "b.jpg"),
+                _upload(b"\xff" * 4096, "huge.jpg"),
+            ],
+        )
+
+        assert [img.original_filename for img in result.images] == ["a.jpg", "b.jpg"]
+        assert [img.sequence_order for img in result.images] == [0, 1]
+        assert [error.split(":")[0] for error in result.errors] == [
+            "big.jpg",
+            "notes.txt",
+            "huge.jpg",
+        ]
+        assert sorted(p.name for p in (tmp_path / str(scan.id)).iterdir()) == sorted(
+            img.filename for img in result.images
+        )
@@ -0,0 +1,161 @@
+"""Tests for VisionResultCache."""
+
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from src.core.config import settings
+from src.services.vision_cache import VisionResultCache
+from src.services.vision_service import VisionService
+
+
+class FakeCompletions:
+    """Stand-in for ``client.chat.completions`` counting requests."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def create(self, **kwargs) -> SimpleNamespace:
+        self.calls += 1
+        content = json.dumps({"space_type": "room", "barriers": []})
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.mark.asyncio
+class TestVisionResultCache:
+    """Tests for the vision result cache."""
+
+    async def test_get_set_counts_hits_and_misses(self, tmp_path):
+        """Test a stored entry is returned and counted as a hit."""
+        cache = VisionResultCache(cache_dir=tmp_path, max_bytes=1024 * 1024)
+        key = cache.make_key(b"image", "prompt", "gpt-4o", 4096)
+
+        assert await cache.get(key) is None
+        await cache.set(key, {"accessibility_score": 90})
+
+        assert await cache.get(key) == {"accessibility_score": 90}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    async def test_key_depends_on_prompt_model_and_tokens(self):
+        """Test any change in request parameters changes the key."""
+        base = VisionResultCache.make_key(b"image", "prompt", "gpt-4o", 4096)
+
+        assert base == VisionResultCache.make_key(b"image", "prompt", "gpt-4o", 4096)
+        assert base != VisionResultCache.make_key(b"other", "prompt", "gpt-4o", 4096)
+        assert base != VisionResultCache.make_key(b"image", "prompt2", "gpt-4o", 4096)
+        assert base != VisionResultCache.make_key(b"image", "prompt", "gpt-4.1", 4096)
+        assert base != VisionResultCache.make_key(b"image", "prompt", "gpt-4o", 1024)
+
+    async def test_evicts_least_recently_used(self, tmp_path):
+        """Test eviction removes the oldest entries once over the limit."""
+        cache = VisionResultCache(cache_dir=tmp_path, max_bytes=350)
+        payload = {"description": "x" * 80}
+
+        for i, key in enumerate(["a", "b", "c"]):
+            await cache.set(key, payload)
+            os.utime(tmp_path / f"{key}.json", (i, i))
+
+        await cache.get("a")  # refresh "a" so "b" is the oldest
+        await cache.set("d", payload)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") is not None
+        assert await cache.get("c") is not None
+        assert await cache.get("d") is not None
+        assert cache.evictions == 1
+
+    async def test_scans_directory_once(self, tmp_path, monkeypatch):
+        """Test entries from earlier runs are indexed once, oldest evicted first."""
+        payload = json.dumps({"description": "x" * 80})
+        for i, key in enumerate(["old", "older"]):
+            (tmp_path / f"{key}.json").write_text(payload)
+            os.utime(tmp_path / f"{key}.json", (10 - i, 10 - i))
+        scans = 0
+        scandir = os.scandir
+
+        def counting_scandir(path):
+            nonlocal scans
+            scans += 1
+            return scandir(path)
+
+        monkeypatch.setattr(os, "scandir", counting_scandir)
+        cache = VisionResultCache(cache_dir=tmp_path, max_bytes=350)
+
+        for key in ["a", "b", "c"]:
+            await cache.set(key, {"description": "x" * 80})
+
+        assert scans == 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "a.json",
+            "b.json",
+            "c.json",
+        ]
+        assert cache.evictions == 2
+
+    async def test_concurrent_sets_of_one_key(self, tmp_path):
+        """Test duplicate images stored at once do not collide on disk."""
+        cache = VisionResultCache(cache_dir=tmp_path, max_bytes=1024 * 1024)
+
+        await asyncio.gather(*(cache.set("same", {"n": i}) for i in range(8)))
+
+        assert (await cache.get("same"))["n"] in range(8)
+        assert [p.name for p in tmp_path.iterdir()] == ["same.json"]
+
+    async def test_failed_cache_write_keeps_result(self, tmp_path, monkeypatch):
+        """Test a vision result is returned even if it cannot be cached."""
+        monkeypatch.setattr(settings, "openai_api_key", "test-key")
+        image_path = tmp_path / "photo.jpg"
+        image_path.write_bytes(b"bytes")
+        cache = VisionResultCache(cache_dir=tmp_path / "cache")
+
+        async def broken_set(key: str, result: dict) -> None:
+            raise OSError("disk full")
+
+        cache.set = broken_set  # type: ignore[method-assign]
+        service = VisionService(cache=cache)
+        service.client = SimpleNamespace(
+            chat=SimpleNamespace(completions=FakeCompletions())
+        )
+
+        result = await service.analyze_image(str(image_path), uuid4())
+
+        assert result["space_type"] == "room"
+
+    async def test_vision_service_uses_cache(self, tmp_path, monkeypatch):
+        """Test identical image bytes only reach the model once."""
+        monkeypatch.setattr(settings, "openai_api_key", "test-key")
+        image_path = tmp_path / "photo.jpg"
+        image_path.write_bytes(b"same bytes")
+        service = VisionService(cache=VisionResultCache(cache_dir=tmp_path / "cache"))
+        completions = FakeCompletions()
+        service.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+        first_id, second_id = uuid4(), uuid4()
+        first = await service.analyze_image(str(image_path), first_id)
+        second = await service.analyze_image(str(image_path), second_id)
+
+        assert completions.calls == 1
+        assert first["image_id"] == str(first_id)
+        assert second["image_id"] == str(second_id)
+        assert second["space_type"] == "room"
+
+    async def test_call_limit_per_event_loop(self):
+        """Test services on one loop share a limit and other loops get their own."""
+        limit = VisionService.call_limit()
+
+        other = await asyncio.to_thread(asyncio.run, self._call_limit_on_new_loop())
+
+        assert VisionService.call_limit() is limit
+        assert other is not limit
+
+    @staticmethod
+    async def _call_limit_on_new_loop() -> asyncio.Semaphore:
+        """Get the call limit from inside a fresh event loop."""
+        async with VisionService.call_limit():
+            return VisionService.call_limit()
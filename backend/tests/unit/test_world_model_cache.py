@@ -0,0 +1,122 @@
+"""Tests for WorldModelCache."""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from src.models.analysis import AnalysisResult
+from src.models.image import Image
+from src.schemas.navigation import RecommendedPath
+from src.services.world_model_cache import WorldModelCache
+from src.services.world_model_service import WorldModelService
+
+
+def _analysis(image_count: int = 2) -> AnalysisResult:
+    """Build an analysis row with a serialized world model."""
+    scan_id = uuid4()
+    images = []
+    for i in range(image_count):
+        image = Image(
+            id=uuid4(),
+            scan_id=scan_id,
+            filename=f"{i}.jpg",
+            original_filename=f"{i}.jpg",
+            file_path=f"/path/{i}.jpg",
+            file_size=1000,
+            mime_type="image/jpeg",
+            sequence_order=i,
+        )
+        image.barriers = []
+        images.append(image)
+
+    service = WorldModelService()
+    service.build_world_model(images, {})
+    return AnalysisResult(
+        id=uuid4(),
+        scan_id=scan_id,
+        world_model_json=service.to_json(),
+        updated_at=datetime(2024, 1, 1),
+    )
+
+
+class TestWorldModelCache:
+    """Tests for the parsed world model cache."""
+
+    def test_hit_reuses_graph_and_response(self):
+        """Test repeated reads of the same version parse only once."""
+        cache = WorldModelCache(max_entries=4)
+        analysis = _analysis()
+
+        first = cache.get_response(analysis)
+        second = cache.get_response(analysis)
+
+        assert first is second
+        assert cache.get_service(analysis).graph.number_of_nodes() == 2
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_new_version_is_reparsed(self):
+        """Test a bumped updated_at replaces the cached entry."""
+        cache = WorldModelCache(max_entries=4)
+        analysis = _analysis(image_count=2)
+        cache.get_response(analysis)
+
+        analysis.world_model_json = _analysis(image_count=3).world_model_json
+        analysis.updated_at += timedelta(seconds=1)
+        response = cache.get_response(analysis)
+
+        assert len(response.nodes) == 3
+        assert cache.misses == 2
+
+    def test_binary_and_legacy_json_rows_match(self):
+        """Test blob rows decode to the same response as JSON rows."""
+        legacy = _analysis(image_count=3)
+        service = WorldModelService()
+        service.from_json(legacy.world_model_json)
+        binary = legacy.model_copy(
+            update={
+                "id": uuid4(),
+                "world_model_blob": service.to_bytes(),
+                "world_model_json": None,
+            }
+        )
+        cache = WorldModelCache(max_entries=4)
+
+        assert cache.get_response(binary) == cache.get_response(legacy)
+        assert cache.get_compact(binary).node_ids == ["node_0", "node_1", "node_2"]
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest analysis is dropped once over capacity."""
+        cache = WorldModelCache(max_entries=2)
+        a, b, c = _analysis(), _analysis(), _analysis()
+
+        for analysis in (a, b, a, c):
+            cache.get_service(analysis)
+        misses = cache.misses
+        cache.get_service(a)
+        cache.get_service(b)
+
+        assert misses == 3
+        assert cache.misses == 4
+
+    def test_serves_stored_recommended_path(self, monkeypatch):
+        """Test a persisted recommended path is used instead of a new search."""
+        cache = WorldModelCache()
+        analysis = _analysis()
+        analysis.recommended_path_json = RecommendedPath(
+            nodes=["node_1", "node_0"], total_cost=7
+        ).model_dump_json()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("recommended path recomputed")
+
+        monkeypatch.setattr(WorldModelService, "find_recommended_path", fail)
+        response = cache.get_response(analysis)
+
+        assert response.recommended_path == ["node_1", "node_0"]
+        assert response.recommended_path_cost == 7
+
+    def test_no_world_model(self):
+        """Test analyses without a world model are not cached."""
+        cache = WorldModelCache()
+        analysis = AnalysisResult(id=uuid4(), scan_id=uuid4())
+
+        assert cache.get_response(analysis) is None
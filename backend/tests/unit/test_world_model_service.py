@@ -1,10 +1,14 @@
 """Tests for WorldModelService."""
 
+import json
+
+import networkx as nx
 import pytest
 from uuid import uuid4
 
+from src.models.analysis import Barrier
 from src.models.image import Image
-from src.schemas.enums import BarrierSeverity, Difficulty
+from src.schemas.enums import BarrierSeverity, BarrierType, Difficulty
 from src.services.world_model_service import WorldModelService
 
 
@@ -83,28 +87,36 @@ class TestWorldModelService:
         # Bidirectional edges: 2 pairs * 2 = 4
         assert len(graph.edges) == 4
 
-    def test_calculate_difficulty_no_barriers(self):
-        """Test difficulty calculation with no barriers."""
-        service = WorldModelService()
-
-        difficulty = service._calculate_difficulty([], [])
-        assert difficulty == Difficulty.EASY
-
-    def test_calculate_difficulty_with_barriers(self):
-        """Test difficulty calculation with barriers of different severities."""
-        service = WorldModelService()
-
-        low_barriers = [{"severity": "low"}]
-        assert service._calculate_difficulty(low_barriers, []) == Difficulty.EASY
-
-        medium_barriers = [{"severity": "medium"}]
-        assert service._calculate_difficulty(medium_barriers, []) == Difficulty.MODERATE
-
-        high_barriers = [{"severity": "high"}]
-        assert service._calculate_difficulty(high_barriers, []) == Difficulty.DIFFICULT
-
-        critical_barriers = [{"severity": "critical"}]
-        assert service._calculate_difficulty(critical_barriers, []) == Difficulty.IMPASSABLE
+    @staticmethod
+    def _edge_difficulty(
+        source_barriers: list[dict], target_barriers: list[dict]
+    ) -> Difficulty:
+        """Get the difficulty of the chain edge between two nodes' barriers."""
+        graph = nx.DiGraph()
+        graph.add_node("node_0", barriers=source_barriers)
+        graph.add_node("node_1", barriers=target_barriers)
+        edges = WorldModelService()._chain_edges(graph, ["node_0", "node_1"])
+
+        assert edges[0][2] == edges[1][2]
+        return Difficulty(edges[0][2]["difficulty"])
+
+    def test_chain_edge_difficulty_no_barriers(self):
+        """Test edges between nodes without barriers are easy."""
+        assert self._edge_difficulty([], []) == Difficulty.EASY
+
+    def test_chain_edge_difficulty_with_barriers(self):
+        """Test edge difficulty follows the worst barrier at either end."""
+        assert self._edge_difficulty([{"severity": "low"}], []) == Difficulty.EASY
+        assert (
+            self._edge_difficulty([{"severity": "medium"}], []) == Difficulty.MODERATE
+        )
+        assert (
+            self._edge_difficulty([], [{"severity": "high"}]) == Difficulty.DIFFICULT
+        )
+        assert (
+            self._edge_difficulty([{"severity": "low"}], [{"severity": "critical"}])
+            == Difficulty.IMPASSABLE
+        )
 
     def test_find_recommended_path_empty(self):
         """Test finding path in empty graph."""
@@ -168,3 +180,100 @@ class TestWorldModelService:
         new_service.from_json(json_str)
 
         assert len(new_service.graph.nodes) == 1
+
+    def test_compute_recommended_path_cost_and_difficulties(self):
+        """Test the recommended path carries its cost and per-edge difficulty."""
+        service = WorldModelService()
+        service.graph.add_edge("node_0", "node_1", traversable=True, difficulty="easy")
+        service.graph.add_edge(
+            "node_1", "node_2", traversable=True, difficulty="difficult"
+        )
+
+        recommended = service.compute_recommended_path()
+
+        assert recommended.nodes == ["node_0", "node_1", "node_2"]
+        assert recommended.total_cost == 5
+        assert recommended.edge_difficulties == [Difficulty.EASY, Difficulty.DIFFICULT]
+
+    def test_compute_recommended_path_blocked(self):
+        """Test a path through an impassable edge has no finite cost."""
+        service = WorldModelService()
+        service.graph.add_edge(
+            "node_0", "node_1", traversable=False, difficulty="impassable"
+        )
+
+        recommended = service.compute_recommended_path()
+
+        assert recommended.nodes == ["node_0", "node_1"]
+        assert recommended.total_cost is None
+
+    def test_update_world_model_matches_full_build(self):
+        """Test patching after add, delete and reorder equals a rebuild."""
+        scan_id = uuid4()
+        images = []
+        for i, severity in enumerate(["low", "high", None, "critical"]):
+            image = Image(
+                id=uuid4(),
+                scan_id=scan_id,
+                filename=f"test_{i}.jpg",
+                original_filename=f"test_{i}.jpg",
+                file_path=f"/path/test_{i}.jpg",
+                file_size=1000,
+                mime_type="image/jpeg",
+                sequence_order=i,
+            )
+            image.barriers = []
+            if severity:
+                image.barriers.append(
+                    Barrier(
+                        id=uuid4(),
+                        image_id=image.id,
+                        barrier_type=BarrierType.STEP,
+                        severity=BarrierSeverity(severity),
+                        description="Step",
+                    )
+                )
+            images.append(image)
+        results = {
+            img.id: {"space_type": "room", "accessibility_score": 10 * i}
+            for i, img in enumerate(images)
+        }
+
+        service = WorldModelService()
+        service.build_world_model(images[:3], results)
+        service.from_json(service.to_json())
+
+        # Delete the first image, add the fourth and swap the remaining two
+        current = [images[2], images[1], images[3]]
+        for order, image in enumerate(current):
+            image.sequence_order = order
+        added = {images[3].id: results[images[3].id]}
+        patched = service.update_world_model(current, added)
+
+        expected = WorldModelService()
+        expected.build_world_model(current, results)
+        assert json.loads(service.to_json()) == json.loads(expected.to_json())
+        assert patched.nodes["node_0"]["label"] == "Location 1"
+
+    def test_edge_difficulty_uses_worst_endpoint(self):
+        """Test each edge takes the worst severity of its two endpoints."""
+        service = WorldModelService()
+        service.graph.add_nodes_from(
+            [
+                ("node_0", {"barriers": []}),
+                ("node_1", {"barriers": [{"id": "a", "severity": "low"}]}),
+                ("node_2", {"barriers": [{"id": "b", "severity": "critical"}]}),
+                ("node_3", {"barriers": [{"id": "c", "severity": "unknown"}]}),
+            ]
+        )
+
+        edges = service._chain_edges(service.graph, list(service.graph.nodes))
+
+        assert [(u, v, d["difficulty"]) for u, v, d in edges[::2]] == [
+            ("node_0", "node_1", "easy"),
+            ("node_1", "node_2", "impassable"),
+            ("node_2", "node_3", "impassable"),
+        ]
+        assert edges[1][:2] == ("node_1", "node_0")
+        assert edges[2][2]["barriers_in_path"] == ["a", "b"]
+        assert not edges[2][2]["traversable"]
@@ -113,7 +113,7 @@ export default function VirtualTourViewer({
             className="absolute inset-0"
           >
             <ImageViewer
-              imageUrl={`/api/scans/${scanId}/images/${currentStep.image_id}/file`}
+              imageUrl={`/api/scans/${scanId}/images/${currentStep.image_id}/file?size=medium`}
               barriers={currentStep.barriers}
               showBarrierOverlays={showAlerts}
             />
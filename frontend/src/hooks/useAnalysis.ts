@@ -38,7 +38,7 @@ export function useStartAnalysis() {
 export function useBarriers(scanId: string) {
   return useQuery({
     queryKey: ANALYSIS_QUERY_KEYS.barriers(scanId),
-    queryFn: () => api.listBarriers(scanId),
+    queryFn: () => api.listAllBarriers(scanId),
     enabled: !!scanId,
   });
 }
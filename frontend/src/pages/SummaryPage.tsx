@@ -128,6 +128,19 @@ export default function SummaryPage() {
         </div>
       </div>
 
+      {/* Images changed since the analysis */}
+      {guide.outdated && (
+        <div className="card p-4 border-yellow-200 bg-yellow-50">
+          <div className="flex items-start gap-3">
+            <AlertTriangle className="h-5 w-5 text-yellow-600 flex-shrink-0" />
+            <p className="text-sm text-yellow-800">
+              Se han anadido o eliminado imagenes desde el ultimo analisis. Vuelve a
+              analizar el scan para actualizar la guia.
+            </p>
+          </div>
+        </div>
+      )}
+
       {/* Critical alerts */}
       {guide.critical_alerts.length > 0 && (
         <div className="card p-6 border-red-200 bg-red-50">
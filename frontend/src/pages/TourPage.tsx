@@ -1,19 +1,24 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { Loader2, AlertCircle, Upload, Play, ArrowLeft } from 'lucide-react';
 import { useScan, useUploadImages } from '../hooks/useScans';
 import { useStartAnalysis, useAnalysis } from '../hooks/useAnalysis';
 import { useGuide, useGenerateGuide } from '../hooks/useGuide';
+import { api } from '../services/api';
 import ImageUploader from '../components/Upload/ImageUploader';
 import VirtualTourViewer from '../components/VirtualTour/VirtualTourViewer';
 import { cn } from '../utils/cn';
 
 type PageState = 'upload' | 'analyzing' | 'tour';
 
+const RECONNECT_DELAY_MS = 2000;
+
 export default function TourPage() {
   const { scanId } = useParams<{ scanId: string }>();
   const navigate = useNavigate();
   const [pageState, setPageState] = useState<PageState>('upload');
+  const [progress, setProgress] = useState({ queued: 0, processed: 0 });
+  const [following, setFollowing] = useState(false);
 
   const { data: scan, isLoading: scanLoading, error: scanError } = useScan(scanId!);
   const uploadImages = useUploadImages();
@@ -21,36 +26,75 @@ export default function TourPage() {
   const generateGuide = useGenerateGuide();
 
   // Only fetch analysis/guide when needed
-  const { data: analysis, refetch: refetchAnalysis } = useAnalysis(scanId!);
+  const { refetch: refetchAnalysis } = useAnalysis(scanId!);
   const { data: guide, refetch: refetchGuide } = useGuide(scanId!);
 
   const handleUpload = async (files: File[]) => {
     await uploadImages.mutateAsync({ scanId: scanId!, files });
   };
 
-  const handleStartAnalysis = async () => {
-    setPageState('analyzing');
-
-    try {
-      // Start analysis
-      await startAnalysis.mutateAsync({ scanId: scanId! });
-
-      // Poll for completion
-      const pollInterval = setInterval(async () => {
-        const result = await refetchAnalysis();
-        if (result.data?.status === 'completed') {
-          clearInterval(pollInterval);
-
+  // Follow progress until the analysis finishes, reconnecting dropped streams
+  useEffect(() => {
+    if (!following) return;
+    let active = true;
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    let unsubscribe = () => {};
+
+    const finish = async () => {
+      unsubscribe();
+      const result = await refetchAnalysis();
+      if (!active) return;
+      if (result.data?.status === 'completed') {
+        setFollowing(false);
+        try {
           // Generate guide
           await generateGuide.mutateAsync({ scanId: scanId! });
           await refetchGuide();
-
           setPageState('tour');
-        } else if (result.data?.status === 'failed') {
-          clearInterval(pollInterval);
+        } catch (error) {
+          console.error('Guide error:', error);
           setPageState('upload');
         }
-      }, 2000);
+      } else if (result.data?.status === 'failed') {
+        setFollowing(false);
+        setPageState('upload');
+      } else {
+        retry = setTimeout(subscribe, RECONNECT_DELAY_MS);
+      }
+    };
+
+    const subscribe = () => {
+      unsubscribe = api.subscribeAnalysisEvents(
+        scanId!,
+        (event) => {
+          if (event.event === 'queued') {
+            setProgress((p) => ({ ...p, queued: p.queued + 1 }));
+          } else if (event.event === 'done' || event.event === 'failed') {
+            setProgress((p) => ({ ...p, processed: p.processed + 1 }));
+          } else if (event.event === 'summary') {
+            finish();
+          }
+        },
+        finish
+      );
+    };
+
+    subscribe();
+    return () => {
+      active = false;
+      clearTimeout(retry);
+      unsubscribe();
+    };
+  }, [following, scanId]);
+
+  const handleStartAnalysis = async () => {
+    setPageState('analyzing');
+    setProgress({ queued: 0, processed: 0 });
+
+    try {
+      // Start analysis
+      await startAnalysis.mutateAsync({ scanId: scanId! });
+      setFollowing(true);
     } catch (error) {
       console.error('Analysis error:', error);
       setPageState('upload');
@@ -132,7 +176,8 @@ export default function TourPage() {
                     className="aspect-square rounded-lg overflow-hidden border border-gray-200"
                   >
                     <img
-                      src={`/api/scans/${scanId}/images/${image.id}/file`}
+                      src={image.urls.thumbnail}
+                      loading="lazy"
                       alt={`Imagen ${index + 1}`}
                       className="w-full h-full object-cover"
                     />
@@ -164,11 +209,10 @@ export default function TourPage() {
             Estamos detectando barreras de accesibilidad en las {scan.images.length} imagenes.
             Esto puede tardar unos minutos.
           </p>
-          {analysis && (
-            <p className="text-sm text-gray-500 mt-4">
-              Progreso: {analysis.total_images_analyzed} / {scan.images.length} imagenes analizadas
-            </p>
-          )}
+          <p className="text-sm text-gray-500 mt-4">
+            Progreso: {progress.processed} / {progress.queued || scan.images.length}{' '}
+            imagenes analizadas
+          </p>
         </div>
       )}
 
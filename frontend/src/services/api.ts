@@ -5,16 +5,23 @@ import type {
   ScanCreate,
   ScanUpdate,
   ImageInfo,
+  ImageSize,
   ImageUploadResponse,
   AnalysisResponse,
+  AnalysisEvent,
   Barrier,
   Guide,
+  GuideHeader,
+  GuideStepPage,
   WheelchairProfile,
   WorldModel,
+  Route,
   PaginatedResponse,
+  CursorPage,
   ScanStatus,
   BarrierSeverity,
   BarrierType,
+  BarrierSort,
 } from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || '';
@@ -104,8 +111,9 @@ class ApiClient {
     return response.data;
   }
 
-  getImageUrl(scanId: string, imageId: string): string {
-    return `${API_BASE_URL}/api/scans/${scanId}/images/${imageId}/file`;
+  getImageUrl(scanId: string, imageId: string, size: ImageSize = 'original'): string {
+    const url = `${API_BASE_URL}/api/scans/${scanId}/images/${imageId}/file`;
+    return size === 'original' ? url : `${url}?size=${size}`;
   }
 
   // Analysis
@@ -120,6 +128,30 @@ class ApiClient {
     return response.data;
   }
 
+  subscribeAnalysisEvents(
+    scanId: string,
+    onEvent: (event: AnalysisEvent) => void,
+    onError?: () => void
+  ): () => void {
+    const source = new EventSource(
+      `${API_BASE_URL}/api/scans/${scanId}/analysis/events`
+    );
+    const handle = (message: MessageEvent<string>) => {
+      const event: AnalysisEvent = JSON.parse(message.data);
+      // The stream ends after the summary; stop EventSource reconnecting
+      if (event.event === 'summary') source.close();
+      onEvent(event);
+    };
+    for (const type of ['queued', 'analyzing', 'done', 'failed', 'summary']) {
+      source.addEventListener(type, handle);
+    }
+    source.onerror = () => {
+      source.close();
+      onError?.();
+    };
+    return () => source.close();
+  }
+
   async getAnalysis(scanId: string): Promise<AnalysisResponse> {
     const response = await this.client.get<AnalysisResponse>(`/scans/${scanId}/analysis`);
     return response.data;
@@ -127,15 +159,36 @@ class ApiClient {
 
   async listBarriers(
     scanId: string,
-    params?: { severity?: BarrierSeverity; type?: BarrierType }
-  ): Promise<Barrier[]> {
-    const response = await this.client.get<Barrier[]>(
+    params?: {
+      severity?: BarrierSeverity;
+      type?: BarrierType;
+      min_confidence?: number;
+      sort?: BarrierSort;
+      cursor?: string;
+      limit?: number;
+    }
+  ): Promise<CursorPage<Barrier>> {
+    const response = await this.client.get<CursorPage<Barrier>>(
       `/scans/${scanId}/analysis/barriers`,
       { params }
     );
     return response.data;
   }
 
+  async listAllBarriers(
+    scanId: string,
+    params?: { severity?: BarrierSeverity; type?: BarrierType; sort?: BarrierSort }
+  ): Promise<Barrier[]> {
+    const barriers: Barrier[] = [];
+    let cursor: string | undefined;
+    do {
+      const page = await this.listBarriers(scanId, { ...params, cursor, limit: 500 });
+      barriers.push(...page.items);
+      cursor = page.next_cursor ?? undefined;
+    } while (cursor);
+    return barriers;
+  }
+
   async getImageBarriers(imageId: string): Promise<Barrier[]> {
     const response = await this.client.get<Barrier[]>(`/images/${imageId}/barriers`);
     return response.data;
@@ -152,6 +205,34 @@ class ApiClient {
     return response.data;
   }
 
+  async getGuideHeader(
+    scanId: string,
+    wheelchairProfileId?: string
+  ): Promise<GuideHeader> {
+    const response = await this.client.get<GuideHeader>(
+      `/scans/${scanId}/guide/header`,
+      { params: { wheelchair_profile_id: wheelchairProfileId } }
+    );
+    return response.data;
+  }
+
+  async getGuideSteps(
+    scanId: string,
+    params?: { from?: number; limit?: number; wheelchairProfileId?: string }
+  ): Promise<GuideStepPage> {
+    const response = await this.client.get<GuideStepPage>(
+      `/scans/${scanId}/guide/steps`,
+      {
+        params: {
+          from: params?.from,
+          limit: params?.limit,
+          wheelchair_profile_id: params?.wheelchairProfileId,
+        },
+      }
+    );
+    return response.data;
+  }
+
   async generateGuide(
     scanId: string,
     wheelchairProfileId?: string
@@ -167,6 +248,18 @@ class ApiClient {
     return response.data;
   }
 
+  async getRoute(
+    scanId: string,
+    fromNode: string,
+    toNode: string,
+    wheelchairProfileId?: string
+  ): Promise<Route> {
+    const response = await this.client.get<Route>(`/scans/${scanId}/route`, {
+      params: { from: fromNode, to: toNode, profile: wheelchairProfileId },
+    });
+    return response.data;
+  }
+
   // Wheelchair Profiles
   async listWheelchairProfiles(): Promise<WheelchairProfile[]> {
     const response = await this.client.get<WheelchairProfile[]>('/wheelchair-profiles');
@@ -17,6 +17,8 @@ export type BarrierType =
   | 'slope'
   | 'other';
 export type BarrierSeverity = 'low' | 'medium' | 'high' | 'critical';
+
+export type BarrierSort = 'sequence' | 'severity' | 'confidence';
 export type WheelchairType = 'manual' | 'electric' | 'sport' | 'pediatric' | 'bariatric';
 export type AccessibilityRating = 'accessible' | 'caution' | 'difficult' | 'inaccessible';
 export type Difficulty = 'easy' | 'moderate' | 'difficult' | 'impassable';
@@ -53,6 +55,10 @@ export interface ScanUpdate {
 }
 
 // Image types
+export type ImageSize = 'thumbnail' | 'medium' | 'original';
+
+export type ImageUrls = Record<ImageSize, string>;
+
 export interface ImageInfo {
   id: string;
   filename: string;
@@ -66,6 +72,7 @@ export interface ImageInfo {
   created_at: string;
   barrier_count: number;
   url: string;
+  urls: ImageUrls;
 }
 
 export interface ImageUploadResponse {
@@ -92,6 +99,23 @@ export interface AnalysisResponse {
   total_images_analyzed: number;
   total_barriers_found: number;
   accessibility_score: number | null;
+  outdated: boolean;
+  partial: boolean;
+}
+
+export type AnalysisEventType = 'queued' | 'analyzing' | 'done' | 'failed' | 'summary' | 'ping';
+
+export interface AnalysisEvent {
+  event: AnalysisEventType;
+  scan_id: string;
+  image_id: string | null;
+  sequence_order: number | null;
+  barrier_count: number | null;
+  error_message: string | null;
+  status: AnalysisStatus | null;
+  total_images_analyzed: number | null;
+  total_barriers_found: number | null;
+  accessibility_score: number | null;
 }
 
 export interface Barrier {
@@ -142,6 +166,17 @@ export interface Guide {
   critical_alerts: string[];
   wheelchair_profile: WheelchairProfile | null;
   created_at: string;
+  outdated: boolean;
+}
+
+export interface GuideHeader extends Omit<Guide, 'navigation_steps'> {
+  step_count: number;
+}
+
+export interface GuideStepPage {
+  items: NavigationStep[];
+  next_from: number | null;
+  limit: number;
 }
 
 export interface WheelchairProfile {
@@ -194,6 +229,22 @@ export interface WorldModel {
   nodes: WorldModelNode[];
   edges: WorldModelEdge[];
   recommended_path: string[] | null;
+  recommended_path_cost: number | null;
+  recommended_path_difficulties: Difficulty[] | null;
+  partial: boolean;
+  outdated: boolean;
+}
+
+export interface Route {
+  scan_id: string;
+  wheelchair_profile_id: string | null;
+  from_node: string;
+  to_node: string;
+  reachable: boolean;
+  path: string[];
+  total_cost: number | null;
+  edge_difficulties: Difficulty[];
+  outdated: boolean;
 }
 
 // API response types
@@ -203,3 +254,9 @@ export interface PaginatedResponse<T> {
   limit: number;
   offset: number;
 }
+
+export interface CursorPage<T> {
+  items: T[];
+  next_cursor: string | null;
+  limit: number;
+}